@@ -0,0 +1,207 @@
+"""Benchmark the GitHub command handlers against a local fake GitHub API.
+
+Simulates many chats sending commands at the same time and reports handler
+latency. The "blocking" mode makes the same lookups with requests inside the
+handler, which stalls the event loop for every other chat.
+
+    python benchmark_bot.py --chats 100 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import requests
+from aiohttp import web
+
+import bot
+
+
+def create_fake_github(latency, branches=250, issues=120, pulls=30, repos=12):
+    """Create an aiohttp app imitating the GitHub list endpoints used by the bot."""
+    issue_items = [{'number': i} for i in range(issues)] + [
+        {'number': issues + i, 'pull_request': {}} for i in range(pulls)]
+    data = {
+        'branches': [{'name': f'branch-{i}'} for i in range(branches)],
+        'issues': issue_items,
+        'pulls': [{'number': i} for i in range(pulls)],
+    }
+
+    def paginate(request, items):
+        per_page = int(request.query.get('per_page', 30))
+        page = int(request.query.get('page', 1))
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        headers = {}
+        if page < last:
+            url = request.url.update_query(page=page + 1)
+            last_url = request.url.update_query(page=last)
+            headers['Link'] = f'<{url}>; rel="next", <{last_url}>; rel="last"'
+        return web.json_response(items[(page - 1) * per_page:page * per_page], headers=headers)
+
+    async def repo_list(request):
+        await asyncio.sleep(latency)
+        return paginate(request, data[request.match_info['resource']])
+
+    async def user_repos(request):
+        await asyncio.sleep(latency)
+        return paginate(request, [{'name': f'repo-{i}'} for i in range(repos)])
+
+    async def search_repositories(request):
+        await asyncio.sleep(latency)
+        per_page = int(request.query.get('per_page', 30))
+        return web.json_response({'items': [
+            {'full_name': f'octo/popular-{i}', 'stargazers_count': 100000 - i} for i in range(per_page)]})
+
+    async def graphql(request):
+        await asyncio.sleep(latency)
+        return web.json_response({'data': {'repository': {
+            'refs': {'totalCount': branches},
+            'issues': {'totalCount': issues},
+            'pullRequests': {'totalCount': pulls},
+        }}})
+
+    @web.middleware
+    async def count_requests(request, handler):
+        app['stats']['requests'] += 1
+        return await handler(request)
+
+    app = web.Application(middlewares=[count_requests])
+    app['stats'] = {'requests': 0}
+    app.router.add_get('/repos/{owner}/{repo}/{resource}', repo_list)
+    app.router.add_get('/users/{username}/repos', user_repos)
+    app.router.add_get('/search/repositories', search_repositories)
+    app.router.add_post('/graphql', graphql)
+    return app
+
+
+class FakeGitHubServer:
+    """Run the fake GitHub API on its own event loop in a background thread."""
+
+    def __init__(self, latency, **counts):
+        self.app = create_fake_github(latency, **counts)
+        self.loop = asyncio.new_event_loop()
+        self.url = None
+        self._started = threading.Event()
+
+    def __enter__(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._started.wait()
+        return self
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.runner = web.AppRunner(self.app, access_log=None)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        self.loop.run_until_complete(site.start())
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}'
+        self._started.set()
+        self.loop.run_forever()
+
+
+class BlockingGitHubClient(bot.GitHubClient):
+    """Same lookups, but with a blocking requests call inside the handler."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.http = requests.Session()
+
+    async def _get(self, path, params=None):
+        response = self.http.get(self._url(path), params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json(), response.headers
+
+    async def _graphql(self, query, variables):
+        response = self.http.post(f'{self.base_url}/graphql', timeout=self.timeout,
+                                  json={'query': query, 'variables': variables})
+        response.raise_for_status()
+        return response.json()['data']
+
+
+class FakeMessage:
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text):
+        self.replies.append(text)
+
+
+COMMANDS = [
+    (bot.get_branches, 'octo/project'),
+    (bot.get_open_issues, 'octo/project'),
+    (bot.get_open_pull_requests, 'octo/project'),
+    (bot.get_repos, 'octocat'),
+    (bot.get_repo_summary, 'octo/project'),
+    (bot.get_top_10_repos, None),
+]
+
+
+async def handle_update(handler, arg, chat_id, application, sent, latencies):
+    # Latency counts from when the update arrived, including time spent
+    # waiting for the event loop while other handlers block it
+    message = FakeMessage()
+    update = SimpleNamespace(message=message, effective_user=SimpleNamespace(id=chat_id))
+    context = SimpleNamespace(args=[arg] if arg else [], application=application)
+    await handler(update, context)
+    latencies.append(time.perf_counter() - sent)
+    assert message.replies, 'handler did not reply'
+
+
+async def run_chats(github, chats, rounds):
+    application = SimpleNamespace(bot_data={})
+    # Generous limits: the benchmark measures lookups, not throttling
+    bot.init_bot_data(application.bot_data, github, bot.ChatRateLimiter(rate=1000, burst=1000))
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        # Every chat sends all commands at once, like a burst of updates
+        # dispatched with concurrent_updates enabled
+        sent = time.perf_counter()
+        await asyncio.gather(*(
+            handle_update(handler, arg, chat, application, sent, latencies)
+            for chat in range(chats) for handler, arg in COMMANDS
+        ))
+    elapsed = time.perf_counter() - start
+    await github.close()
+    return elapsed, sorted(latencies)
+
+
+def percentile(ordered, percent):
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the bot handlers')
+    parser.add_argument('--chats', type=int, default=100, help='Concurrent chats')
+    parser.add_argument('--rounds', type=int, default=2, help='Command rounds per chat')
+    parser.add_argument('--latency', type=float, default=0.05, help='Fake API latency in seconds')
+    parser.add_argument('--mode', choices=['async', 'blocking', 'both'], default='both')
+    parser.add_argument('--graphql', action='store_true',
+                        help='Use a token so /summary takes the GraphQL path')
+    args = parser.parse_args()
+
+    modes = ['blocking', 'async'] if args.mode == 'both' else [args.mode]
+    with FakeGitHubServer(args.latency) as server:
+        for mode in modes:
+            client_cls = BlockingGitHubClient if mode == 'blocking' else bot.GitHubClient
+            github = client_cls(base_url=server.url, token='benchmark' if args.graphql else None)
+            served = server.app['stats']['requests']
+            elapsed, latencies = asyncio.run(run_chats(github, args.chats, args.rounds))
+            fetches = github.stats['fetches']
+            print(f'{mode:>8}: {len(latencies)} commands from {args.chats} chats in {elapsed:.2f}s | '
+                  f'p50 {percentile(latencies, 50) * 1000:.0f}ms '
+                  f'p99 {percentile(latencies, 99) * 1000:.0f}ms '
+                  f'max {latencies[-1] * 1000:.0f}ms | '
+                  f'{server.app["stats"]["requests"] - served} API requests for {fetches} lookups, '
+                  f'{github.stats["cache_hits"]} cache hits, {github.stats["coalesced"]} coalesced')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,369 @@
-from telegram.ext import Updater, CommandHandler, MessageHandler, Filters
+import asyncio
+import os
+import re
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urlparse
+
+import aiohttp
+from telegram import Update
+from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 
 TOKEN = 'YOUR_TOKEN'
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+CACHE_TTL = 60
+RATE_LIMIT_PER_SECOND = 0.5  # Sustained commands per second per chat
+RATE_LIMIT_BURST = 5
+
+REPO_SUMMARY_QUERY = """
+query RepoSummary($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    refs(refPrefix: "refs/heads/") { totalCount }
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+  }
+}
+"""
+
+
+class TTLCache:
+    """Small in-memory cache whose entries expire after a fixed time."""
+
+    def __init__(self, ttl=CACHE_TTL, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key, value):
+        if len(self._entries) >= self.maxsize:
+            # Drop expired entries first, then the oldest ones
+            now = time.monotonic()
+            for old_key in [k for k, (expires, _) in self._entries.items() if expires < now]:
+                del self._entries[old_key]
+            while len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+class ChatRateLimiter:
+    """Token bucket per chat: bursts of up to `burst` commands, refilled at `rate`/s."""
+
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, burst=RATE_LIMIT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+
+    def acquire(self, chat_id):
+        # Returns 0 if the command may run, otherwise seconds until it may
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(chat_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            self._buckets[chat_id] = (tokens - 1, now)
+            return 0
+        self._buckets[chat_id] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+
+class GitHubClient:
+    """Async GitHub API client sharing one pooled HTTP session.
+
+    Results are cached per (user, repo, resource) so repeated commands
+    from the same chat do not hit the API again. Identical lookups that
+    arrive while one is in flight wait for it instead of starting another.
+    """
+
+    def __init__(self, base_url=GITHUB_API_URL, token=GITHUB_TOKEN, cache_ttl=CACHE_TTL,
+                 max_connections=100, timeout=10):
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.cache = TTLCache(cache_ttl)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.stats = Counter()
+        self._session = None
+        self._inflight = {}
+
+    @property
+    def session(self):
+        # Created lazily so it is bound to the running event loop
+        if self._session is None or self._session.closed:
+            headers = {'Accept': 'application/vnd.github+json'}
+            if self.token:
+                headers['Authorization'] = f'Bearer {self.token}'
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    def _url(self, path):
+        # Pagination links are absolute URLs
+        if path.startswith(('http://', 'https://')):
+            return path
+        return f'{self.base_url}/{path.lstrip("/")}'
+
+    async def _get(self, path, params=None):
+        async with self.session.get(self._url(path), params=params) as response:
+            response.raise_for_status()
+            return await response.json(), response.headers
+
+    async def _count_items(self, path, params=None):
+        # Ask for one item per page; the page number of the "last" link is
+        # then the item count, so no page has to be downloaded in full
+        items, headers = await self._get(path, dict(params or {}, per_page=1))
+        last_page = _last_page(headers.get('Link', ''))
+        return last_page if last_page is not None else len(items)
+
+    async def _graphql(self, query, variables):
+        async with self.session.post(f'{self.base_url}/graphql',
+                                     json={'query': query, 'variables': variables}) as response:
+            response.raise_for_status()
+            result = await response.json()
+        if result.get('errors'):
+            raise ValueError(result['errors'][0].get('message', 'GraphQL error'))
+        return result['data']
+
+    async def _cached(self, user_id, repo, resource, fetch):
+        key = (user_id, repo, resource)
+        value = self.cache.get(key)
+        if value is not None:
+            self.stats['cache_hits'] += 1
+            return value
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats['fetches'] += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._store(key, done))
+        else:
+            self.stats['coalesced'] += 1
+        # Shielded so one cancelled waiter does not cancel the shared fetch
+        return await asyncio.shield(task)
+
+    def _store(self, key, task):
+        del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.cache.set(key, task.result())
+
+    async def get_repos(self, username, user_id=None):
+        return await self._cached(user_id, username, 'repos', lambda: self._fetch_repos(username))
+
+    async def _fetch_repos(self, username):
+        # Follow the Link: rel="next" pages; the next URL keeps the query
+        repos, headers = await self._get(f'users/{username}/repos', {'per_page': 100, 'sort': 'updated'})
+        names = [repo['name'] for repo in repos]
+        next_url = _link(headers.get('Link', ''), 'next')
+        while next_url:
+            repos, headers = await self._get(next_url)
+            names.extend(repo['name'] for repo in repos)
+            next_url = _link(headers.get('Link', ''), 'next')
+        return names
+
+    async def get_top_repos(self, count=10):
+        # Not user specific, so every chat shares one cache entry
+        return await self._cached(None, None, f'top{count}', lambda: self._fetch_top_repos(count))
+
+    async def _fetch_top_repos(self, count):
+        result, _ = await self._get('search/repositories', {
+            'q': 'stars:>1', 'sort': 'stars', 'order': 'desc', 'per_page': count})
+        return [(repo['full_name'], repo['stargazers_count']) for repo in result['items']]
+
+    async def count_branches(self, repo, user_id=None):
+        return await self._cached(
+            user_id, repo, 'branches', lambda: self._count_items(f'repos/{repo}/branches'))
+
+    async def count_open_issues(self, repo, user_id=None):
+        return await self._cached(user_id, repo, 'issues', lambda: self._fetch_open_issues(repo))
+
+    async def _fetch_open_issues(self, repo):
+        # The issues endpoint also lists pull requests, subtract those
+        issues, pulls = await asyncio.gather(
+            self._count_items(f'repos/{repo}/issues', {'state': 'open'}),
+            self._count_items(f'repos/{repo}/pulls', {'state': 'open'}))
+        return issues - pulls
+
+    async def count_open_pull_requests(self, repo, user_id=None):
+        return await self._cached(
+            user_id, repo, 'pulls',
+            lambda: self._count_items(f'repos/{repo}/pulls', {'state': 'open'}))
+
+    async def get_repo_summary(self, repo, user_id=None):
+        return await self._cached(user_id, repo, 'summary', lambda: self._fetch_repo_summary(repo))
+
+    async def _fetch_repo_summary(self, repo):
+        # One GraphQL round trip when authenticated (GitHub's GraphQL API
+        # requires a token), otherwise three concurrent one-item REST calls
+        if self.token:
+            try:
+                owner, name = repo.split('/', 1)
+                data = await self._graphql(REPO_SUMMARY_QUERY, {'owner': owner, 'name': name})
+            except (aiohttp.ClientError, ValueError):
+                pass
+            else:
+                repository = data['repository']
+                return {
+                    'branches': repository['refs']['totalCount'],
+                    'open_issues': repository['issues']['totalCount'],
+                    'open_pull_requests': repository['pullRequests']['totalCount'],
+                }
+
+        branches, issues_and_pulls, pulls = await asyncio.gather(
+            self._count_items(f'repos/{repo}/branches'),
+            self._count_items(f'repos/{repo}/issues', {'state': 'open'}),
+            self._count_items(f'repos/{repo}/pulls', {'state': 'open'}))
+        return {
+            'branches': branches,
+            'open_issues': issues_and_pulls - pulls,
+            'open_pull_requests': pulls,
+        }
 
-def start(update, context):
-    update.message.reply_text("Hi! I'm your bot.")
 
-def echo(update, context):
-    update.message.reply_text(f"You said: {update.message.text}")
+def _link(link_header, rel):
+    for part in link_header.split(','):
+        match = re.search(rf'<([^>]+)>\s*;\s*rel="{rel}"', part)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _last_page(link_header):
+    url = _link(link_header, 'last')
+    if url is None:
+        return None
+    page = parse_qs(urlparse(url).query).get('page')
+    return int(page[0]) if page else None
+
+
+def init_bot_data(bot_data, github=None, limiter=None):
+    bot_data['github'] = github or GitHubClient()
+    bot_data['limiter'] = limiter or ChatRateLimiter()
+    bot_data['stats'] = Counter()
+
+
+def _github(context):
+    return context.application.bot_data['github']
+
+
+def _user_id(update):
+    return update.effective_user.id if update.effective_user else None
+
+
+def _chat_id(update):
+    chat = getattr(update, 'effective_chat', None)
+    return chat.id if chat else _user_id(update)
+
+
+async def _allow(update, context):
+    # Per-chat token bucket; tell the chat once when it starts being throttled
+    bot_data = context.application.bot_data
+    chat_id = _chat_id(update)
+    wait = bot_data['limiter'].acquire(chat_id)
+    throttled_chats = bot_data.setdefault('throttled_chats', set())
+    if wait:
+        bot_data['stats']['throttled'] += 1
+        if chat_id not in throttled_chats:
+            throttled_chats.add(chat_id)
+            await update.message.reply_text(f"Too many commands, try again in {wait:.0f}s.")
+        return False
+    throttled_chats.discard(chat_id)
+    bot_data['stats']['handled'] += 1
+    return True
+
+
+async def _reply_with(update, context, usage, lookup, format_result):
+    # Shared rate limiting, argument handling and error reporting for the
+    # GitHub commands; usage=None means the command takes no argument
+    if not await _allow(update, context):
+        return
+    if usage and not context.args:
+        await update.message.reply_text(usage)
+        return
+    name = context.args[0] if usage else None
+    try:
+        result = await lookup(_github(context), name, _user_id(update))
+    except aiohttp.ClientResponseError as e:
+        await update.message.reply_text(f"GitHub API error for {name or 'GitHub'}: {e.status} {e.message}")
+        return
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        await update.message.reply_text("GitHub is not responding, please try again later.")
+        return
+    await update.message.reply_text(format_result(name, result))
+
+
+async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text("Hi! I'm your bot.")
+
+
+async def echo(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text(f"You said: {update.message.text}")
+
 
 # Exercise 1: Get the repositores of a user in github via api calls to github api
-def get_repos(update, context, username):
-    # TODO: Get the repositores of a user in github via api calls to github api
-    pass
+async def get_repos(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _reply_with(
+        update, context, "Usage: /repos <username>",
+        lambda github, name, user_id: github.get_repos(name, user_id),
+        lambda name, repos: f"{name} has {len(repos)} repositories:\n" + "\n".join(repos[:30]))
 
 
 #2. Add a command to get the top 10 repositores in github via api calls to github api
-def get_top_10_repos(update, context):
-    # TODO: Get the top 10 repositores in github via api calls to github api
-    pass
+async def get_top_10_repos(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _reply_with(
+        update, context, None,
+        lambda github, name, user_id: github.get_top_repos(10),
+        lambda name, repos: "Top 10 repositories:\n" + "\n".join(
+            f"{i}. {full_name} ({stars} stars)" for i, (full_name, stars) in enumerate(repos, 1)))
 
 #3. Add a commad to get how many branches a repo has via api calls to github api
-def get_branches(update, context, repo_name):
-    # TODO: Get how many branches a repo has via api calls to github api
-    pass
+async def get_branches(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _reply_with(
+        update, context, "Usage: /branches <owner/repo>",
+        lambda github, name, user_id: github.count_branches(name, user_id),
+        lambda name, count: f"{name} has {count} branches.")
+
 
 #4. Check if a GitHub repo has open issues and how many.
-def get_open_issues(update, context, repo_name):
-    # TODO: Get how many open issues a repo has via api calls to github api
-    pass
+async def get_open_issues(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _reply_with(
+        update, context, "Usage: /issues <owner/repo>",
+        lambda github, name, user_id: github.count_open_issues(name, user_id),
+        lambda name, count: f"{name} has {count} open issues." if count else f"{name} has no open issues.")
+
 
 #5. Check if a GitHub repo has open pull requests and how many.
-def get_open_pull_requests(update, context, repo_name):
-    # TODO: Get how many open pull requests a repo has via api calls to github api
-    pass    
+async def get_open_pull_requests(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _reply_with(
+        update, context, "Usage: /prs <owner/repo>",
+        lambda github, name, user_id: github.count_open_pull_requests(name, user_id),
+        lambda name, count: (f"{name} has {count} open pull requests." if count
+                             else f"{name} has no open pull requests."))
+
+
+async def get_repo_summary(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await _reply_with(
+        update, context, "Usage: /summary <owner/repo>",
+        lambda github, name, user_id: github.get_repo_summary(name, user_id),
+        lambda name, summary: (f"{name}: {summary['branches']} branches, "
+                               f"{summary['open_issues']} open issues, "
+                               f"{summary['open_pull_requests']} open pull requests."))
+
 
 #6. Add a /weather <city> command→ Use OpenWeatherMap API to return current weather.
 def get_weather(update, context, city):
@@ -45,15 +376,44 @@ def get_joke(update, context):
     pass
 
 
+async def get_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    stats = context.application.bot_data['stats']
+    github_stats = _github(context).stats
+    await update.message.reply_text(
+        f"Handled: {stats['handled']}, throttled: {stats['throttled']}, "
+        f"cached: {github_stats['cache_hits'] + github_stats['coalesced']} "
+        f"({github_stats['coalesced']} coalesced), GitHub fetches: {github_stats['fetches']}")
+
+
+async def post_init(application: Application):
+    init_bot_data(application.bot_data)
+
+
+async def post_shutdown(application: Application):
+    await application.bot_data['github'].close()
+
+
 def main():
-    updater = Updater(TOKEN, use_context=True)
-    dp = updater.dispatcher
+    application = (
+        Application.builder()
+        .token(TOKEN)
+        .concurrent_updates(True)  # A slow lookup must not block other chats
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
-    dp.add_handler(CommandHandler("start", start))
-    dp.add_handler(MessageHandler(Filters.text & ~Filters.command, echo))
+    application.add_handler(CommandHandler("start", start))
+    application.add_handler(CommandHandler("repos", get_repos))
+    application.add_handler(CommandHandler("top10", get_top_10_repos))
+    application.add_handler(CommandHandler("branches", get_branches))
+    application.add_handler(CommandHandler("issues", get_open_issues))
+    application.add_handler(CommandHandler("prs", get_open_pull_requests))
+    application.add_handler(CommandHandler("summary", get_repo_summary))
+    application.add_handler(CommandHandler("stats", get_stats))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, echo))
 
-    updater.start_polling()
-    updater.idle()
+    application.run_polling()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,237 @@
+"""
+Tests for the GitHub client helpers in bot.py.
+
+Run from this folder: python -m unittest test_bot
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+import aiohttp
+
+import bot
+from benchmark_bot import FakeGitHubServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(bot.time, 'monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_entries_expire_after_ttl(self):
+        cache = bot.TTLCache(ttl=60)
+        cache.set('key', 'value')
+        self.clock.now += 59
+        self.assertEqual(cache.get('key'), 'value')
+        self.clock.now += 2
+        self.assertIsNone(cache.get('key'))
+        self.assertNotIn('key', cache._entries)
+
+    def test_full_cache_drops_expired_then_oldest(self):
+        cache = bot.TTLCache(ttl=60, maxsize=2)
+        cache.set('old', 1)
+        self.clock.now += 30
+        cache.set('newer', 2)
+        self.clock.now += 31
+        cache.set('third', 3)
+        self.assertEqual((cache.get('newer'), cache.get('third')), (2, 3))
+        cache.set('fourth', 4)
+        self.assertIsNone(cache.get('newer'))
+        self.assertEqual(len(cache._entries), 2)
+
+
+class TestChatRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(bot.time, 'monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_wait(self):
+        limiter = bot.ChatRateLimiter(rate=0.5, burst=3)
+        self.assertEqual([limiter.acquire(1) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(limiter.acquire(1), 2.0)
+        # Other chats have their own bucket
+        self.assertEqual(limiter.acquire(2), 0)
+
+    def test_tokens_refill_at_rate_up_to_burst(self):
+        limiter = bot.ChatRateLimiter(rate=0.5, burst=3)
+        for _ in range(3):
+            limiter.acquire(1)
+        self.clock.now += 1
+        self.assertAlmostEqual(limiter.acquire(1), 1.0)
+        self.clock.now += 1
+        self.assertEqual(limiter.acquire(1), 0)
+        self.clock.now += 100
+        self.assertEqual([limiter.acquire(1) for _ in range(3)], [0, 0, 0])
+        self.assertGreater(limiter.acquire(1), 0)
+
+
+class TestGitHubClient(unittest.IsolatedAsyncioTestCase):
+    async def test_identical_lookups_are_coalesced(self):
+        client = bot.GitHubClient(base_url='http://github.invalid')
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await release.wait()
+            return ['repo']
+
+        waiters = [asyncio.ensure_future(client._cached(1, 'octo', 'repos', fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        self.assertEqual(await asyncio.gather(*waiters), [['repo']] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((client.stats['fetches'], client.stats['coalesced']), (1, 4))
+
+        self.assertEqual(await client._cached(1, 'octo', 'repos', fetch), ['repo'])
+        self.assertEqual(client.stats['cache_hits'], 1)
+
+    async def test_failed_lookups_are_not_cached(self):
+        client = bot.GitHubClient(base_url='http://github.invalid')
+
+        async def fail():
+            raise ValueError('boom')
+
+        with self.assertRaises(ValueError):
+            await client._cached(1, 'octo', 'repos', fail)
+        self.assertIsNone(client.cache.get((1, 'octo', 'repos')))
+        self.assertEqual(client._inflight, {})
+
+    async def test_repos_follow_next_pages(self):
+        with FakeGitHubServer(0, repos=250) as server:
+            client = bot.GitHubClient(base_url=server.url)
+            try:
+                repos = await client.get_repos('octocat')
+            finally:
+                await client.close()
+            self.assertEqual(repos, [f'repo-{i}' for i in range(250)])
+            self.assertEqual(server.app['stats']['requests'], 3)
+
+
+
+class FakeResponse:
+    def __init__(self, payload, links=None, status=200):
+        self.payload = payload
+        self.status = status
+        self.headers = {'Link': links} if links else {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    async def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Stands in for aiohttp.ClientSession, answering from canned responses."""
+
+    closed = False
+
+    def __init__(self, counts, graphql=None):
+        # counts maps a path suffix to (item count, whether a Link header is sent)
+        self.counts = counts
+        self.graphql = graphql
+        self.requests = []
+
+    def get(self, url, params=None):
+        self.requests.append(('GET', url, params))
+        resource = url.rsplit('/', 1)[1]
+        total, paged = self.counts[resource]
+        per_page = (params or {}).get('per_page', 30)
+        links = None
+        if paged and total > per_page:
+            last = (total + per_page - 1) // per_page
+            links = (f'<{url}?per_page={per_page}&page=2>; rel="next", '
+                     f'<{url}?per_page={per_page}&page={last}>; rel="last"')
+        return FakeResponse([{}] * min(total, per_page), links)
+
+    def post(self, url, json=None):
+        self.requests.append(('POST', url, json['variables']))
+        return FakeResponse(self.graphql)
+
+    async def close(self):
+        self.closed = True
+
+
+def summary_client(counts, token=None, graphql=None):
+    client = bot.GitHubClient(base_url='http://github.invalid', token=token)
+    client._session = FakeSession(counts, graphql)
+    return client
+
+
+COUNTS = {'branches': (250, True), 'issues': (150, True), 'pulls': (30, True)}
+
+
+class TestRepoSummary(unittest.IsolatedAsyncioTestCase):
+    async def test_graphql_total_counts(self):
+        client = summary_client(COUNTS, token='t', graphql={'data': {'repository': {
+            'refs': {'totalCount': 7},
+            'issues': {'totalCount': 5},
+            'pullRequests': {'totalCount': 2},
+        }}})
+        summary = await client.get_repo_summary('octo/project')
+        self.assertEqual(summary, {'branches': 7, 'open_issues': 5, 'open_pull_requests': 2})
+        self.assertEqual(client.session.requests,
+                         [('POST', 'http://github.invalid/graphql', {'owner': 'octo', 'name': 'project'})])
+
+    async def test_graphql_error_falls_back_to_rest(self):
+        client = summary_client(COUNTS, token='t', graphql={'errors': [{'message': 'nope'}]})
+        summary = await client.get_repo_summary('octo/project')
+        self.assertEqual(summary, {'branches': 250, 'open_issues': 120, 'open_pull_requests': 30})
+        rest = [request for request in client.session.requests if request[0] == 'GET']
+        self.assertEqual(len(rest), 3)
+        self.assertTrue(all(params['per_page'] == 1 for _, _, params in rest))
+
+    async def test_without_token_uses_rest(self):
+        client = summary_client(COUNTS)
+        summary = await client.get_repo_summary('octo/project')
+        self.assertEqual(summary['open_issues'], 120)
+        self.assertNotIn('POST', [method for method, _, _ in client.session.requests])
+
+    async def test_open_issues_exclude_pull_requests(self):
+        client = summary_client(COUNTS)
+        self.assertEqual(await client.count_open_issues('octo/project'), 120)
+        self.assertEqual(await client.count_open_pull_requests('octo/project'), 30)
+        self.assertEqual(await client.count_branches('octo/project'), 250)
+
+    async def test_count_without_link_header_uses_page_length(self):
+        client = summary_client({'branches': (1, False), 'issues': (0, False), 'pulls': (0, False)})
+        self.assertEqual(await client.count_branches('octo/project'), 1)
+        self.assertEqual(await client.count_open_issues('octo/project'), 0)
+
+
+class TestLinkHeader(unittest.TestCase):
+    def test_last_page_is_read_from_link(self):
+        header = ('<https://api.github.com/repos/o/r/branches?per_page=1&page=2>; rel="next", '
+                  '<https://api.github.com/repos/o/r/branches?per_page=1&page=42>; rel="last"')
+        self.assertEqual(bot._last_page(header), 42)
+        self.assertTrue(bot._link(header, 'next').endswith('page=2'))
+
+    def test_link_without_last(self):
+        header = '<https://api.github.com/repos/o/r/branches?per_page=1&page=1>; rel="prev"'
+        self.assertIsNone(bot._last_page(header))
+        self.assertIsNone(bot._last_page(''))
+        self.assertIsNone(bot._link(header, 'next'))
+
+if __name__ == '__main__':
+    unittest.main()
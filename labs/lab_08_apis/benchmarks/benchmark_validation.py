@@ -0,0 +1,55 @@
+"""Benchmark cached vs. uncached GraphQL query validation.
+
+Run from the lab directory:
+
+    python -m benchmarks.benchmark_validation
+"""
+
+import argparse
+import timeit
+
+from exercises.exercise3 import DocumentCache, GraphQLClient, create_example_schema
+
+QUERY = """
+query GetUser($id: String!) {
+    user(id: $id) {
+        id
+        name
+        email
+        age
+    }
+    users {
+        id
+        name
+    }
+}
+"""
+
+
+def run(iterations: int) -> None:
+    """Time validation of the same query with and without the cache.
+
+    Args:
+        iterations: Number of validations per variant
+    """
+    schema = create_example_schema()
+
+    uncached = GraphQLClient("http://localhost/graphql", document_cache=DocumentCache(maxsize=0))
+    uncached.set_schema(schema)
+    cached = GraphQLClient("http://localhost/graphql")
+    cached.set_schema(schema)
+
+    uncached_time = timeit.timeit(lambda: uncached._validate_query(QUERY), number=iterations)
+    cached_time = timeit.timeit(lambda: cached._validate_query(QUERY), number=iterations)
+
+    print(f"Validations:   {iterations}")
+    print(f"Uncached:      {uncached_time / iterations * 1e6:8.1f} us/query")
+    print(f"Cached:        {cached_time / iterations * 1e6:8.1f} us/query")
+    print(f"Speedup:       {uncached_time / cached_time:8.1f}x")
+    print(f"Cache stats:   {cached.document_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=2000)
+    run(parser.parse_args().iterations)
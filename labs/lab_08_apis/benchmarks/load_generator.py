@@ -0,0 +1,190 @@
+"""Drive the lab clients at a target request rate and report latency.
+
+Starts an in-process stub server unless --url is given. Run from the lab
+directory:
+
+    python -m benchmarks.load_generator --client rest --rps 200 --duration 10
+"""
+
+import argparse
+import math
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.stub_server import StubServer, add_stub_arguments, config_from_args
+from exercises.exercise1 import HTTPClient
+from exercises.exercise2 import RESTClient
+from exercises.exercise3 import GraphQLClient
+
+USER_QUERY = "query GetUser($id: String!) { user(id: $id) { id name email } }"
+
+
+@dataclass
+class LoadReport:
+    """Result of a load run."""
+
+    requests: int
+    errors: int
+    duration: float
+    target_rps: float
+    latencies: List[float] = field(repr=False, default_factory=list)
+    error_types: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Completed requests per second."""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Latency percentile in seconds (nearest rank).
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            float: Latency at the percentile, 0.0 without samples
+        """
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the report as a dictionary with latencies in milliseconds."""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "duration_s": round(self.duration, 3),
+            "target_rps": self.target_rps,
+            "throughput_rps": round(self.throughput, 1),
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p90_ms": round(self.percentile(90) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(max(self.latencies, default=0.0) * 1000, 2),
+            "error_types": self.error_types,
+        }
+
+
+class LoadGenerator:
+    """Open-loop load generator issuing calls at a fixed rate.
+
+    Latency is measured from each call's scheduled start time, so time
+    spent waiting for a free worker counts against the client instead of
+    being hidden by a slower send rate.
+    """
+
+    def __init__(self, target: Callable[[], Any], rps: float, duration: float, workers: int = 32):
+        """Initialize the generator.
+
+        Args:
+            target: Callable making one request
+            rps: Target requests per second
+            duration: Seconds to generate load for
+            workers: Maximum number of concurrent requests
+        """
+        self.target = target
+        self.rps = rps
+        self.duration = duration
+        self.workers = workers
+
+    def run(self) -> LoadReport:
+        """Generate load and wait for all requests to finish.
+
+        Returns:
+            LoadReport: Throughput, latency and error statistics
+        """
+        latencies: List[float] = []
+        error_types: Counter = Counter()
+        lock = threading.Lock()
+        total = int(self.rps * self.duration)
+
+        def call(scheduled: float) -> None:
+            try:
+                self.target()
+                error = None
+            except Exception as e:
+                error = type(e).__name__
+            elapsed = time.perf_counter() - scheduled
+            with lock:
+                latencies.append(elapsed)
+                if error:
+                    error_types[error] += 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for i in range(total):
+                scheduled = start + i / self.rps
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(call, scheduled)
+        duration = time.perf_counter() - start
+
+        return LoadReport(
+            requests=len(latencies),
+            errors=sum(error_types.values()),
+            duration=duration,
+            target_rps=self.rps,
+            latencies=latencies,
+            error_types=dict(error_types)
+        )
+
+
+def make_target(client_name: str, base_url: str, pool_maxsize: int) -> Tuple[Any, Callable[[], Any]]:
+    """Create a client and a callable making one request with it.
+
+    Args:
+        client_name: "http", "rest" or "graphql"
+        base_url: Base URL of the server
+        pool_maxsize: Connections kept open per host
+
+    Returns:
+        Tuple: The client and the request callable
+    """
+    if client_name == "http":
+        client = HTTPClient(base_url, pool_maxsize=pool_maxsize)
+        return client, lambda: client.get("items/1")
+    if client_name == "rest":
+        client = RESTClient(base_url, max_retries=1, pool_maxsize=pool_maxsize)
+        return client, lambda: client.get("items/1", use_cache=False)
+    if client_name == "graphql":
+        client = GraphQLClient(f"{base_url}/graphql", pool_maxsize=pool_maxsize)
+        return client, lambda: client.query(USER_QUERY, {"id": "1"})
+    raise ValueError(f"Unknown client: {client_name}")
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run the load generator from the command line."""
+    parser = argparse.ArgumentParser(description="Load generator for the lab clients")
+    parser.add_argument("--client", choices=["http", "rest", "graphql"], default="http")
+    parser.add_argument("--rps", type=float, default=100.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent requests")
+    parser.add_argument("--url", help="Use an existing server instead of the stub")
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = None if args.url else StubServer(config_from_args(args)).start()
+    try:
+        client, target = make_target(args.client, args.url or server.url, args.workers)
+        report = LoadGenerator(target, args.rps, args.duration, args.workers).run()
+        summary = report.summary()
+        summary["connections"] = client.connection_stats()
+        if server is not None:
+            summary["server"] = server.stats()
+    finally:
+        if server is not None:
+            server.stop()
+
+    for key, value in summary.items():
+        print(f"{key:>15}: {value}")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
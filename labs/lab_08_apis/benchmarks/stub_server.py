@@ -0,0 +1,312 @@
+"""Local stand-in HTTP/GraphQL server for benchmarking the lab clients.
+
+Run from the lab directory:
+
+    python -m benchmarks.stub_server --port 8000 --latency 0.02
+
+Routes:
+    GET  /items?page=N&per_page=M  Paginated list with Link and ETag headers
+    GET  /items/<id>               Single item with an ETag header
+    POST|PUT|DELETE /items[/<id>]  Echo the JSON body back
+    GET|POST /graphql              Execute against the example schema,
+                                   including batched (array) requests
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from graphql import graphql_sync
+
+from exercises.exercise3 import create_example_schema
+
+
+@dataclass
+class StubConfig:
+    """Behavior of the stub server."""
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    payload_size: int = 0
+    error_rate: float = 0.0
+    rate_limit: Optional[float] = None
+    retry_after: int = 1
+    total_items: int = 100
+    page_size: int = 10
+    etag: bool = True
+
+
+class _RateLimiter:
+    """Token bucket refilled at a fixed rate."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        # Rates below one request per second still need room for one token
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler driven by the server's StubConfig."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+    schema = create_example_schema()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str) -> None:
+        """Apply latency, rate limiting and errors, then route the request."""
+        config: StubConfig = self.server.config
+        self.server.count("requests")
+        body = self._read_body()
+
+        delay = config.latency + random.uniform(0, config.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.server.limiter is not None and not self.server.limiter.allow():
+            self.server.count("rate_limited")
+            return self._send_json(
+                429, {"error": "Too Many Requests"}, {"Retry-After": str(config.retry_after)}
+            )
+        if config.error_rate and random.random() < config.error_rate:
+            self.server.count("errors")
+            return self._send_json(500, {"error": "Injected failure"})
+
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+
+        if parts == ["graphql"]:
+            return self._graphql(method, query, body)
+        if parts and parts[0] == "items":
+            if method == "GET":
+                return self._get_items(parts[1:], query)
+            return self._send_json(201 if method == "POST" else 200, self._decode(body) or {})
+        self._send_json(404, {"error": "Not Found"})
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length", 0))
+        return self.rfile.read(length) if length else b""
+
+    @staticmethod
+    def _decode(body: bytes) -> Any:
+        return json.loads(body) if body else None
+
+    def _item(self, item_id: int) -> Dict[str, Any]:
+        item = {"id": item_id, "name": f"Item {item_id}"}
+        if self.server.config.payload_size:
+            item["payload"] = "x" * self.server.config.payload_size
+        return item
+
+    def _get_items(self, parts: List[str], query: Dict[str, str]) -> None:
+        """Serve a single item or a page of items."""
+        config: StubConfig = self.server.config
+        if parts:
+            if not parts[0].isdigit() or not 0 < int(parts[0]) <= config.total_items:
+                return self._send_json(404, {"error": "Not Found"})
+            return self._send_json(200, self._item(int(parts[0])))
+
+        page = max(int(query.get("page", 1)), 1)
+        per_page = max(int(query.get("per_page", config.page_size)), 1)
+        last = max((config.total_items + per_page - 1) // per_page, 1)
+        start = (page - 1) * per_page
+        items = [
+            self._item(item_id)
+            for item_id in range(start + 1, min(start + per_page, config.total_items) + 1)
+        ]
+
+        links = [f'<{self._page_url(last, per_page)}>; rel="last"']
+        if page < last:
+            links.insert(0, f'<{self._page_url(page + 1, per_page)}>; rel="next"')
+        if page > 1:
+            links.insert(0, f'<{self._page_url(page - 1, per_page)}>; rel="prev"')
+        self._send_json(200, items, {"Link": ", ".join(links)})
+
+    def _page_url(self, page: int, per_page: int) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/items?page={page}&per_page={per_page}"
+
+    def _graphql(self, method: str, query: Dict[str, str], body: bytes) -> None:
+        """Execute one operation or a batch against the example schema."""
+        if method == "GET":
+            payload = dict(query)
+            if "variables" in payload:
+                payload["variables"] = json.loads(payload["variables"])
+        else:
+            payload = self._decode(body)
+
+        if isinstance(payload, list):
+            self.server.count("graphql_operations", len(payload))
+            return self._send_json(200, [self._execute(operation) for operation in payload])
+        self.server.count("graphql_operations")
+        self._send_json(200, self._execute(payload or {}))
+
+    def _execute(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not payload.get("query"):
+            return {"errors": [{"message": "Must provide query string."}]}
+        result = graphql_sync(
+            self.schema,
+            payload["query"],
+            variable_values=payload.get("variables"),
+            operation_name=payload.get("operationName")
+        )
+        response: Dict[str, Any] = {"data": result.data}
+        if result.errors:
+            response["errors"] = [{"message": error.message} for error in result.errors]
+        return response
+
+    def _send_json(self, status: int, data: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        """Send a JSON response, answering conditional GETs with 304."""
+        body = json.dumps(data).encode()
+        headers = dict(headers or {})
+        if self.command == "GET" and status == 200 and self.server.config.etag:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self.server.count("not_modified")
+                status, body = 304, b""
+
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    """Threaded stub server that can run in the background."""
+
+    daemon_threads = True
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """Initialize the server.
+
+        Args:
+            config: Server behavior, defaults to no latency and no errors
+            host: Interface to bind
+            port: Port to bind, 0 picks a free port
+        """
+        super().__init__((host, port), StubHandler)
+        self.config = config or StubConfig()
+        self.limiter = _RateLimiter(self.config.rate_limit) if self.config.rate_limit else None
+        self._counters: Dict[str, int] = {}
+        self._counter_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a request counter."""
+        with self._counter_lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def stats(self) -> Dict[str, int]:
+        """Get a copy of the request counters."""
+        with self._counter_lock:
+            return dict(self._counters)
+
+    def start(self) -> "StubServer":
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add StubConfig options to a command line parser."""
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Random extra latency")
+    parser.add_argument("--payload-size", type=int, default=0, help="Filler bytes per item")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests/s before 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After for 429 responses")
+    parser.add_argument("--total-items", type=int, default=100, help="Number of items")
+    parser.add_argument("--page-size", type=int, default=10, help="Default items per page")
+    parser.add_argument("--no-etag", action="store_true", help="Disable ETag headers")
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    """Build a StubConfig from parsed add_stub_arguments options."""
+    return StubConfig(
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        payload_size=args.payload_size,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        total_items=args.total_items,
+        page_size=args.page_size,
+        etag=not args.no_etag
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub HTTP/GraphQL server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = StubServer(config_from_args(args), args.host, args.port)
+    print(f"Serving on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,25 +1,201 @@
 """HTTP requests and response handling module."""
 
 import json
+import threading
 import xml.etree.ElementTree as ET
 from typing import Any, Dict, Optional, Union
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
+
+
+class ConnectionStats:
+    """Thread-safe counters for connection pool activity."""
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.tls_handshakes = 0
+        self.discarded_connections = 0
+
+    def record_request(self, reused: bool, tls: bool) -> None:
+        """Record a request sent over a pooled connection.
+
+        Args:
+            reused: Whether the connection was already open (keep-alive)
+            tls: Whether a new connection needs a TLS handshake
+        """
+        with self._lock:
+            self.requests += 1
+            if reused:
+                self.reused_connections += 1
+            else:
+                self.new_connections += 1
+                if tls:
+                    self.tls_handshakes += 1
+
+    def record_discard(self) -> None:
+        """Record a connection dropped because its pool was full."""
+        with self._lock:
+            self.discarded_connections += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a consistent copy of the counters.
+
+        Returns:
+            Dict[str, Any]: Counter values and the keep-alive reuse ratio
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "tls_handshakes": self.tls_handshakes,
+                "discarded_connections": self.discarded_connections,
+                "reuse_ratio": (
+                    self.reused_connections / self.requests if self.requests else 0.0
+                ),
+            }
+
+
+def _instrumented_pool_class(base: type, stats: ConnectionStats) -> type:
+    """Create a connection pool class that reports to the given stats.
+
+    Args:
+        base: urllib3 connection pool class to extend
+        stats: Counters to update
+
+    Returns:
+        type: Connection pool subclass
+    """
+    class InstrumentedConnectionPool(base):
+        def _make_request(self, conn, *args, **kwargs):
+            stats.record_request(
+                reused=getattr(conn, "sock", None) is not None,
+                tls=self.scheme == "https"
+            )
+            return super()._make_request(conn, *args, **kwargs)
+
+        def _put_conn(self, conn):
+            was_open = getattr(conn, "sock", None) is not None
+            super()._put_conn(conn)
+            # The base class closes connections it cannot return to a full pool
+            if was_open and conn.sock is None:
+                stats.record_discard()
+
+    InstrumentedConnectionPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedConnectionPool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter with tunable pools and connection reuse counters."""
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: Union[int, Retry, None] = 0,
+        pool_block: bool = False
+    ):
+        """Initialize the adapter.
+
+        Args:
+            pool_connections: Number of per-host pools to keep
+            pool_maxsize: Maximum connections kept open per host
+            max_retries: Retry count or urllib3 Retry strategy
+            pool_block: Whether to block instead of opening extra connections
+        """
+        self.stats = ConnectionStats()
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries if max_retries is not None else 0,
+            pool_block=pool_block
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        """Create the pool manager with instrumented pool classes."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _instrumented_pool_class(pool_cls, self.stats)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+def mount_pooled_adapter(
+    session: requests.Session,
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    retry_strategy: Optional[Retry] = None,
+    pool_block: bool = False
+) -> PooledHTTPAdapter:
+    """Mount a PooledHTTPAdapter on a session for http and https.
+
+    Args:
+        session: Session to configure
+        pool_connections: Number of per-host pools to keep
+        pool_maxsize: Maximum connections kept open per host
+        retry_strategy: Transport-level retry strategy
+        pool_block: Whether to block instead of opening extra connections
+
+    Returns:
+        PooledHTTPAdapter: The mounted adapter
+    """
+    adapter = PooledHTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry_strategy,
+        pool_block=pool_block
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
 
 
 class HTTPClient:
     """Client for making HTTP requests with response handling."""
 
-    def __init__(self, base_url: str = "", timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str = "",
+        timeout: int = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        retry_strategy: Optional[Retry] = None,
+        pool_block: bool = False
+    ):
         """Initialize the HTTP client.
 
         Args:
             base_url: Base URL for all requests
             timeout: Request timeout in seconds
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept open per host
+            retry_strategy: Transport-level retry strategy
+            pool_block: Whether to block instead of opening extra connections
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.session = requests.Session()
+        self.adapter = mount_pooled_adapter(
+            self.session,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            retry_strategy=retry_strategy,
+            pool_block=pool_block
+        )
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Get connection reuse counters.
+
+        Returns:
+            Dict[str, Any]: Snapshot of the adapter's connection stats
+        """
+        return self.adapter.stats.snapshot()
 
     def _build_url(self, endpoint: str) -> str:
         """Build the full URL for a request.
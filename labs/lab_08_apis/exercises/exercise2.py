@@ -1,16 +1,24 @@
 """REST API operations with authentication and advanced features."""
 
+import bisect
 import json
 import logging
+import random
+import re
+import threading
 import time
-from typing import Any, Dict, Optional, Union
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple, Union
 from functools import wraps
 import requests
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 import os
 
+from exercises.exercise1 import mount_pooled_adapter
+
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +27,124 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Upper bounds (in milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class _LazyJSON:
+    """Defer json.dumps until a log record is actually formatted."""
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __str__(self) -> str:
+        return json.dumps(self.data)
+
+
+class _LazyBody:
+    """Defer decoding a response body until a log record is formatted."""
+
+    def __init__(self, response: requests.Response, limit: int):
+        self.response = response
+        self.limit = limit
+
+    def __str__(self) -> str:
+        content = self.response.content or b""
+        encoding = self.response.encoding or "utf-8"
+        text = content[:self.limit].decode(encoding, errors="replace")
+        if len(content) > self.limit:
+            text += f"... ({len(content)} bytes)"
+        return text
+
+
+class RequestMetrics:
+    """Per-endpoint latency histograms, byte counters and status codes."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        """Initialize empty metrics.
+
+        Args:
+            buckets: Upper bounds of the latency buckets in milliseconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self.status_codes: Counter = Counter()
+
+    def record(
+        self,
+        endpoint: str,
+        status_code: Union[int, str],
+        elapsed: float,
+        bytes_sent: int,
+        bytes_received: int
+    ) -> None:
+        """Record a completed or failed request.
+
+        Args:
+            endpoint: Endpoint key, e.g. "GET users/:id"
+            status_code: HTTP status code, or the exception class name when
+                no response was received
+            elapsed: Request duration in seconds
+            bytes_sent: Size of the request body
+            bytes_received: Size of the response body
+        """
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(self.buckets) + 1),
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "status_codes": Counter(),
+                }
+                self._endpoints[endpoint] = stats
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["histogram"][bisect.bisect_left(self.buckets, elapsed_ms)] += 1
+            stats["bytes_sent"] += bytes_sent
+            stats["bytes_received"] += bytes_received
+            stats["status_codes"][status_code] += 1
+            self.status_codes[status_code] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of all metrics as plain dictionaries.
+
+        Returns:
+            Dict[str, Any]: Metrics keyed by endpoint, plus overall status codes
+        """
+        labels = [f"le_{bound:g}ms" for bound in self.buckets] + ["le_inf"]
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    "count": stats["count"],
+                    "avg_ms": stats["total_ms"] / stats["count"],
+                    "max_ms": stats["max_ms"],
+                    "histogram": dict(zip(labels, stats["histogram"])),
+                    "bytes_sent": stats["bytes_sent"],
+                    "bytes_received": stats["bytes_received"],
+                    "status_codes": dict(stats["status_codes"]),
+                }
+                for endpoint, stats in self._endpoints.items()
+            }
+            return {
+                "endpoints": endpoints,
+                "status_codes": dict(self.status_codes),
+                "bytes_sent": sum(e["bytes_sent"] for e in endpoints.values()),
+                "bytes_received": sum(e["bytes_received"] for e in endpoints.values()),
+            }
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._endpoints.clear()
+            self.status_codes.clear()
+
 
 class RESTClient:
     """Client for making authenticated REST API requests with advanced features."""
@@ -33,7 +159,13 @@ class RESTClient:
         token: Optional[str] = None,
         timeout: int = 30,
         max_retries: int = 3,
-        cache_ttl: int = 300
+        cache_ttl: int = 300,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        retry_strategy: Optional[Retry] = None,
+        log_sample_rate: float = 1.0,
+        log_body_limit: int = 4096,
+        pool_block: bool = False
     ):
         """Initialize the REST client.
 
@@ -47,6 +179,12 @@ class RESTClient:
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
             cache_ttl: Cache time-to-live in seconds
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept open per host
+            retry_strategy: Transport-level retry strategy
+            log_sample_rate: Fraction of requests whose bodies are logged at DEBUG
+            log_body_limit: Maximum number of body bytes included in a log line
+            pool_block: Whether to block instead of opening extra connections
         """
         self.base_url = base_url.rstrip('/')
         self.auth_type = auth_type
@@ -58,9 +196,27 @@ class RESTClient:
         self.max_retries = max_retries
         self.cache_ttl = cache_ttl
         self.session = requests.Session()
+        self.adapter = mount_pooled_adapter(
+            self.session,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            retry_strategy=retry_strategy,
+            pool_block=pool_block
+        )
         self.cache = {}
+        self.log_sample_rate = log_sample_rate
+        self.log_body_limit = log_body_limit
+        self.metrics = RequestMetrics()
         self._setup_auth()
 
+    def connection_stats(self) -> Dict[str, Any]:
+        """Get connection reuse counters.
+
+        Returns:
+            Dict[str, Any]: Snapshot of the adapter's connection stats
+        """
+        return self.adapter.stats.snapshot()
+
     def _setup_auth(self) -> None:
         """Set up authentication based on auth_type."""
         if self.auth_type == "basic" and self.username and self.password:
@@ -105,26 +261,102 @@ class RESTClient:
         """
         self.cache[key] = (data, time.time())
 
-    def _log_request(self, method: str, url: str, **kwargs) -> None:
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get request metrics.
+
+        Returns:
+            Dict[str, Any]: Snapshot of latency, byte and status code metrics
+        """
+        return self.metrics.snapshot()
+
+    @staticmethod
+    def _endpoint_key(method: str, endpoint: str) -> str:
+        """Build a low-cardinality metrics key for an endpoint.
+
+        Numeric path segments are collapsed so "users/42" and "users/7"
+        share the key "GET users/:id".
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+
+        Returns:
+            str: Metrics key
+        """
+        path = re.sub(r"(?<=/)\d+(?=/|$)", ":id", "/" + endpoint.strip("/"))
+        return f"{method} {path.lstrip('/')}"
+
+    def _should_log_body(self) -> bool:
+        """Check whether bodies of the current request should be logged.
+
+        Returns:
+            bool: True if DEBUG logging is on and the request is sampled
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return False
+        return self.log_sample_rate >= 1 or random.random() < self.log_sample_rate
+
+    def _log_request(self, method: str, url: str, log_body: bool = True, **kwargs) -> None:
         """Log request details.
 
         Args:
             method: HTTP method
             url: Request URL
+            log_body: Whether the request was sampled for body logging
             **kwargs: Additional request parameters
         """
-        logger.info(f"Making {method} request to {url}")
-        if 'json' in kwargs:
-            logger.debug(f"Request body: {json.dumps(kwargs['json'])}")
+        logger.info("Making %s request to %s", method, url)
+        if log_body and 'json' in kwargs and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request body: %.*s", self.log_body_limit, _LazyJSON(kwargs['json']))
 
-    def _log_response(self, response: requests.Response) -> None:
+    def _log_response(self, response: requests.Response, log_body: bool = True) -> None:
         """Log response details.
 
         Args:
             response: Response object
+            log_body: Whether the request was sampled for body logging
+        """
+        logger.info("Response status: %s", response.status_code)
+        if log_body and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response body: %s", _LazyBody(response, self.log_body_limit))
+
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Send a request with logging, metrics and rate limit handling.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            **kwargs: Additional arguments for requests.Session.request
+
+        Returns:
+            requests.Response: Response object
         """
-        logger.info(f"Response status: {response.status_code}")
-        logger.debug(f"Response body: {response.text}")
+        url = self._build_url(endpoint)
+        log_body = self._should_log_body()
+        self._log_request(method, url, log_body=log_body, **kwargs)
+
+        endpoint_key = self._endpoint_key(method, endpoint)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        except RequestException as e:
+            self.metrics.record(endpoint_key, type(e).__name__, time.perf_counter() - start, 0, 0)
+            raise
+        elapsed = time.perf_counter() - start
+
+        body = response.request.body
+        # Content-Length avoids reading the body of a streamed response
+        content_length = response.headers.get("Content-Length", "")
+        self.metrics.record(
+            endpoint_key,
+            response.status_code,
+            elapsed,
+            bytes_sent=len(body) if body else 0,
+            bytes_received=int(content_length) if content_length.isdigit() else len(response.content or b"")
+        )
+        self._log_response(response, log_body=log_body)
+        self._handle_rate_limit(response)
+        return response
 
     def _handle_rate_limit(self, response: requests.Response) -> None:
         """Handle rate limiting headers.
@@ -184,10 +416,7 @@ class RESTClient:
                 logger.info("Using cached response")
                 return cached_response
 
-        self._log_request("GET", url, params=params)
-        response = self.session.get(url, params=params, timeout=self.timeout)
-        self._log_response(response)
-        self._handle_rate_limit(response)
+        response = self._send("GET", endpoint, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -209,11 +438,7 @@ class RESTClient:
         Raises:
             RequestException: If the request fails
         """
-        url = self._build_url(endpoint)
-        self._log_request("POST", url, json=data)
-        response = self.session.post(url, json=data, timeout=self.timeout)
-        self._log_response(response)
-        self._handle_rate_limit(response)
+        response = self._send("POST", endpoint, json=data)
         response.raise_for_status()
         return response.json()
 
@@ -231,11 +456,7 @@ class RESTClient:
         Raises:
             RequestException: If the request fails
         """
-        url = self._build_url(endpoint)
-        self._log_request("PUT", url, json=data)
-        response = self.session.put(url, json=data, timeout=self.timeout)
-        self._log_response(response)
-        self._handle_rate_limit(response)
+        response = self._send("PUT", endpoint, json=data)
         response.raise_for_status()
         return response.json()
 
@@ -252,11 +473,7 @@ class RESTClient:
         Raises:
             RequestException: If the request fails
         """
-        url = self._build_url(endpoint)
-        self._log_request("DELETE", url)
-        response = self.session.delete(url, timeout=self.timeout)
-        self._log_response(response)
-        self._handle_rate_limit(response)
+        response = self._send("DELETE", endpoint)
         response.raise_for_status()
         return response.json()
 
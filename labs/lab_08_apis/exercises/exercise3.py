@@ -1,10 +1,17 @@
 """GraphQL API operations module."""
 
+import copy
+import hashlib
 import json
 import logging
-from typing import Any, Dict, Optional, Union
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
 import requests
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 from graphql import (
     parse,
     validate,
@@ -15,9 +22,24 @@ from graphql import (
     GraphQLString,
     GraphQLInt,
     GraphQLList,
-    GraphQLNonNull
+    GraphQLNonNull,
+    DocumentNode,
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    InlineFragmentNode,
+    NameNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+    print_ast,
+    is_abstract_type,
+    print_schema,
+    value_from_ast_untyped
 )
 
+from exercises.exercise1 import mount_pooled_adapter
+
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +48,532 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+
+@lru_cache(maxsize=256)
+def query_hash(query: str) -> str:
+    """Compute the automatic persisted query hash of a query.
+
+    Args:
+        query: GraphQL query string
+
+    Returns:
+        str: Hex-encoded SHA-256 of the query text
+    """
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+class DocumentCache:
+    """Thread-safe LRU cache of parsed and validated GraphQL documents."""
+
+    def __init__(self, maxsize: int = 128):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of documents to keep
+        """
+        self.maxsize = maxsize
+        self._documents: "OrderedDict[Tuple[str, str], DocumentNode]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query: str, schema_version: str) -> Tuple[str, str]:
+        """Build a cache key from the query text and schema version.
+
+        Args:
+            query: GraphQL query string
+            schema_version: Version identifier of the schema
+
+        Returns:
+            Tuple[str, str]: Cache key
+        """
+        return query_hash(query), schema_version
+
+    def get(self, key: Tuple[str, str]) -> Optional[DocumentNode]:
+        """Get a cached document and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[DocumentNode]: Cached document if present
+        """
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def put(self, key: Tuple[str, str], document: DocumentNode) -> None:
+        """Store a validated document, evicting the least recently used.
+
+        Args:
+            key: Cache key
+            document: Parsed and validated document
+        """
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached documents."""
+        with self._lock:
+            self._documents.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, evictions, size and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._documents),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _add_typename(selection_set: Optional[SelectionSetNode]) -> None:
+    """Add __typename to a selection set and all nested object selections.
+
+    Args:
+        selection_set: Selection set to update in place
+    """
+    if selection_set is None:
+        return
+    names = set()
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            names.add(selection.name.value)
+            _add_typename(selection.selection_set)
+        elif isinstance(selection, InlineFragmentNode):
+            for nested in selection.selection_set.selections:
+                if isinstance(nested, FieldNode):
+                    _add_typename(nested.selection_set)
+    if "__typename" not in names:
+        selection_set.selections = (
+            *selection_set.selections,
+            FieldNode(name=NameNode(value="__typename"), arguments=(), directives=())
+        )
+
+
+@lru_cache(maxsize=256)
+def cacheable_document(query: str) -> Tuple[DocumentNode, str]:
+    """Parse a query and add __typename to every object selection.
+
+    The normalized cache needs __typename on each object to build entity
+    keys. The returned document must not be modified.
+
+    Args:
+        query: GraphQL query string
+
+    Returns:
+        Tuple[DocumentNode, str]: Rewritten document and its query text
+    """
+    document = parse(query)
+    for definition in document.definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            for selection in definition.selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    _add_typename(selection.selection_set)
+        elif isinstance(definition, FragmentDefinitionNode):
+            _add_typename(definition.selection_set)
+    return document, print_ast(document)
+
+
+class _CacheMiss(Exception):
+    """Raised internally when a query cannot be answered from the cache."""
+
+
+class NormalizedCache:
+    """Bounded cache of GraphQL objects normalized by __typename and id.
+
+    Objects with both __typename and id are stored once under
+    "Typename:id" and referenced from the fields that returned them, so
+    overlapping queries and mutation results update the same entity.
+
+    Entities and root query fields both count toward maxsize and are
+    evicted least recently used first. Evicting a root field also drops the
+    entities that nothing else still references.
+    """
+
+    ROOT_QUERY = "ROOT_QUERY"
+
+    def __init__(self, maxsize: int = 1000, schema: Optional[GraphQLSchema] = None):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entities and root fields to keep
+            schema: Schema used to match fragments on abstract types
+        """
+        self.maxsize = maxsize
+        self.schema = schema
+        self._entities: Dict[str, Dict[str, Any]] = {}
+        # Recency of entity keys and of (ROOT_QUERY, field) pairs
+        self._lru: "OrderedDict[Union[str, Tuple[str, str]], None]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def identify(value: Dict[str, Any]) -> Optional[str]:
+        """Build the entity key of an object.
+
+        Args:
+            value: Object from a response
+
+        Returns:
+            Optional[str]: "Typename:id", or None if either is missing
+        """
+        typename = value.get("__typename")
+        entity_id = value.get("id")
+        if typename is None or entity_id is None:
+            return None
+        return f"{typename}:{entity_id}"
+
+    def read(
+        self,
+        document: DocumentNode,
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Answer a query from the cache.
+
+        Args:
+            document: Query document (with __typename selections)
+            variables: Query variables
+            operation_name: Name of the operation to read
+
+        Returns:
+            Optional[Dict[str, Any]]: Query data, or None if any requested
+                field is missing
+        """
+        operation, fragments = self._operation(document, operation_name)
+        if operation.operation != OperationType.QUERY:
+            return None
+        with self._lock:
+            try:
+                root = self._entities.get(self.ROOT_QUERY, {})
+                data = self._read_selection(
+                    operation.selection_set, root, "Query", variables or {}, fragments
+                )
+            except _CacheMiss:
+                self.misses += 1
+                return None
+            for field in self._fields(operation.selection_set, variables or {}, fragments, "Query", True):
+                storage_key = self._storage_key(field, variables or {})
+                if storage_key in root:
+                    self._touch((self.ROOT_QUERY, storage_key))
+            self.hits += 1
+            return data
+
+    def write(
+        self,
+        document: DocumentNode,
+        data: Dict[str, Any],
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None
+    ) -> None:
+        """Store the result of an operation.
+
+        Query results are also stored as root fields so the same query can
+        be answered later; mutation results only update entities.
+
+        Args:
+            document: Operation document (with __typename selections)
+            data: Operation result data
+            variables: Operation variables
+            operation_name: Name of the operation that was executed
+        """
+        operation, fragments = self._operation(document, operation_name)
+        with self._lock:
+            fields = self._write_selection(
+                operation.selection_set, data, variables or {}, fragments
+            )
+            if operation.operation == OperationType.QUERY:
+                self._entities.setdefault(self.ROOT_QUERY, {}).update(fields)
+                for storage_key in fields:
+                    self._touch((self.ROOT_QUERY, storage_key))
+                # Root fields go first, so their entities are not evicted
+                # while still referenced
+                for key in self._refs(fields):
+                    self._touch(key)
+            self._evict()
+
+    def evict(self, key: str) -> None:
+        """Remove an entity, e.g. after it was deleted on the server.
+
+        Args:
+            key: Entity key, "Typename:id"
+        """
+        with self._lock:
+            self._entities.pop(key, None)
+            self._lru.pop(key, None)
+
+    def get_entity(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of the stored fields of an entity.
+
+        Args:
+            key: Entity key, "Typename:id"
+
+        Returns:
+            Optional[Dict[str, Any]]: Stored fields keyed by storage key
+        """
+        with self._lock:
+            entity = self._entities.get(key)
+            return copy.deepcopy(entity) if entity is not None else None
+
+    def clear(self) -> None:
+        """Remove all entities."""
+        with self._lock:
+            self._entities.clear()
+            self._lru.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, evictions and number of entities
+                and root fields
+        """
+        with self._lock:
+            reads = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entities": len(self._entities) - (self.ROOT_QUERY in self._entities),
+                "root_fields": len(self._entities.get(self.ROOT_QUERY, {})),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / reads if reads else 0.0,
+            }
+
+    @staticmethod
+    def _operation(
+        document: DocumentNode,
+        operation_name: Optional[str]
+    ) -> Tuple[OperationDefinitionNode, Dict[str, FragmentDefinitionNode]]:
+        """Find the operation to process and the document's fragments."""
+        operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+        fragments = {
+            d.name.value: d for d in document.definitions
+            if isinstance(d, FragmentDefinitionNode)
+        }
+        for operation in operations:
+            if operation_name is None or (operation.name and operation.name.value == operation_name):
+                return operation, fragments
+        raise ValueError(f"Operation not found: {operation_name}")
+
+    @staticmethod
+    def _storage_key(field: FieldNode, variables: Dict[str, Any]) -> str:
+        """Build the key a field is stored under, including its arguments."""
+        if not field.arguments:
+            return field.name.value
+        args = {
+            arg.name.value: value_from_ast_untyped(arg.value, variables)
+            for arg in field.arguments
+        }
+        return f"{field.name.value}({json.dumps(args, sort_keys=True)})"
+
+    @staticmethod
+    def _included(node: Any, variables: Dict[str, Any]) -> bool:
+        """Evaluate @skip and @include directives on a selection."""
+        for directive in node.directives or ():
+            if directive.name.value not in ("skip", "include"):
+                continue
+            condition = value_from_ast_untyped(directive.arguments[0].value, variables)
+            if bool(condition) == (directive.name.value == "skip"):
+                return False
+        return True
+
+    def _type_matches(self, type_condition: Optional[str], typename: Optional[str]) -> bool:
+        """Check whether a fragment applies to an object of the given type.
+
+        Raises:
+            _CacheMiss: If this cannot be decided without a schema
+        """
+        if type_condition is None or type_condition == typename:
+            return True
+        if self.schema is None or typename is None:
+            raise _CacheMiss()
+        abstract_type = self.schema.get_type(type_condition)
+        object_type = self.schema.get_type(typename)
+        if abstract_type is None or object_type is None:
+            raise _CacheMiss()
+        if is_abstract_type(abstract_type):
+            return self.schema.is_sub_type(abstract_type, object_type)
+        return False
+
+    def _fields(
+        self,
+        selection_set: SelectionSetNode,
+        variables: Dict[str, Any],
+        fragments: Dict[str, FragmentDefinitionNode],
+        typename: Optional[str] = None,
+        match_types: bool = False
+    ) -> List[FieldNode]:
+        """Flatten a selection set into its fields, expanding fragments."""
+        fields = []
+        for selection in selection_set.selections:
+            if not self._included(selection, variables):
+                continue
+            if isinstance(selection, FieldNode):
+                fields.append(selection)
+                continue
+            if isinstance(selection, FragmentSpreadNode):
+                fragment = fragments[selection.name.value]
+            else:
+                fragment = selection
+            condition = fragment.type_condition.name.value if fragment.type_condition else None
+            if match_types and not self._type_matches(condition, typename):
+                continue
+            fields.extend(self._fields(
+                fragment.selection_set, variables, fragments, typename, match_types
+            ))
+        return fields
+
+    def _write_selection(
+        self,
+        selection_set: SelectionSetNode,
+        data: Dict[str, Any],
+        variables: Dict[str, Any],
+        fragments: Dict[str, FragmentDefinitionNode]
+    ) -> Dict[str, Any]:
+        """Convert response data into stored fields, normalizing objects."""
+        fields = {}
+        for field in self._fields(selection_set, variables, fragments):
+            response_key = field.alias.value if field.alias else field.name.value
+            if response_key in data:
+                fields[self._storage_key(field, variables)] = self._write_value(
+                    field, data[response_key], variables, fragments
+                )
+        return fields
+
+    def _write_value(
+        self,
+        field: FieldNode,
+        value: Any,
+        variables: Dict[str, Any],
+        fragments: Dict[str, FragmentDefinitionNode]
+    ) -> Any:
+        """Store a field value, replacing identifiable objects by references."""
+        if value is None or field.selection_set is None:
+            return copy.deepcopy(value)
+        if isinstance(value, list):
+            return [self._write_value(field, item, variables, fragments) for item in value]
+        fields = self._write_selection(field.selection_set, value, variables, fragments)
+        key = self.identify(value)
+        if key is None:
+            return fields
+        self._merge(key, fields)
+        return {"__ref": key}
+
+    def _merge(self, key: str, fields: Dict[str, Any]) -> None:
+        """Merge fields into an entity and mark it as recently used."""
+        entity = self._entities.setdefault(key, {})
+        entity.update(fields)
+        self._touch(key)
+
+    def _touch(self, key: Union[str, Tuple[str, str]]) -> None:
+        """Mark an entity or root field as recently used."""
+        self._lru[key] = None
+        self._lru.move_to_end(key)
+
+    def _refs(self, value: Any, seen: Optional[Set[str]] = None) -> Set[str]:
+        """Collect the entity keys a stored value references, transitively."""
+        seen = seen if seen is not None else set()
+        if isinstance(value, list):
+            for item in value:
+                self._refs(item, seen)
+        elif isinstance(value, dict):
+            key = value.get("__ref")
+            if key is None:
+                for item in value.values():
+                    self._refs(item, seen)
+            elif key not in seen:
+                seen.add(key)
+                self._refs(self._entities.get(key), seen)
+        return seen
+
+    def _evict(self) -> None:
+        """Drop least recently used entities and root fields beyond maxsize."""
+        while len(self._lru) > self.maxsize:
+            key, _ = self._lru.popitem(last=False)
+            self.evictions += 1
+            if isinstance(key, str):
+                self._entities.pop(key, None)
+                continue
+            root = self._entities.get(self.ROOT_QUERY, {})
+            orphans = self._refs(root.pop(key[1], None)) - self._refs(root)
+            for orphan in orphans:
+                if self._entities.pop(orphan, None) is not None:
+                    self._lru.pop(orphan, None)
+                    self.evictions += 1
+
+    def _read_selection(
+        self,
+        selection_set: SelectionSetNode,
+        fields: Dict[str, Any],
+        typename: Optional[str],
+        variables: Dict[str, Any],
+        fragments: Dict[str, FragmentDefinitionNode]
+    ) -> Dict[str, Any]:
+        """Build response data for a selection set from stored fields."""
+        result = {}
+        for field in self._fields(selection_set, variables, fragments, typename, match_types=True):
+            response_key = field.alias.value if field.alias else field.name.value
+            if field.name.value == "__typename" and "__typename" not in fields:
+                if typename is None:
+                    raise _CacheMiss()
+                result[response_key] = typename
+                continue
+            storage_key = self._storage_key(field, variables)
+            if storage_key not in fields:
+                raise _CacheMiss()
+            result[response_key] = self._read_value(
+                field, fields[storage_key], variables, fragments
+            )
+        return result
+
+    def _read_value(
+        self,
+        field: FieldNode,
+        value: Any,
+        variables: Dict[str, Any],
+        fragments: Dict[str, FragmentDefinitionNode]
+    ) -> Any:
+        """Resolve a stored field value, following entity references."""
+        if value is None or field.selection_set is None:
+            return copy.deepcopy(value)
+        if isinstance(value, list):
+            return [self._read_value(field, item, variables, fragments) for item in value]
+        if "__ref" in value:
+            entity = self._entities.get(value["__ref"])
+            if entity is None:
+                raise _CacheMiss()
+            self._touch(value["__ref"])
+            value = entity
+        return self._read_selection(
+            field.selection_set, value, value.get("__typename"), variables, fragments
+        )
+
 
 class GraphQLClient:
     """Client for making GraphQL API requests."""
@@ -34,7 +582,15 @@ class GraphQLClient:
         self,
         endpoint: str,
         headers: Optional[Dict[str, str]] = None,
-        timeout: int = 30
+        timeout: int = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        retry_strategy: Optional[Retry] = None,
+        document_cache: Optional[DocumentCache] = None,
+        persisted_queries: bool = False,
+        use_get_for_persisted: bool = False,
+        normalized_cache: Optional[NormalizedCache] = None,
+        pool_block: bool = False
     ):
         """Initialize the GraphQL client.
 
@@ -42,12 +598,46 @@ class GraphQLClient:
             endpoint: GraphQL API endpoint
             headers: Additional headers for requests
             timeout: Request timeout in seconds
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum connections kept open per host
+            retry_strategy: Transport-level retry strategy
+            document_cache: Cache for validated documents, may be shared
+                between clients; pass a cache with maxsize 0 to disable
+            persisted_queries: Send only the query hash (automatic persisted
+                queries) and fall back to the full text when the server
+                does not know it
+            use_get_for_persisted: Send hashed queries (not mutations) as GET
+                requests so HTTP caches can serve them
+            normalized_cache: Cache answering queries locally when every
+                requested field is already known
+            pool_block: Whether to block instead of opening extra connections
         """
         self.endpoint = endpoint
         self.headers = headers or {}
         self.timeout = timeout
         self.session = requests.Session()
+        self.adapter = mount_pooled_adapter(
+            self.session,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            retry_strategy=retry_strategy,
+            pool_block=pool_block
+        )
         self.schema = None
+        self.schema_version = ""
+        self.document_cache = document_cache if document_cache is not None else DocumentCache()
+        self.persisted_queries = persisted_queries
+        self.use_get_for_persisted = use_get_for_persisted
+        self.persisted_query_stats = {"hashed": 0, "not_found": 0}
+        self.normalized_cache = normalized_cache
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Get connection reuse counters.
+
+        Returns:
+            Dict[str, Any]: Snapshot of the adapter's connection stats
+        """
+        return self.adapter.stats.snapshot()
 
     def _log_request(self, query: str, variables: Optional[Dict[str, Any]] = None) -> None:
         """Log request details.
@@ -70,17 +660,28 @@ class GraphQLClient:
         logger.info(f"Response status: {response.status_code}")
         logger.debug(f"Response body: {response.text}")
 
-    def _validate_query(self, query: str) -> None:
+    def _validate_query(self, query: str) -> Optional[DocumentNode]:
         """Validate GraphQL query against schema.
 
+        Validated documents are cached by query hash and schema version, so
+        repeated operations are only parsed and validated once.
+
         Args:
             query: GraphQL query to validate
 
+        Returns:
+            Optional[DocumentNode]: Parsed document, or None without a schema
+
         Raises:
             ValueError: If query is invalid
         """
         if not self.schema:
-            return
+            return None
+
+        key = self.document_cache.make_key(query, self.schema_version)
+        ast = self.document_cache.get(key)
+        if ast is not None:
+            return ast
 
         try:
             ast = parse(query)
@@ -90,11 +691,15 @@ class GraphQLClient:
         except Exception as e:
             raise ValueError(f"Query validation failed: {e}")
 
+        self.document_cache.put(key, ast)
+        return ast
+
     def query(
         self,
         query: str,
         variables: Optional[Dict[str, Any]] = None,
-        operation_name: Optional[str] = None
+        operation_name: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """Execute a GraphQL query.
 
@@ -102,6 +707,7 @@ class GraphQLClient:
             query: GraphQL query string
             variables: Query variables
             operation_name: Name of the operation to execute
+            use_cache: Whether to answer from the normalized cache if possible
 
         Returns:
             Dict[str, Any]: Query result
@@ -110,7 +716,46 @@ class GraphQLClient:
             RequestException: If the request fails
             ValueError: If the query is invalid
         """
+        return self._execute(query, variables, operation_name, allow_get=True, use_cache=use_cache)
+
+    def _execute(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]],
+        operation_name: Optional[str],
+        allow_get: bool,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Validate, send and unwrap a GraphQL operation.
+
+        Args:
+            query: GraphQL query or mutation string
+            variables: Operation variables
+            operation_name: Name of the operation to execute
+            allow_get: Whether the operation may be sent as a GET request
+            use_cache: Whether a query may be answered from the normalized cache
+
+        Returns:
+            Dict[str, Any]: Operation result
+
+        Raises:
+            RequestException: If the request fails
+            ValueError: If the operation is invalid
+        """
         self._validate_query(query)
+
+        document = None
+        if self.normalized_cache is not None:
+            try:
+                document, query = cacheable_document(query)
+            except Exception as e:
+                raise ValueError(f"Query parsing failed: {e}")
+            if use_cache:
+                cached = self.normalized_cache.read(document, variables, operation_name)
+                if cached is not None:
+                    logger.info("Using cached GraphQL response")
+                    return cached
+
         self._log_request(query, variables)
 
         payload = {
@@ -121,23 +766,113 @@ class GraphQLClient:
             payload["operationName"] = operation_name
 
         try:
-            response = self.session.post(
-                self.endpoint,
-                json=payload,
-                headers=self.headers,
-                timeout=self.timeout
-            )
-            self._log_response(response)
+            if self.persisted_queries:
+                response = self._send_persisted(payload, allow_get)
+            else:
+                response = self._send(payload)
             response.raise_for_status()
             result = response.json()
 
             if "errors" in result:
                 raise ValueError(f"GraphQL errors: {json.dumps(result['errors'])}")
 
-            return result.get("data", {})
+            data = result.get("data", {})
+            if document is not None and data:
+                self.normalized_cache.write(document, data, variables, operation_name)
+            return data
         except RequestException as e:
             raise RequestException(f"GraphQL query failed: {e}")
 
+    def _send(self, payload: Dict[str, Any], method: str = "POST") -> requests.Response:
+        """Send a GraphQL payload.
+
+        Args:
+            payload: Request payload
+            method: "POST" for a JSON body, "GET" for query parameters
+
+        Returns:
+            requests.Response: Response object
+        """
+        if method == "GET":
+            params = {
+                key: value if isinstance(value, str) else json.dumps(value, separators=(",", ":"))
+                for key, value in payload.items()
+            }
+            response = self.session.get(
+                self.endpoint,
+                params=params,
+                headers=self.headers,
+                timeout=self.timeout
+            )
+        else:
+            response = self.session.post(
+                self.endpoint,
+                json=payload,
+                headers=self.headers,
+                timeout=self.timeout
+            )
+        self._log_response(response)
+        return response
+
+    def _send_persisted(self, payload: Dict[str, Any], allow_get: bool) -> requests.Response:
+        """Send a payload using the automatic persisted queries protocol.
+
+        The hash is sent first; if the server replies PersistedQueryNotFound
+        the full query is sent along with the hash so the server stores it.
+
+        Args:
+            payload: Request payload including the full query
+            allow_get: Whether the hashed request may be sent as GET
+
+        Returns:
+            requests.Response: Response object
+        """
+        extensions = {
+            "persistedQuery": {"version": 1, "sha256Hash": query_hash(payload["query"])}
+        }
+        hashed = {key: value for key, value in payload.items() if key != "query"}
+        hashed["extensions"] = extensions
+
+        method = "GET" if allow_get and self.use_get_for_persisted else "POST"
+        self.persisted_query_stats["hashed"] += 1
+        response = self._send(hashed, method)
+
+        error = self._persisted_query_error(response)
+        if error is None:
+            return response
+        if error == PERSISTED_QUERY_NOT_SUPPORTED:
+            logger.warning("Server does not support persisted queries, disabling them")
+            self.persisted_queries = False
+            return self._send(payload)
+
+        self.persisted_query_stats["not_found"] += 1
+        return self._send(dict(payload, extensions=extensions))
+
+    @staticmethod
+    def _persisted_query_error(response: requests.Response) -> Optional[str]:
+        """Extract a persisted query protocol error from a response.
+
+        Args:
+            response: Response object
+
+        Returns:
+            Optional[str]: PersistedQueryNotFound/NotSupported, or None
+        """
+        try:
+            body = response.json()
+        except ValueError:
+            return None
+        if not isinstance(body, dict):
+            return None
+        for error in body.get("errors") or []:
+            message = error.get("message")
+            code = (error.get("extensions") or {}).get("code")
+            if message == PERSISTED_QUERY_NOT_FOUND or code == "PERSISTED_QUERY_NOT_FOUND":
+                return PERSISTED_QUERY_NOT_FOUND
+            if message == PERSISTED_QUERY_NOT_SUPPORTED or code == "PERSISTED_QUERY_NOT_SUPPORTED":
+                return PERSISTED_QUERY_NOT_SUPPORTED
+        return None
+
     def mutation(
         self,
         mutation: str,
@@ -158,7 +893,104 @@ class GraphQLClient:
             RequestException: If the request fails
             ValueError: If the mutation is invalid
         """
-        return self.query(mutation, variables, operation_name)
+        return self._execute(mutation, variables, operation_name, allow_get=False)
+
+    def batch(self, operations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several operations in one HTTP request.
+
+        The operations are posted as a JSON array and the server answers
+        with an array of results in the same order. Operations that fail
+        schema validation are not sent; their result carries the
+        validation error instead, so one bad query does not fail the rest.
+
+        Args:
+            operations: Operations with "query" and optional "variables"
+                and "operationName" keys
+
+        Returns:
+            List[Dict[str, Any]]: One result per operation, each with
+                "data" and, if the operation failed, "errors"
+
+        Raises:
+            RequestException: If the request fails
+            ValueError: If the response does not match the request
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        payloads = []
+        for operation in operations:
+            try:
+                self._validate_query(operation["query"])
+            except ValueError as e:
+                results.append({"data": None, "errors": [{"message": str(e)}]})
+                continue
+            payload = {
+                "query": operation["query"],
+                "variables": operation.get("variables") or {},
+            }
+            if operation.get("operationName"):
+                payload["operationName"] = operation["operationName"]
+            payloads.append(payload)
+            # Filled in from the response below
+            results.append(None)
+
+        if not payloads:
+            return results
+
+        logger.info(f"Making batched GraphQL request with {len(payloads)} operations")
+        try:
+            response = self.session.post(
+                self.endpoint,
+                json=payloads,
+                headers=self.headers,
+                timeout=self.timeout
+            )
+            self._log_response(response)
+            response.raise_for_status()
+        except RequestException as e:
+            raise RequestException(f"GraphQL batch failed: {e}")
+
+        sent_results = response.json()
+        if not isinstance(sent_results, list) or len(sent_results) != len(payloads):
+            raise ValueError("GraphQL batch response does not match the request")
+        sent = iter(sent_results)
+        return [result if result is not None else next(sent) for result in results]
+
+    def create_loader(
+        self,
+        query: str,
+        key_variable: str = "id",
+        result_field: Optional[str] = None,
+        max_batch_size: int = 50,
+        batch_window: float = 0.005
+    ) -> "DataLoader":
+        """Create a DataLoader that fetches entities with one query per key.
+
+        All keys collected in a batch window are sent as one batched request.
+
+        Args:
+            query: Query taking the key as a variable
+            key_variable: Name of the variable holding the key
+            result_field: Field of the result data to return, e.g. "user"
+            max_batch_size: Maximum number of keys per request
+            batch_window: Seconds to wait for more keys before sending
+
+        Returns:
+            DataLoader: Loader for the entity
+        """
+        def batch_load(keys: List[Hashable]) -> List[Any]:
+            results = self.batch([
+                {"query": query, "variables": {key_variable: key}} for key in keys
+            ])
+            values = []
+            for result in results:
+                if result.get("errors"):
+                    values.append(ValueError(f"GraphQL errors: {json.dumps(result['errors'])}"))
+                else:
+                    data = result.get("data") or {}
+                    values.append(data.get(result_field) if result_field else data)
+            return values
+
+        return DataLoader(batch_load, max_batch_size=max_batch_size, batch_window=batch_window)
 
     def set_schema(self, schema: GraphQLSchema) -> None:
         """Set the GraphQL schema for validation.
@@ -167,6 +999,264 @@ class GraphQLClient:
             schema: GraphQL schema object
         """
         self.schema = schema
+        self.schema_version = hashlib.sha256(print_schema(schema).encode()).hexdigest()
+
+    def document_cache_stats(self) -> Dict[str, Any]:
+        """Get document cache metrics.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, evictions, size and hit rate
+        """
+        return self.document_cache.stats()
+
+
+class _BatchWindow:
+    """Collect submitted items for a short window and dispatch them together."""
+
+    def __init__(
+        self,
+        dispatch: Callable[[List[Tuple[Any, Future]]], None],
+        max_batch_size: int,
+        batch_window: float
+    ):
+        """Initialize the window.
+
+        Args:
+            dispatch: Callable resolving the futures of a batch
+            max_batch_size: Dispatch as soon as this many items are pending
+            batch_window: Seconds to wait after the first item of a batch
+        """
+        self._dispatch = dispatch
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._pending: List[Tuple[Any, Future]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, item: Any) -> Future:
+        """Add an item to the current batch.
+
+        Args:
+            item: Item to dispatch
+
+        Returns:
+            Future: Resolved when the batch has been dispatched
+        """
+        future, batch = self.add(item)
+        if batch:
+            self.run(batch)
+        return future
+
+    def add(self, item: Any) -> Tuple[Future, Optional[List[Tuple[Any, Future]]]]:
+        """Add an item without dispatching a full batch.
+
+        Callers that hold their own locks use this and call run() on the
+        returned batch once those locks are released.
+
+        Args:
+            item: Item to dispatch
+
+        Returns:
+            Tuple: The item's future and a full batch to run, if any
+        """
+        future = Future()
+        with self._lock:
+            self._pending.append((item, future))
+            if len(self._pending) >= self.max_batch_size:
+                return future, self._take()
+            if self._timer is None:
+                self._timer = threading.Timer(self.batch_window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future, None
+
+    def flush(self) -> None:
+        """Dispatch pending items immediately."""
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self.run(batch)
+
+    def _take(self) -> List[Tuple[Any, Future]]:
+        """Remove and return the pending batch. Caller holds the lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        return batch
+
+    def run(self, batch: List[Tuple[Any, Future]]) -> None:
+        """Dispatch a batch, failing all its futures if dispatch raises."""
+        try:
+            self._dispatch(batch)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+class QueryBatcher:
+    """Coalesce GraphQL operations issued close together into one request."""
+
+    def __init__(
+        self,
+        client: GraphQLClient,
+        max_batch_size: int = 20,
+        batch_window: float = 0.005
+    ):
+        """Initialize the batcher.
+
+        Args:
+            client: Client used to send batches
+            max_batch_size: Maximum number of operations per request
+            batch_window: Seconds to wait for more operations before sending
+        """
+        self.client = client
+        self._window = _BatchWindow(self._dispatch, max_batch_size, batch_window)
+
+    def submit(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None
+    ) -> Future:
+        """Queue an operation for the next batch.
+
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+            operation_name: Name of the operation to execute
+
+        Returns:
+            Future: Resolves to the operation's data or raises ValueError
+        """
+        return self._window.submit({
+            "query": query,
+            "variables": variables,
+            "operationName": operation_name,
+        })
+
+    def query(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Execute an operation as part of a batch and wait for its result.
+
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+            operation_name: Name of the operation to execute
+
+        Returns:
+            Dict[str, Any]: Query result
+        """
+        return self.submit(query, variables, operation_name).result()
+
+    def flush(self) -> None:
+        """Send queued operations without waiting for the window to close."""
+        self._window.flush()
+
+    def _dispatch(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        """Send a batch and hand each result back to its caller."""
+        results = self.client.batch([operation for operation, _ in batch])
+        for (_, future), result in zip(batch, results):
+            if result.get("errors"):
+                future.set_exception(
+                    ValueError(f"GraphQL errors: {json.dumps(result['errors'])}")
+                )
+            else:
+                future.set_result(result.get("data", {}))
+
+
+class DataLoader:
+    """Batch and deduplicate entity fetches by key.
+
+    Keys requested within one batch window are passed together to
+    batch_load_fn, and each key is fetched at most once while cached.
+    """
+
+    def __init__(
+        self,
+        batch_load_fn: Callable[[List[Hashable]], List[Any]],
+        max_batch_size: int = 50,
+        batch_window: float = 0.005,
+        cache: bool = True
+    ):
+        """Initialize the loader.
+
+        Args:
+            batch_load_fn: Called with unique keys, returns one value (or
+                exception instance) per key in the same order
+            max_batch_size: Maximum number of keys per call
+            batch_window: Seconds to wait for more keys before calling
+            cache: Whether to remember loaded values
+        """
+        self.batch_load_fn = batch_load_fn
+        self.cache = cache
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._window = _BatchWindow(self._dispatch, max_batch_size, batch_window)
+
+    def load(self, key: Hashable) -> Future:
+        """Request the value for a key.
+
+        Args:
+            key: Entity key
+
+        Returns:
+            Future: Resolves to the value for the key
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+            future, batch = self._window.add(key)
+            self._futures[key] = future
+        if batch:
+            self._window.run(batch)
+        if not self.cache:
+            future.add_done_callback(lambda _: self.clear(key))
+        return future
+
+    def load_many(self, keys: List[Hashable]) -> List[Any]:
+        """Load several keys and wait for all of them.
+
+        Args:
+            keys: Entity keys
+
+        Returns:
+            List[Any]: Values in the order of keys
+        """
+        futures = [self.load(key) for key in keys]
+        self._window.flush()
+        return [future.result() for future in futures]
+
+    def clear(self, key: Hashable) -> None:
+        """Forget the cached value for a key.
+
+        Args:
+            key: Entity key
+        """
+        with self._lock:
+            self._futures.pop(key, None)
+
+    def clear_all(self) -> None:
+        """Forget all cached values."""
+        with self._lock:
+            self._futures.clear()
+
+    def _dispatch(self, batch: List[Tuple[Hashable, Future]]) -> None:
+        """Load a batch of keys and resolve their futures."""
+        values = self.batch_load_fn([key for key, _ in batch])
+        if len(values) != len(batch):
+            raise ValueError("batch_load_fn must return one value per key")
+        for (_, future), value in zip(batch, values):
+            if isinstance(value, Exception):
+                future.set_exception(value)
+            else:
+                future.set_result(value)
 
 
 # Example schema definition
@@ -194,7 +1284,7 @@ def create_example_schema() -> GraphQLSchema:
             'user': GraphQLField(
                 UserType,
                 args={'id': GraphQLNonNull(GraphQLString)},
-                resolver=lambda root, info, id: {
+                resolve=lambda root, info, id: {
                     'id': id,
                     'name': 'John Doe',
                     'email': 'john@example.com',
@@ -203,7 +1293,7 @@ def create_example_schema() -> GraphQLSchema:
             ),
             'users': GraphQLField(
                 GraphQLList(UserType),
-                resolver=lambda root, info: [
+                resolve=lambda root, info: [
                     {
                         'id': '1',
                         'name': 'John Doe',
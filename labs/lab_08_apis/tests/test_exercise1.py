@@ -0,0 +1,95 @@
+"""Tests for Exercise 1: HTTP requests and connection pooling."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from urllib3.util.retry import Retry
+
+from exercises.exercise1 import HTTPClient, PooledHTTPAdapter
+from exercises.exercise2 import RESTClient
+from exercises.exercise3 import GraphQLClient
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that echoes the request path as JSON."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Run a local HTTP server for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_sequential_requests_reuse_connection(server_url):
+    """Test that keep-alive reuses a single connection."""
+    client = HTTPClient(server_url)
+    for i in range(5):
+        assert client.get(f"items/{i}") == {"path": f"/items/{i}"}
+
+    stats = client.connection_stats()
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 4
+    assert stats["tls_handshakes"] == 0
+    assert stats["reuse_ratio"] == pytest.approx(0.8)
+
+
+def test_small_pool_discards_connections(server_url):
+    """Test that a pool smaller than the thread count discards connections."""
+    client = HTTPClient(server_url, pool_maxsize=1)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda i: client.get(f"items/{i}"), range(40)))
+
+    stats = client.connection_stats()
+    assert stats["requests"] == 40
+    assert stats["new_connections"] >= 1
+    assert stats["discarded_connections"] == stats["new_connections"] - 1
+
+
+def test_pool_configuration():
+    """Test that pool sizes and retries reach the adapter."""
+    retry = Retry(total=2, backoff_factor=0.1)
+    client = HTTPClient(pool_connections=4, pool_maxsize=32, retry_strategy=retry)
+
+    adapter = client.session.get_adapter("https://example.com")
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter is client.session.get_adapter("http://example.com")
+    assert adapter.max_retries is retry
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+
+
+@pytest.mark.parametrize("make_client", [
+    lambda **pool: HTTPClient(**pool),
+    lambda **pool: RESTClient("https://example.com", **pool),
+    lambda **pool: GraphQLClient("https://example.com/graphql", **pool),
+])
+def test_clients_pass_pool_options_to_adapter(make_client):
+    """Test that every client threads its pool options to the adapter."""
+    client = make_client(pool_connections=4, pool_maxsize=8, pool_block=True)
+
+    adapter = client.session.get_adapter("https://example.com")
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 8
+    assert adapter.poolmanager.connection_pool_kw["block"] is True
+    assert adapter._pool_connections == 4
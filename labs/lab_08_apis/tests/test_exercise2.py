@@ -0,0 +1,115 @@
+"""Tests for Exercise 2: REST client instrumentation."""
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from exercises import exercise2
+from exercises.exercise2 import RESTClient, RequestMetrics
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler that echoes request bodies back as JSON."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(200, {"path": self.path})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._reply(201, json.loads(self.rfile.read(length) or b"{}"))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Run a local HTTP server for the duration of a test."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_metrics_snapshot(server_url):
+    """Test per-endpoint latency, byte and status code metrics."""
+    client = RESTClient(server_url)
+    client.get("users/1", use_cache=False)
+    client.get("users/2", use_cache=False)
+    client.post("users", {"name": "Jane"})
+
+    metrics = client.get_metrics()
+    users = metrics["endpoints"]["GET users/:id"]
+    assert users["count"] == 2
+    assert sum(users["histogram"].values()) == 2
+    assert users["status_codes"] == {200: 2}
+    assert metrics["endpoints"]["POST users"]["bytes_sent"] == len(b'{"name": "Jane"}')
+    assert metrics["status_codes"] == {200: 2, 201: 1}
+    assert metrics["bytes_received"] > 0
+
+
+def test_bodies_not_serialized_without_debug(server_url, monkeypatch):
+    """Test that request bodies are not dumped when DEBUG is off."""
+    calls = []
+    monkeypatch.setattr(exercise2._LazyJSON, "__str__", lambda self: calls.append(self) or "")
+    monkeypatch.setattr(exercise2._LazyBody, "__str__", lambda self: calls.append(self) or "")
+    monkeypatch.setattr(exercise2.logger, "level", logging.INFO)
+
+    RESTClient(server_url).post("users", {"name": "Jane"})
+    assert calls == []
+
+
+def test_sampled_body_logging(server_url, caplog):
+    """Test that a zero sample rate suppresses body logging."""
+    caplog.set_level(logging.DEBUG, logger=exercise2.logger.name)
+    RESTClient(server_url, log_sample_rate=0.0).post("users", {"name": "Jane"})
+    assert not any("body" in record.getMessage() for record in caplog.records)
+
+    caplog.clear()
+    RESTClient(server_url, log_body_limit=5).post("users", {"name": "Jane"})
+    bodies = [r.getMessage() for r in caplog.records if "body" in r.getMessage()]
+    assert "Request body: {\"nam" in bodies
+
+
+def test_failed_requests_are_recorded(monkeypatch):
+    """Test that requests without a response are counted by exception type."""
+    client = RESTClient("http://127.0.0.1:9")
+
+    def refuse(*args, **kwargs):
+        raise requests.ConnectionError("refused")
+
+    monkeypatch.setattr(client.session, "request", refuse)
+    with pytest.raises(requests.ConnectionError):
+        client._send("GET", "users/1")
+
+    users = client.get_metrics()["endpoints"]["GET users/:id"]
+    assert users["count"] == 1
+    assert users["status_codes"] == {"ConnectionError": 1}
+
+
+def test_histogram_buckets():
+    """Test that latencies land in the right histogram bucket."""
+    metrics = RequestMetrics(buckets=(10, 100))
+    metrics.record("GET x", 200, 0.005, 0, 0)
+    metrics.record("GET x", 200, 0.050, 0, 0)
+    metrics.record("GET x", 500, 0.500, 0, 0)
+
+    snapshot = metrics.snapshot()["endpoints"]["GET x"]
+    assert snapshot["histogram"] == {"le_10ms": 1, "le_100ms": 1, "le_inf": 1}
+    assert snapshot["max_ms"] == pytest.approx(500)
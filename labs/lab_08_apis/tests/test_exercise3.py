@@ -0,0 +1,369 @@
+"""Tests for Exercise 3: GraphQL client."""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from graphql import (
+    GraphQLField,
+    GraphQLList,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLString,
+    graphql_sync
+)
+
+from exercises.exercise3 import (
+    DataLoader,
+    DocumentCache,
+    GraphQLClient,
+    NormalizedCache,
+    QueryBatcher,
+    cacheable_document,
+    create_example_schema
+)
+
+USERS_QUERY = "{ users { id name } }"
+
+
+@pytest.fixture
+def client():
+    """GraphQL client with the example schema."""
+    client = GraphQLClient("http://localhost/graphql")
+    client.set_schema(create_example_schema())
+    return client
+
+
+def test_validated_documents_are_cached(client):
+    """Test that repeated queries are parsed and validated once."""
+    first = client._validate_query(USERS_QUERY)
+    second = client._validate_query(USERS_QUERY)
+
+    assert first is second
+    stats = client.document_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_invalid_queries_are_not_cached(client):
+    """Test that validation errors are raised every time."""
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            client._validate_query("{ unknownField }")
+    assert client.document_cache_stats()["size"] == 0
+
+
+def test_schema_change_invalidates_documents(client):
+    """Test that documents are keyed by schema version."""
+    client._validate_query(USERS_QUERY)
+    client.set_schema(GraphQLSchema(query=GraphQLObjectType(
+        name="Query",
+        fields={"version": GraphQLField(GraphQLString)}
+    )))
+
+    with pytest.raises(ValueError):
+        client._validate_query(USERS_QUERY)
+
+
+def test_lru_eviction():
+    """Test that the least recently used document is evicted."""
+    cache = DocumentCache(maxsize=2)
+    keys = [cache.make_key(f"{{ q{i} }}", "v1") for i in range(3)]
+    cache.put(keys[0], "doc0")
+    cache.put(keys[1], "doc1")
+    assert cache.get(keys[0]) == "doc0"
+    cache.put(keys[2], "doc2")
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "doc0"
+    assert cache.stats()["evictions"] == 1
+
+
+class StubGraphQLHandler(BaseHTTPRequestHandler):
+    """Stub GraphQL server with batching and automatic persisted queries."""
+
+    protocol_version = "HTTP/1.1"
+    schema = create_example_schema()
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _execute(self, payload):
+        query = payload.get("query")
+        persisted = (payload.get("extensions") or {}).get("persistedQuery")
+        if persisted:
+            digest = persisted["sha256Hash"]
+            if query is None:
+                query = self.server.store.get(digest)
+                if query is None:
+                    return {"errors": [{
+                        "message": "PersistedQueryNotFound",
+                        "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}
+                    }]}
+            elif hashlib.sha256(query.encode()).hexdigest() == digest:
+                self.server.store[digest] = query
+        result = graphql_sync(self.schema, query, variable_values=payload.get("variables"))
+        if result.errors:
+            return {"data": result.data, "errors": [{"message": e.message} for e in result.errors]}
+        return {"data": result.data}
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        for key in ("variables", "extensions"):
+            if key in params:
+                params[key] = json.loads(params[key])
+        self.server.requests.append(("GET", params))
+        self._reply(self._execute(params))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.requests.append(("POST", payload))
+        if isinstance(payload, list):
+            self._reply([self._execute(operation) for operation in payload])
+        else:
+            self._reply(self._execute(payload))
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Run the stub GraphQL server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphQLHandler)
+    server.store = {}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _endpoint(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/graphql"
+
+
+def test_persisted_query_registration_and_hit(stub_server):
+    """Test the hash-only request, full-text fallback and later hits."""
+    client = GraphQLClient(_endpoint(stub_server), persisted_queries=True)
+    query = 'query GetUser($id: String!) { user(id: $id) { id name } }'
+
+    for _ in range(2):
+        assert client.query(query, {"id": "7"}) == {"user": {"id": "7", "name": "John Doe"}}
+
+    sent = [("query" in payload, "extensions" in payload) for _, payload in stub_server.requests]
+    assert sent == [(False, True), (True, True), (False, True)]
+    assert client.persisted_query_stats == {"hashed": 2, "not_found": 1}
+
+
+def test_persisted_queries_use_get(stub_server):
+    """Test that hashed queries use GET but mutations stay on POST."""
+    client = GraphQLClient(
+        _endpoint(stub_server), persisted_queries=True, use_get_for_persisted=True
+    )
+    client.query(USERS_QUERY)
+    client.query(USERS_QUERY)
+    client.mutation(USERS_QUERY)
+
+    methods = [method for method, _ in stub_server.requests]
+    assert methods == ["GET", "POST", "GET", "POST"]
+
+
+USER_QUERY = "query GetUser($id: String!) { user(id: $id) { id } }"
+
+
+def test_batch_sends_one_request(stub_server):
+    """Test that explicit batches are demultiplexed in order."""
+    client = GraphQLClient(_endpoint(stub_server))
+    results = client.batch([
+        {"query": USER_QUERY, "variables": {"id": "1"}},
+        {"query": USER_QUERY, "variables": {"id": "2"}},
+        {"query": "{ users { id } }"},
+    ])
+
+    assert len(stub_server.requests) == 1
+    assert [r["data"] for r in results[:2]] == [{"user": {"id": "1"}}, {"user": {"id": "2"}}]
+    assert len(results[2]["data"]["users"]) == 2
+
+
+def test_query_batcher_coalesces_window(stub_server):
+    """Test that operations submitted within a window share a request."""
+    batcher = QueryBatcher(GraphQLClient(_endpoint(stub_server)), batch_window=0.05)
+    futures = [batcher.submit(USER_QUERY, {"id": str(i)}) for i in range(5)]
+    failing = batcher.submit("{ unknownField }")
+
+    assert [f.result(timeout=5)["user"]["id"] for f in futures] == ["0", "1", "2", "3", "4"]
+    with pytest.raises(ValueError):
+        failing.result(timeout=5)
+    assert len(stub_server.requests) == 1
+
+
+def test_invalid_operation_fails_alone(stub_server):
+    """Test that a query failing validation does not fail its batch."""
+    client = GraphQLClient(_endpoint(stub_server))
+    client.set_schema(create_example_schema())
+    batcher = QueryBatcher(client, batch_window=0.05)
+    good = [batcher.submit(USER_QUERY, {"id": str(i)}) for i in range(2)]
+    bad = batcher.submit("{ unknownField }")
+
+    assert [f.result(timeout=5)["user"]["id"] for f in good] == ["0", "1"]
+    with pytest.raises(ValueError, match="unknownField"):
+        bad.result(timeout=5)
+    assert len(stub_server.requests) == 1
+    assert len(stub_server.requests[0][1]) == 2
+
+
+def test_query_batcher_max_batch_size(stub_server):
+    """Test that full batches are sent without waiting for the window."""
+    batcher = QueryBatcher(GraphQLClient(_endpoint(stub_server)), max_batch_size=2, batch_window=10)
+    futures = [batcher.submit(USER_QUERY, {"id": str(i)}) for i in range(4)]
+
+    assert all(f.done() for f in futures)
+    assert len(stub_server.requests) == 2
+
+
+def test_data_loader_dedupes_and_batches(stub_server):
+    """Test that repeated keys are fetched once in a single request."""
+    client = GraphQLClient(_endpoint(stub_server))
+    loader = client.create_loader(USER_QUERY, result_field="user")
+
+    users = loader.load_many(["1", "2", "1", "3", "2"])
+    assert [user["id"] for user in users] == ["1", "2", "1", "3", "2"]
+    assert len(stub_server.requests) == 1
+    assert len(stub_server.requests[0][1]) == 3
+
+    assert loader.load("1").result(timeout=5) == {"id": "1"}
+    assert len(stub_server.requests) == 1
+
+
+def test_data_loader_propagates_errors():
+    """Test that exception values fail only their own key."""
+    loader = DataLoader(lambda keys: [KeyError(k) if k < 0 else k * 2 for k in keys])
+    good, bad = loader.load(2), loader.load(-1)
+    assert good.result(timeout=5) == 4
+    with pytest.raises(KeyError):
+        bad.result(timeout=5)
+
+
+def _user_schema():
+    """Schema with a mutable user store for normalized cache tests."""
+    users = {"1": {"id": "1", "name": "John Doe", "email": "john@example.com"}}
+    user_type = GraphQLObjectType("User", {
+        "id": GraphQLField(GraphQLString),
+        "name": GraphQLField(GraphQLString),
+        "email": GraphQLField(GraphQLString),
+    })
+    query_type = GraphQLObjectType("Query", {
+        "user": GraphQLField(
+            user_type,
+            args={"id": GraphQLString},
+            resolve=lambda root, info, id: users.get(id)
+        ),
+        "users": GraphQLField(GraphQLList(user_type), resolve=lambda root, info: list(users.values())),
+    })
+    mutation_type = GraphQLObjectType("Mutation", {
+        "renameUser": GraphQLField(
+            user_type,
+            args={"id": GraphQLString, "name": GraphQLString},
+            resolve=lambda root, info, id, name: users[id].update(name=name) or users[id]
+        ),
+    })
+    return GraphQLSchema(query=query_type, mutation=mutation_type)
+
+
+@pytest.fixture
+def user_server():
+    """Run the stub GraphQL server with the mutable user schema."""
+    handler = type("UserHandler", (StubGraphQLHandler,), {"schema": _user_schema()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.store = {}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_normalized_cache_answers_overlapping_queries(user_server):
+    """Test that a query for already known fields skips the network."""
+    client = GraphQLClient(_endpoint(user_server), normalized_cache=NormalizedCache())
+    client.query("{ users { id name email } }")
+    assert len(user_server.requests) == 1
+
+    data = client.query('query { user(id: "1") { id name } }')
+    assert len(user_server.requests) == 2
+    assert data["user"]["name"] == "John Doe"
+
+    data = client.query('query { person: user(id: "1") { name ... on User { email } } }')
+    assert len(user_server.requests) == 2
+    assert data == {"person": {"name": "John Doe", "email": "john@example.com", "__typename": "User"}}
+    assert client.normalized_cache.stats()["hits"] == 1
+
+
+def test_normalized_cache_updates_from_mutations(user_server):
+    """Test that mutation results update cached entities."""
+    client = GraphQLClient(_endpoint(user_server), normalized_cache=NormalizedCache())
+    client.query('{ user(id: "1") { id name } }')
+    client.mutation('mutation { renameUser(id: "1", name: "Jane") { id name } }')
+
+    assert client.query('{ user(id: "1") { id name } }')["user"]["name"] == "Jane"
+    assert len(user_server.requests) == 2
+
+    client.query('{ user(id: "1") { id name } }', use_cache=False)
+    assert len(user_server.requests) == 3
+
+
+def test_normalized_cache_eviction():
+    """Test that least recently used root fields are evicted with their entities."""
+    document, _ = cacheable_document("query Q($id: String) { user(id: $id) { id name } }")
+    cache = NormalizedCache(maxsize=3)
+    for i in range(3):
+        cache.write(document, {"user": {"id": str(i), "name": f"u{i}", "__typename": "User"}}, {"id": str(i)})
+
+    # Each query stores one root field and one entity
+    assert cache.stats()["evictions"] == 4
+    assert (cache.stats()["entities"], cache.stats()["root_fields"]) == (1, 1)
+    assert cache.get_entity("User:0") is None
+    assert cache.read(document, {"id": "0"}) is None
+    assert cache.read(document, {"id": "2"}) == {"user": {"id": "2", "name": "u2", "__typename": "User"}}
+
+
+def test_normalized_cache_bounds_root_fields():
+    """Test that root fields without entities count toward maxsize."""
+    document, _ = cacheable_document("query Q($id: String) { user(id: $id) { name } }")
+    cache = NormalizedCache(maxsize=3)
+    for i in range(10):
+        cache.write(document, {"user": {"name": f"u{i}", "__typename": "User"}}, {"id": str(i)})
+    assert cache.read(document, {"id": "8"}) is not None
+
+    cache.write(document, {"user": {"name": "u10", "__typename": "User"}}, {"id": "10"})
+    stats = cache.stats()
+    assert stats["root_fields"] == 3 and stats["evictions"] == 8
+    assert cache.read(document, {"id": "8"}) is not None
+    assert cache.read(document, {"id": "7"}) is None
+
+
+def test_normalized_cache_keeps_shared_entities():
+    """Test that evicting a root field keeps entities other fields reference."""
+    user = {"id": "1", "name": "u1", "__typename": "User"}
+    by_id, _ = cacheable_document("query Q($id: String) { user(id: $id) { id name } }")
+    everyone, _ = cacheable_document("{ users { id name } }")
+    cache = NormalizedCache(maxsize=4)
+    cache.write(by_id, {"user": user}, {"id": "1"})
+    cache.write(everyone, {"users": [user]})
+    cache.write(by_id, {"user": {"id": "2", "name": "u2", "__typename": "User"}}, {"id": "2"})
+
+    assert cache.read(by_id, {"id": "1"}) is None
+    assert cache.read(everyone) == {"users": [user]}
@@ -0,0 +1,66 @@
+"""Tests for the stub server and load generator benchmarks."""
+
+import requests
+
+from benchmarks.load_generator import LoadGenerator, LoadReport, make_target
+from benchmarks.stub_server import StubConfig, StubServer, _RateLimiter
+
+
+def test_pagination_and_etag():
+    """Test Link headers and conditional GETs."""
+    with StubServer(StubConfig(total_items=25, page_size=10)) as server:
+        response = requests.get(f"{server.url}/items?page=2")
+        assert [item["id"] for item in response.json()] == list(range(11, 21))
+        assert response.links["next"]["url"].endswith("page=3&per_page=10")
+        assert response.links["last"]["url"].endswith("page=3&per_page=10")
+
+        etag = response.headers["ETag"]
+        cached = requests.get(f"{server.url}/items?page=2", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert server.stats()["not_modified"] == 1
+
+
+def test_rate_limit_and_errors():
+    """Test injected 429 and 500 responses."""
+    with StubServer(StubConfig(rate_limit=2, retry_after=3)) as server:
+        statuses = [requests.get(f"{server.url}/items/1").status_code for _ in range(4)]
+        assert statuses[:2] == [200, 200]
+        assert 429 in statuses[2:]
+
+    with StubServer(StubConfig(error_rate=1.0)) as server:
+        assert requests.get(f"{server.url}/items/1").status_code == 500
+
+
+def test_load_generator_drives_clients():
+    """Test that each client completes a short run without errors."""
+    with StubServer() as server:
+        for name in ("http", "rest", "graphql"):
+            client, target = make_target(name, server.url, pool_maxsize=4)
+            report = LoadGenerator(target, rps=50, duration=0.2, workers=4).run()
+            assert report.requests == 10
+            assert report.errors == 0
+            assert client.connection_stats()["requests"] == 10
+
+
+def test_report_percentiles():
+    """Test nearest-rank percentiles."""
+    report = LoadReport(requests=4, errors=0, duration=2.0, target_rps=2,
+                        latencies=[0.4, 0.1, 0.3, 0.2])
+    assert report.throughput == 2.0
+    assert report.percentile(50) == 0.2
+    assert report.percentile(99) == 0.4
+    assert report.summary()["p90_ms"] == 400.0
+
+    report = LoadReport(requests=10, errors=0, duration=1.0, target_rps=10,
+                        latencies=[i / 10 for i in range(1, 11)])
+    assert report.percentile(94) == 1.0
+    assert report.percentile(10) == 0.1
+
+
+def test_rate_limiter_below_one_per_second():
+    """Test that fractional rates admit a request and then refill slowly."""
+    limiter = _RateLimiter(0.5)
+    assert limiter.allow()
+    assert not limiter.allow()
+    limiter.updated -= 2
+    assert limiter.allow()
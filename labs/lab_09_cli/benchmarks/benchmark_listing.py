@@ -0,0 +1,70 @@
+"""Benchmark listing a large directory.
+
+Compares the old approach (os.listdir, then os.stat and os.path.isdir per
+name, all rows built before printing) with iter_entries, sequentially and
+recursively with a thread pool.
+
+Run from the lab directory:
+
+    python -m benchmarks.benchmark_listing --files 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+
+from exercises.exercise2 import iter_entries
+
+
+def create_tree(root: str, files: int, per_dir: int) -> None:
+    """Create `files` empty files spread over directories of `per_dir` files."""
+    for index in range(files):
+        directory = os.path.join(root, f"d{index // per_dir:05d}")
+        if index % per_dir == 0:
+            os.mkdir(directory)
+        open(os.path.join(directory, f"f{index:08d}.txt"), "w").close()
+
+
+def listdir_stat(root: str) -> int:
+    rows = []
+    for directory in os.listdir(root):
+        path = os.path.join(root, directory)
+        for name in os.listdir(path):
+            file_path = os.path.join(path, name)
+            stat = os.stat(file_path)
+            rows.append((name, os.path.isdir(file_path), stat.st_size, stat.st_mtime))
+    return len(rows)
+
+
+def scandir_sequential(root: str) -> int:
+    return sum(1 for _ in iter_entries(root, recursive=True, include_dirs=False))
+
+
+def scandir_parallel(root: str) -> int:
+    return sum(1 for _ in iter_entries(root, recursive=True, include_dirs=False, max_workers=8))
+
+
+def measure(name: str, runner: Callable[[str], int], root: str) -> None:
+    start = time.perf_counter()
+    count = runner(root)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>18}: {count} entries in {elapsed:.2f}s ({count / elapsed:,.0f}/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark directory listing")
+    parser.add_argument("--files", type=int, default=100000, help="Files to create")
+    parser.add_argument("--per-dir", type=int, default=10000, help="Files per directory")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        create_tree(root, args.files, args.per_dir)
+        measure("listdir + stat", listdir_stat, root)
+        measure("scandir", scandir_sequential, root)
+        measure("scandir, 8 threads", scandir_parallel, root)
+
+
+if __name__ == "__main__":
+    main()
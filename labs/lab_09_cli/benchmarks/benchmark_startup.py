@@ -0,0 +1,83 @@
+"""Benchmark the startup cost of the Exercise 2 CLI.
+
+Parses `python -X importtime` output for `import exercises.exercise2` and
+lists the slowest imports, then times complete `--help` runs, which is
+what a shell loop calling the CLI pays on every iteration.
+
+Run from the lab directory:
+
+    python -m benchmarks.benchmark_startup --runs 20
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+MODULE = "exercises.exercise2"
+SCRIPT = "exercises/exercise2.py"
+HEAVY_MODULES = ("click", "rich", "prompt_toolkit")
+
+
+def import_times(module: str = MODULE) -> Dict[str, Tuple[int, int]]:
+    """Import a module in a fresh interpreter and collect -X importtime output.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        Dict[str, Tuple[int, int]]: Module name to (self, cumulative)
+            import time in microseconds
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def help_times(runs: int) -> List[float]:
+    """Time complete `exercise2.py --help` runs in seconds."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, SCRIPT, "--help"], capture_output=True, check=True)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure CLI startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Number of --help runs")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    times = import_times()
+    print(f"import {MODULE}: {times[MODULE][1] / 1000:.1f} ms cumulative")
+    loaded = [name for name in HEAVY_MODULES if name in times]
+    print(f"Heavy modules loaded at import: {', '.join(loaded) or 'none'}")
+    print(f"\n{'Module':<40} {'Cumulative':>11}")
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (_, cumulative) in slowest[:args.top]:
+        print(f"{name[:40]:<40} {cumulative / 1000:9.1f}ms")
+
+    durations = help_times(args.runs)
+    interpreter = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interpreter.append(time.perf_counter() - start)
+    print(f"\n--help: median {statistics.median(durations) * 1000:.0f} ms over {args.runs} runs "
+          f"(bare interpreter {statistics.median(interpreter) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
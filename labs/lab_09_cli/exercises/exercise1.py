@@ -1,9 +1,18 @@
 """Subprocess management module for running shell commands."""
 
+import codecs
+import hashlib
+import json
+import locale
 import os
+import selectors
+import signal
 import subprocess
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, Union
 from pathlib import Path
 
 
@@ -14,6 +23,182 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_TAIL_SIZE = 1024 * 1024
+MAX_LINE_LENGTH = 1024 * 1024
+
+OutputCallback = Callable[[Union[str, bytes]], None]
+
+
+class ResultCache:
+    """On-disk cache of command results, keyed by everything that can change them.
+
+    The key covers the command, the shell flag, the working directory, the
+    input text, selected environment variables and the declared input
+    files (by mtime and size, or by content hash). Entries are JSON files; the
+    least recently used ones are deleted once the total passes max_bytes.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 100 * 1024 * 1024,
+        env_vars: Tuple[str, ...] = ("PATH",),
+        hash_inputs: bool = False,
+        cache_failures: bool = False
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory for cache entries
+            max_bytes: Total size of entries to keep
+            env_vars: Environment variables included in every key
+            hash_inputs: Hash input file contents instead of using mtime and size
+            cache_failures: Also cache results with a non-zero return code
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.env_vars = tuple(env_vars)
+        self.hash_inputs = hash_inputs
+        self.cache_failures = cache_failures
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.directory.glob("*.json"))
+
+    def _fingerprint(self, path: Union[str, Path], cwd: Optional[str]) -> Any:
+        full_path = Path(cwd or ".") / path
+        try:
+            if self.hash_inputs:
+                digest = hashlib.sha256()
+                with open(full_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                return digest.hexdigest()
+            stat = full_path.stat()
+            return [stat.st_mtime_ns, stat.st_size]
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    def make_key(
+        self,
+        command: Union[str, List[str]],
+        shell: bool,
+        cwd: Optional[str],
+        env: Dict[str, str],
+        input_text: Optional[str] = None,
+        inputs: Optional[List[Union[str, Path]]] = None,
+        env_vars: Optional[List[str]] = None
+    ) -> str:
+        """Build the cache key for a command.
+
+        Args:
+            command: Command to run
+            shell: Whether it runs through the shell
+            cwd: Working directory
+            env: Environment it runs with
+            input_text: Input sent to the command
+            inputs: Files the command reads
+            env_vars: Environment variables to include besides the cache's own
+
+        Returns:
+            str: Hex SHA-256 key
+        """
+        names = sorted(set(self.env_vars) | set(env_vars or ()))
+        material = {
+            "command": command,
+            "shell": shell,
+            "cwd": os.path.abspath(cwd or "."),
+            "env": {name: env.get(name) for name in names},
+            "input": hashlib.sha256(input_text.encode()).hexdigest() if input_text is not None else None,
+            "inputs": {str(path): self._fingerprint(path, cwd) for path in inputs or ()},
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[subprocess.CompletedProcess]:
+        """Get a cached result, or None on a miss."""
+        path = self.directory / f"{key}.json"
+        try:
+            data = json.loads(path.read_text())
+            # The mtime tracks recency for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return subprocess.CompletedProcess(data["args"], data["returncode"], data["stdout"], data["stderr"])
+
+    def put(self, key: str, result: subprocess.CompletedProcess) -> bool:
+        """Store a result; failures are skipped unless cache_failures is set."""
+        if result.returncode != 0 and not self.cache_failures:
+            return False
+        data = json.dumps({
+            "args": result.args,
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+        }).encode()
+        if len(data) > self.max_bytes:
+            return False
+        path = self.directory / f"{key}.json"
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(temp_path, path)
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+        return True
+
+    def _evict(self) -> None:
+        # Caller holds the lock; delete least recently used entries
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hits, misses, hit rate, evictions and size in bytes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": self._size,
+            }
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    """Kill a command started in its own session, with its children.
+
+    Args:
+        process: Process to kill
+    """
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
 
 class CommandRunner:
     """Class for running and managing shell commands."""
@@ -23,7 +208,8 @@ class CommandRunner:
         shell: bool = False,
         timeout: Optional[int] = None,
         env: Optional[Dict[str, str]] = None,
-        cwd: Optional[Union[str, Path]] = None
+        cwd: Optional[Union[str, Path]] = None,
+        result_cache: Optional[ResultCache] = None
     ):
         """Initialize the command runner.
 
@@ -32,24 +218,46 @@ class CommandRunner:
             timeout: Command timeout in seconds
             env: Environment variables to use
             cwd: Working directory for commands
+            result_cache: Cache used by run(..., cache=True)
         """
         self.shell = shell
         self.timeout = timeout
         self.env = env or os.environ.copy()
         self.cwd = str(cwd) if cwd else None
+        self.result_cache = result_cache
 
     def run(
         self,
         command: Union[str, List[str]],
         input_text: Optional[str] = None,
-        capture_output: bool = True
+        capture_output: bool = True,
+        on_stdout: Optional[OutputCallback] = None,
+        on_stderr: Optional[OutputCallback] = None,
+        tail_size: Optional[int] = None,
+        cache: bool = False,
+        inputs: Optional[List[Union[str, Path]]] = None,
+        env_vars: Optional[List[str]] = None
     ) -> subprocess.CompletedProcess:
         """Run a command and return the result.
 
+        Passing a callback or tail_size streams the output instead of
+        buffering it: callbacks get each line as it arrives and the result
+        only keeps the last tail_size characters of each stream.
+
+        With cache=True and a result_cache, an identical earlier run is
+        returned without running the command again. Streamed runs can use
+        cached results but are not stored, since their output is truncated.
+
         Args:
             command: Command to run (string or list of arguments)
             input_text: Input to send to the command
             capture_output: Whether to capture stdout and stderr
+            on_stdout: Called with each stdout line
+            on_stderr: Called with each stderr line
+            tail_size: Characters of output kept per stream when streaming
+            cache: Whether to use the result cache for this command
+            inputs: Files the command reads, part of the cache key
+            env_vars: Environment variables that affect the command, part of the cache key
 
         Returns:
             subprocess.CompletedProcess: Command result
@@ -58,6 +266,34 @@ class CommandRunner:
             subprocess.SubprocessError: If command execution fails
             subprocess.TimeoutExpired: If command times out
         """
+        if cache and self.result_cache is not None and capture_output:
+            key = self.result_cache.make_key(
+                command, self.shell, self.cwd, self.env, input_text, inputs, env_vars
+            )
+            result = self.result_cache.get(key)
+            if result is None:
+                result = self.run(command, input_text, capture_output, on_stdout, on_stderr, tail_size)
+                # Streamed results only keep the tail of the output
+                if not (on_stdout or on_stderr or tail_size is not None):
+                    self.result_cache.put(key, result)
+            else:
+                logger.info(f"Using cached result for: {command}")
+            return result
+
+        if capture_output and (on_stdout or on_stderr or tail_size is not None):
+            output = self.stream(
+                command,
+                input_text=input_text,
+                tail_size=tail_size if tail_size is not None else DEFAULT_TAIL_SIZE,
+                on_stdout=on_stdout,
+                on_stderr=on_stderr
+            )
+            while True:
+                try:
+                    next(output)
+                except StopIteration as done:
+                    return done.value
+
         try:
             logger.info(f"Running command: {command}")
             result = subprocess.run(
@@ -66,7 +302,7 @@ class CommandRunner:
                 timeout=self.timeout,
                 env=self.env,
                 cwd=self.cwd,
-                input=input_text.encode() if input_text else None,
+                input=input_text,
                 capture_output=capture_output,
                 text=True
             )
@@ -76,6 +312,154 @@ class CommandRunner:
             logger.error(f"Command failed: {e}")
             raise
 
+    def stream(
+        self,
+        command: Union[str, List[str]],
+        input_text: Optional[Union[str, bytes]] = None,
+        binary: bool = False,
+        tail_size: int = DEFAULT_TAIL_SIZE,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        on_stdout: Optional[OutputCallback] = None,
+        on_stderr: Optional[OutputCallback] = None
+    ) -> Generator[Tuple[str, Union[str, bytes]], None, subprocess.CompletedProcess]:
+        """Run a command, yielding its output as it arrives.
+
+        Yields ("stdout" | "stderr", data) pairs, where data is a line in
+        text mode or a chunk of bytes in binary mode. Only the last
+        tail_size characters of each stream are kept, so memory stays
+        bounded however much the command prints. Closing the generator
+        early kills the command.
+
+        Args:
+            command: Command to run (string or list of arguments)
+            input_text: Input to send to the command
+            binary: Yield raw byte chunks instead of decoded lines
+            tail_size: Output kept per stream for the final result
+            chunk_size: Maximum bytes read at a time
+            on_stdout: Called with each stdout line or chunk
+            on_stderr: Called with each stderr line or chunk
+
+        Returns:
+            subprocess.CompletedProcess: Result with the retained output,
+                as the generator's return value
+
+        Raises:
+            subprocess.TimeoutExpired: If command times out
+        """
+        logger.info(f"Streaming command: {command}")
+        process = subprocess.Popen(
+            command,
+            shell=self.shell,
+            env=self.env,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE if input_text is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=os.name == "posix"
+        )
+        encoding = locale.getpreferredencoding(False)
+        if isinstance(input_text, str):
+            input_text = input_text.encode(encoding)
+        pending_input = memoryview(input_text) if input_text else None
+
+        callbacks = {"stdout": on_stdout, "stderr": on_stderr}
+        tails: Dict[str, deque] = {"stdout": deque(), "stderr": deque()}
+        tail_sizes = {"stdout": 0, "stderr": 0}
+        partial = {"stdout": "", "stderr": ""}
+        decoders = {name: codecs.getincrementaldecoder(encoding)(errors="replace") for name in tails}
+
+        def emit(name: str, data: Union[str, bytes]) -> Tuple[str, Union[str, bytes]]:
+            tail = tails[name]
+            tail.append(data)
+            tail_sizes[name] += len(data)
+            while tail_sizes[name] > tail_size:
+                excess = tail_sizes[name] - tail_size
+                if len(tail[0]) <= excess:
+                    tail_sizes[name] -= len(tail.popleft())
+                else:
+                    tail[0] = tail[0][excess:]
+                    tail_sizes[name] -= excess
+            if callbacks[name]:
+                callbacks[name](data)
+            return name, data
+
+        def lines(name: str, text: str, final: bool = False):
+            # Hold back a trailing partial line until the rest arrives,
+            # unless it is too long to keep buffering
+            text_lines = (partial[name] + text).splitlines(keepends=True)
+            partial[name] = ""
+            if (text_lines and not final and not text_lines[-1].endswith(("\n", "\r"))
+                    and len(text_lines[-1]) < MAX_LINE_LENGTH):
+                partial[name] = text_lines.pop()
+            return [emit(name, line) for line in text_lines]
+
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, "stdout")
+        selector.register(process.stderr, selectors.EVENT_READ, "stderr")
+        if pending_input:
+            os.set_blocking(process.stdin.fileno(), False)
+            selector.register(process.stdin, selectors.EVENT_WRITE, "stdin")
+        elif process.stdin:
+            process.stdin.close()
+
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        finished = False
+        try:
+            while selector.get_map():
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise subprocess.TimeoutExpired(command, self.timeout)
+                for key, _ in selector.select(remaining):
+                    name = key.data
+                    if name == "stdin":
+                        try:
+                            written = os.write(key.fd, pending_input[:chunk_size])
+                            pending_input = pending_input[written:]
+                        except BrokenPipeError:
+                            pending_input = None
+                        if not pending_input:
+                            selector.unregister(key.fileobj)
+                            key.fileobj.close()
+                        continue
+                    data = os.read(key.fd, chunk_size)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        if not binary:
+                            yield from lines(name, decoders[name].decode(b"", final=True), final=True)
+                    elif binary:
+                        yield emit(name, data)
+                    else:
+                        yield from lines(name, decoders[name].decode(data))
+            finished = True
+        finally:
+            selector.close()
+            if not finished and process.poll() is None:
+                # Timed out or abandoned: kill the command and its children
+                _kill_group(process)
+            for pipe in (process.stdin, process.stdout, process.stderr):
+                if pipe is not None:
+                    pipe.close()
+            if not finished:
+                process.wait()
+
+        # Both pipes are closed, but the command may still be running
+        remaining = max(deadline - time.monotonic(), 0) if deadline is not None else None
+        try:
+            process.wait(timeout=remaining)
+        except subprocess.TimeoutExpired:
+            _kill_group(process)
+            process.wait()
+            raise subprocess.TimeoutExpired(command, self.timeout)
+
+        empty = b"" if binary else ""
+        logger.debug(f"Command completed with return code: {process.returncode}")
+        return subprocess.CompletedProcess(
+            args=command,
+            returncode=process.returncode,
+            stdout=empty.join(tails["stdout"]),
+            stderr=empty.join(tails["stderr"])
+        )
+
     def run_with_output(
         self,
         command: Union[str, List[str]],
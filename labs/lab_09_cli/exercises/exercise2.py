@@ -1,22 +1,47 @@
-"""CLI tool development module with interactive features."""
+"""CLI tool development module with interactive features.
 
+rich and prompt_toolkit take longer to import than most commands take to
+run, so they are imported on first use: `--help` and commands that print
+plain text start without loading them.
+"""
+
+import argparse
+import fnmatch
+import importlib
 import os
 import sys
-from typing import Any, Dict, List, Optional, Union
-import click
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Prompt, Confirm
-from rich.table import Table
-from rich.panel import Panel
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.completion import WordCompleter
+import time
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+)
+
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from rich.console import Console
+    from rich.progress import Progress
+
+
+_console: Optional["Console"] = None
+
 
+def get_console() -> "Console":
+    """Get the shared Rich console, importing rich on first use.
 
-# Initialize Rich console
-console = Console()
+    Returns:
+        Console: Console used for all output
+    """
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def __getattr__(name: str) -> Any:
+    # Keep `exercise2.console` working without creating it at import time
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class CLITool:
@@ -38,33 +63,130 @@ class CLITool:
         self.name = name
         self.description = description
         self.history_file = history_file or f".{name}_history"
-        self.session = PromptSession(
-            history=FileHistory(self.history_file),
-            auto_suggest=AutoSuggestFromHistory()
-        )
-        self.commands: Dict[str, callable] = {}
+        self._session: Optional["PromptSession"] = None
+        self.commands: Dict[str, Union[Callable, str]] = {}
+        self.descriptions: Dict[str, str] = {}
+
+    @property
+    def session(self) -> "PromptSession":
+        """Get the prompt session, importing prompt_toolkit on first use."""
+        if self._session is None:
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+            from prompt_toolkit.history import FileHistory
+            self._session = PromptSession(
+                history=FileHistory(self.history_file),
+                auto_suggest=AutoSuggestFromHistory()
+            )
+        return self._session
 
-    def register_command(self, name: str, func: callable) -> None:
+    def register_command(
+        self,
+        name: str,
+        func: Union[Callable, str],
+        description: Optional[str] = None
+    ) -> None:
         """Register a command handler.
 
+        The handler can be given as a "module:function" string, which is
+        only imported when the command first runs.
+
         Args:
             name: Command name
-            func: Command handler function
+            func: Command handler function, or "module:function" to load lazily
+            description: Help text, defaults to the handler's docstring
         """
         self.commands[name] = func
+        if description is not None:
+            self.descriptions[name] = description
+
+    def get_command(self, name: str) -> Callable:
+        """Get a command handler, importing it if it was registered lazily.
+
+        Args:
+            name: Command name
+
+        Returns:
+            Callable: Command handler
+
+        Raises:
+            KeyError: If the command is not registered
+        """
+        func = self.commands[name]
+        if isinstance(func, str):
+            module_name, _, attr = func.partition(":")
+            func = getattr(importlib.import_module(module_name), attr)
+            self.commands[name] = func
+        return func
+
+    def describe(self, name: str) -> str:
+        """Get the help text of a command without loading lazy handlers.
+
+        Args:
+            name: Command name
+
+        Returns:
+            str: Command description
+        """
+        if name in self.descriptions:
+            return self.descriptions[name]
+        func = self.commands[name]
+        if isinstance(func, str):
+            return f"Runs {func}"
+        doc = (func.__doc__ or "").strip()
+        return doc.splitlines()[0] if doc else "No description available"
+
+    def run_command(self, name: str) -> None:
+        """Run a registered command.
+
+        Args:
+            name: Command name
+
+        Raises:
+            KeyError: If the command is not registered
+        """
+        self.get_command(name)()
+
+    def main(self, argv: Optional[List[str]] = None) -> int:
+        """Run one command from the command line, or the interactive shell.
+
+        Args:
+            argv: Arguments, sys.argv[1:] by default
+
+        Returns:
+            int: Exit status
+        """
+        parser = argparse.ArgumentParser(
+            prog=self.name,
+            description=self.description,
+            epilog="commands:\n" + "\n".join(
+                f"  {name:<12} {self.describe(name)}" for name in self.commands
+            ),
+            formatter_class=argparse.RawDescriptionHelpFormatter
+        )
+        parser.add_argument("command", nargs="?", choices=list(self.commands),
+                            help="command to run; starts the interactive shell if omitted")
+        args = parser.parse_args(argv)
+        if args.command is None:
+            self.interactive_shell()
+        else:
+            self.run_command(args.command)
+        return 0
 
     def show_help(self) -> None:
         """Display help information."""
+        from rich.table import Table
+
         table = Table(title=f"{self.name} - {self.description}")
         table.add_column("Command", style="cyan")
         table.add_column("Description", style="green")
 
-        for name, func in self.commands.items():
-            table.add_row(name, func.__doc__ or "No description available")
+        for name in self.commands:
+            table.add_row(name, self.describe(name))
 
-        console.print(table)
+        get_console().print(table)
 
-    def show_progress(self, description: str, total: int = 100) -> Progress:
+    def show_progress(self, description: str, total: int = 100) -> "Progress":
         """Create a progress bar.
 
         Args:
@@ -74,13 +196,15 @@ class CLITool:
         Returns:
             Progress: Progress bar instance
         """
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
-            console=console
+            console=get_console()
         )
 
-    def show_spinner(self, description: str) -> Progress:
+    def show_spinner(self, description: str) -> "Progress":
         """Create a spinner for indeterminate progress.
 
         Args:
@@ -89,10 +213,12 @@ class CLITool:
         Returns:
             Progress: Spinner instance
         """
+        from rich.progress import Progress, SpinnerColumn, TextColumn
+
         return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
-            console=console
+            console=get_console()
         )
 
     def show_table(
@@ -108,6 +234,8 @@ class CLITool:
             columns: Column names
             rows: Table rows
         """
+        from rich.table import Table
+
         table = Table(title=title)
         for col in columns:
             table.add_column(col)
@@ -115,7 +243,7 @@ class CLITool:
         for row in rows:
             table.add_row(*[str(cell) for cell in row])
 
-        console.print(table)
+        get_console().print(table)
 
     def show_panel(self, content: str, title: Optional[str] = None) -> None:
         """Display content in a panel.
@@ -124,7 +252,9 @@ class CLITool:
             content: Panel content
             title: Panel title
         """
-        console.print(Panel(content, title=title))
+        from rich.panel import Panel
+
+        get_console().print(Panel(content, title=title))
 
     def prompt(
         self,
@@ -142,6 +272,8 @@ class CLITool:
         Returns:
             str: User input
         """
+        from rich.prompt import Prompt
+
         if choices:
             return Prompt.ask(
                 question,
@@ -161,10 +293,13 @@ class CLITool:
         Returns:
             bool: User confirmation
         """
+        from rich.prompt import Confirm
+
         return Confirm.ask(question, default=default)
 
     def interactive_shell(self) -> None:
         """Start an interactive shell."""
+        console = get_console()
         console.print(f"[bold blue]Welcome to {self.name}![/]")
         console.print(f"[italic]{self.description}[/]")
         console.print("Type 'help' for available commands or 'exit' to quit.\n")
@@ -180,7 +315,7 @@ class CLITool:
                     self.show_help()
                 elif command in self.commands:
                     try:
-                        self.commands[command]()
+                        self.run_command(command)
                     except Exception as e:
                         console.print(f"[red]Error: {e}[/]")
                 else:
@@ -192,6 +327,174 @@ class CLITool:
                 break
 
 
+DEFAULT_PAGE_SIZE = 100
+
+
+class FileEntry(NamedTuple):
+    """A directory entry with the stat fields the lister shows."""
+    path: str
+    name: str
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+def _iter_dir(
+    directory: str,
+    accept: Callable[[os.DirEntry], Optional[FileEntry]],
+    onerror: Optional[Callable[[OSError], None]],
+    subdirs: Optional[List[str]] = None,
+    must_exist: bool = False
+) -> Iterator[FileEntry]:
+    """Stream the accepted entries of one directory.
+
+    Subdirectories are appended to subdirs. Errors are passed to onerror
+    and the listing goes on with the next entry; without onerror they are
+    skipped, except that a directory that cannot be opened raises when
+    must_exist is set.
+    """
+    try:
+        it = os.scandir(directory)
+    except OSError as e:
+        if onerror is not None:
+            onerror(e)
+        elif must_exist:
+            raise
+        return
+    with it:
+        while True:
+            try:
+                entry = next(it)
+            except StopIteration:
+                return
+            except OSError as e:
+                # Reading the directory itself failed; nothing more to list
+                if onerror is not None:
+                    onerror(e)
+                return
+            try:
+                # d_type answers this without a stat call on most filesystems
+                if subdirs is not None and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                accepted = accept(entry)
+            except FileNotFoundError:
+                # Removed while we were listing
+                continue
+            except OSError as e:
+                # E.g. no search permission on the directory, so stat fails
+                if onerror is not None:
+                    onerror(e)
+                continue
+            if accepted is not None:
+                yield accepted
+
+
+def _scan_dir(
+    directory: str,
+    accept: Callable[[os.DirEntry], Optional[FileEntry]],
+    onerror: Optional[Callable[[OSError], None]],
+    must_exist: bool = False
+) -> Tuple[List[FileEntry], List[str]]:
+    """Scan one directory, returning accepted entries and subdirectories."""
+    subdirs: List[str] = []
+    entries = list(_iter_dir(directory, accept, onerror, subdirs, must_exist))
+    return entries, subdirs
+
+
+def iter_entries(
+    path: Union[str, os.PathLike] = ".",
+    recursive: bool = False,
+    pattern: Optional[str] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    newer_than: Optional[float] = None,
+    older_than: Optional[float] = None,
+    include_dirs: bool = True,
+    max_workers: Optional[int] = None,
+    onerror: Optional[Callable[[OSError], None]] = None
+) -> Iterator[FileEntry]:
+    """Stream directory entries that match the filters.
+
+    Uses os.scandir, so the file type comes from the directory listing and
+    each entry is stat'ed at most once, and only after the name matched
+    pattern. Entries are yielded as they are read, in directory order, so
+    memory use does not grow with the size of a directory; recursive walks
+    only keep the paths of subdirectories still to visit.
+
+    Recursive walks with max_workers > 1 scan directories in a thread pool,
+    which helps on network filesystems where every stat is a round trip.
+    Each directory's entries are then collected before they are yielded.
+
+    Args:
+        path: Directory to list
+        recursive: Also list subdirectories
+        pattern: Glob matched against entry names, e.g. "*.log"
+        min_size: Minimum file size in bytes
+        max_size: Maximum file size in bytes
+        newer_than: Only entries modified after this timestamp
+        older_than: Only entries modified before this timestamp
+        include_dirs: Yield directories too (never with size filters)
+        max_workers: Threads for recursive walks; None or 1 walks in this thread
+        onerror: Called with the OSError of directories and entries that
+            cannot be read; the listing continues with the next one
+
+    Yields:
+        FileEntry: Matching entries
+
+    Raises:
+        OSError: If path itself cannot be read and onerror is not given
+    """
+    size_filter = min_size is not None or max_size is not None
+
+    def accept(entry: os.DirEntry) -> Optional[FileEntry]:
+        if pattern is not None and not fnmatch.fnmatch(entry.name, pattern):
+            return None
+        is_dir = entry.is_dir(follow_symlinks=False)
+        if is_dir and (not include_dirs or size_filter):
+            return None
+        stat = entry.stat(follow_symlinks=False)
+        if min_size is not None and stat.st_size < min_size:
+            return None
+        if max_size is not None and stat.st_size > max_size:
+            return None
+        if newer_than is not None and stat.st_mtime <= newer_than:
+            return None
+        if older_than is not None and stat.st_mtime >= older_than:
+            return None
+        return FileEntry(entry.path, entry.name, is_dir, stat.st_size, stat.st_mtime)
+
+    root = os.fspath(path)
+    if not recursive:
+        yield from _iter_dir(root, accept, onerror, must_exist=True)
+        return
+
+    if not max_workers or max_workers <= 1:
+        # Like the non-recursive listing, a bad root is an error unless handled
+        subdirs: List[str] = []
+        yield from _iter_dir(root, accept, onerror, subdirs, must_exist=True)
+        pending = list(reversed(subdirs))
+        while pending:
+            subdirs = []
+            yield from _iter_dir(pending.pop(), accept, onerror, subdirs)
+            pending.extend(reversed(subdirs))
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scandir") as pool:
+        running = {pool.submit(_scan_dir, root, accept, onerror, True)}
+        unscanned: List[str] = []
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, subdirs = future.result()
+                unscanned.extend(subdirs)
+                yield from entries
+            # Keep a bounded number of scans queued so huge trees do not pile up futures
+            while unscanned and len(running) < max_workers * 2:
+                running.add(pool.submit(_scan_dir, unscanned.pop(), accept, onerror))
+
+
 # Example CLI tool implementation
 class FileManager(CLITool):
     """Example CLI tool for file management."""
@@ -207,28 +510,66 @@ class FileManager(CLITool):
         self.register_command("delete", self.delete_file)
         self.register_command("info", self.file_info)
 
-    def list_files(self) -> None:
-        """List files in the current directory."""
-        with self.show_progress("Listing files...") as progress:
-            task = progress.add_task("Scanning directory...", total=None)
-            files = os.listdir(".")
-            progress.update(task, completed=True)
-
-        rows = []
-        for file in files:
-            stat = os.stat(file)
-            rows.append([
-                file,
-                "Directory" if os.path.isdir(file) else "File",
-                f"{stat.st_size:,} bytes",
-                stat.st_mtime
-            ])
-
-        self.show_table(
-            "Files in Current Directory",
-            ["Name", "Type", "Size", "Modified"],
-            rows
-        )
+    def list_files(
+        self,
+        path: Union[str, os.PathLike] = ".",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        pause: Optional[bool] = None,
+        recursive: bool = False,
+        max_workers: Optional[int] = None,
+        **filters: Any
+    ) -> int:
+        """List files in a directory, a page at a time.
+
+        Entries are streamed from iter_entries and shown one table per
+        page, so the first page appears right away even for directories
+        with millions of entries.
+
+        Args:
+            path: Directory to list
+            page_size: Entries per table
+            pause: Ask before showing the next page; defaults to whether
+                stdin is a terminal
+            recursive: Also list subdirectories
+            max_workers: Threads for recursive walks
+            **filters: pattern, min_size, max_size, newer_than, older_than
+                or include_dirs, passed to iter_entries
+
+        Returns:
+            int: Number of entries listed
+        """
+        if pause is None:
+            pause = sys.stdin.isatty()
+        root = os.fspath(path)
+        title = "Files in Current Directory" if root == "." else f"Files in {root}"
+        entries = iter_entries(root, recursive=recursive, max_workers=max_workers, **filters)
+        count = 0
+        page = 1
+        rows: List[List[Any]] = []
+        try:
+            for entry in entries:
+                rows.append([
+                    os.path.relpath(entry.path, root) if recursive else entry.name,
+                    "Directory" if entry.is_dir else "File",
+                    f"{entry.size:,} bytes",
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry.mtime))
+                ])
+                count += 1
+                if len(rows) == page_size:
+                    self.show_table(f"{title} (page {page})", ["Name", "Type", "Size", "Modified"], rows)
+                    rows = []
+                    page += 1
+                    if pause and not self.confirm("Show more?"):
+                        return count
+            if rows or count == 0:
+                self.show_table(
+                    f"{title} (page {page})" if page > 1 else title,
+                    ["Name", "Type", "Size", "Modified"],
+                    rows
+                )
+        finally:
+            entries.close()
+        return count
 
     def create_file(self) -> None:
         """Create a new file."""
@@ -284,9 +625,8 @@ class FileManager(CLITool):
 # Example usage
 if __name__ == "__main__":
     try:
-        # Create and run the file manager
-        file_manager = FileManager()
-        file_manager.interactive_shell()
+        # Run one command, or the interactive shell without arguments
+        sys.exit(FileManager().main())
     except Exception as e:
-        console.print(f"[red]Error: {e}[/]")
+        get_console().print(f"[red]Error: {e}[/]")
         sys.exit(1) 
\ No newline at end of file
@@ -0,0 +1,96 @@
+"""Tests for Exercise 1: subprocess management."""
+
+import subprocess
+import time
+
+import pytest
+
+from exercises.exercise1 import CommandRunner, ResultCache
+
+
+@pytest.fixture
+def runner():
+    return CommandRunner(shell=True)
+
+
+def test_run_with_input(runner):
+    result = runner.run("grep World", input_text="Hello\nHello, World!\nGoodbye")
+    assert result.stdout == "Hello, World!\n"
+
+
+def test_stream_yields_output_as_it_arrives(runner):
+    start = time.perf_counter()
+    arrivals = []
+    for stream, data in runner.stream("echo first; sleep 0.5; echo second >&2"):
+        arrivals.append((stream, data, time.perf_counter() - start))
+    assert [(stream, data) for stream, data, _ in arrivals] == [("stdout", "first\n"), ("stderr", "second\n")]
+    assert arrivals[0][2] < 0.4
+
+
+def test_stream_returns_completed_process(runner):
+    output = runner.stream("printf 'a\\nb'; exit 2")
+    chunks = []
+    with pytest.raises(StopIteration) as done:
+        while True:
+            chunks.append(next(output))
+    assert chunks == [("stdout", "a\n"), ("stdout", "b")]
+    assert done.value.value.returncode == 2
+
+
+def test_stream_binary_chunks(runner):
+    chunks = list(runner.stream("head -c 200000 /dev/zero", binary=True, chunk_size=32768))
+    assert all(len(data) <= 32768 for _, data in chunks)
+    assert sum(len(data) for _, data in chunks) == 200000
+
+
+def test_run_with_callback_keeps_bounded_tail(runner):
+    lines = []
+    result = runner.run("seq 1 50000", on_stdout=lines.append, tail_size=50)
+    assert len(lines) == 50000
+    assert len(result.stdout) <= 50
+    assert result.stdout.endswith("49999\n50000\n")
+
+
+def test_stream_timeout_kills_command():
+    runner = CommandRunner(shell=True, timeout=0.3)
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run("echo started; sleep 5", tail_size=100)
+    assert time.perf_counter() - start < 2
+
+
+def test_stream_timeout_after_pipes_close():
+    runner = CommandRunner(shell=True, timeout=0.3)
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run("exec >&- 2>&-; sleep 5", tail_size=100)
+    assert time.perf_counter() - start < 2
+
+
+def test_cached_run_skips_execution(tmp_path):
+    runner = CommandRunner(shell=True, cwd=tmp_path, result_cache=ResultCache(tmp_path / "cache"))
+    (tmp_path / "input.txt").write_text("a\nb\n")
+    command = "echo run >> runs; wc -l < input.txt"
+    assert runner.run(command, cache=True, inputs=["input.txt"]).stdout.strip() == "2"
+    assert runner.run(command, cache=True, inputs=["input.txt"]).stdout.strip() == "2"
+    assert (tmp_path / "runs").read_text().count("run") == 1
+
+    (tmp_path / "input.txt").write_text("a\nb\nc\n")
+    assert runner.run(command, cache=True, inputs=["input.txt"]).stdout.strip() == "3"
+    assert runner.result_cache.stats()["hit_rate"] == 1 / 3
+
+
+def test_streamed_runs_are_not_cached(tmp_path):
+    runner = CommandRunner(shell=True, result_cache=ResultCache(tmp_path / "cache"))
+    assert runner.run("seq 1 1000", cache=True, tail_size=10).stdout == "\n999\n1000\n"
+    assert runner.run("seq 1 1000", cache=True).stdout.startswith("1\n2\n")
+
+
+def test_cache_key_includes_shell_and_env_vars(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    env = {"PATH": "/bin", "LANG": "C"}
+    key = cache.make_key("ls", False, None, env)
+    assert cache.make_key("ls", True, None, env) != key
+    assert cache.make_key("ls", False, None, env, env_vars=["LANG"]) != key
+    assert cache.make_key("ls", False, None, dict(env, LANG="de_DE"), env_vars=["LANG"]) != \
+        cache.make_key("ls", False, None, env, env_vars=["LANG"])
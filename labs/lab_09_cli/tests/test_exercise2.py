@@ -0,0 +1,154 @@
+"""Tests for Exercise 2: CLI tool startup and lazy loading."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from benchmarks.benchmark_startup import HEAVY_MODULES, MODULE, import_times
+from exercises import exercise2
+from exercises.exercise2 import CLITool, FileManager, iter_entries
+
+# Cumulative import time of the module itself; rich and prompt_toolkit alone take 150+ ms
+IMPORT_BUDGET_MS = 50
+
+
+def test_import_stays_within_startup_budget():
+    times = import_times()
+    assert times[MODULE][1] / 1000 < IMPORT_BUDGET_MS
+    assert not [name for name in HEAVY_MODULES if name in times]
+
+
+def test_help_does_not_load_heavy_modules():
+    code = (
+        "import sys\n"
+        "from exercises.exercise2 import FileManager\n"
+        "try:\n"
+        "    FileManager().main(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(sorted(name for name in {HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert "Show information about a file" in completed.stdout
+    assert completed.stdout.strip().endswith("[]")
+
+
+def test_lazy_command_is_imported_on_first_run(capsys):
+    tool = CLITool("tool", "Test tool", history_file="/dev/null")
+    tool.register_command("dump", "json:dumps", description="Dump JSON")
+    assert tool.describe("dump") == "Dump JSON"
+    assert tool.commands["dump"] == "json:dumps"
+    assert tool.get_command("dump")([1]) == "[1]"
+    assert callable(tool.commands["dump"])
+    with pytest.raises(KeyError):
+        tool.get_command("missing")
+
+
+def test_run_single_command(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "notes.txt").write_text("hello")
+    assert FileManager().main(["list"]) == 0
+    assert "notes.txt" in capsys.readouterr().out
+
+
+@pytest.fixture
+def tree(tmp_path):
+    old = time.time() - 3600
+    for directory in ("a", "a/b", "c"):
+        (tmp_path / directory).mkdir()
+    for name, size in [("top.log", 10), ("top.txt", 2000), ("a/one.log", 500),
+                       ("a/b/two.log", 5000), ("c/three.txt", 1)]:
+        (tmp_path / name).write_bytes(b"x" * size)
+    os.utime(tmp_path / "top.txt", (old, old))
+    return tmp_path
+
+
+def names(entries):
+    return sorted(os.path.basename(entry.path) for entry in entries)
+
+
+def test_iter_entries_lists_one_directory(tree):
+    assert names(iter_entries(tree)) == ["a", "c", "top.log", "top.txt"]
+    assert names(iter_entries(tree, include_dirs=False)) == ["top.log", "top.txt"]
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_iter_entries_recursive_with_filters(tree, max_workers):
+    walk = lambda **filters: names(iter_entries(tree, recursive=True, max_workers=max_workers, **filters))
+    assert walk() == ["a", "b", "c", "one.log", "three.txt", "top.log", "top.txt", "two.log"]
+    assert walk(pattern="*.log") == ["one.log", "top.log", "two.log"]
+    assert walk(min_size=100, max_size=2000) == ["one.log", "top.txt"]
+    assert walk(older_than=time.time() - 60) == ["top.txt"]
+    assert walk(pattern="*.txt", newer_than=time.time() - 60) == ["three.txt"]
+
+
+@pytest.mark.parametrize("recursive,max_workers", [(False, None), (True, None), (True, 4)])
+def test_iter_entries_reports_unreadable_directories(tmp_path, recursive, max_workers):
+    missing = tmp_path / "missing"
+    errors = []
+    assert list(iter_entries(missing, recursive=recursive, max_workers=max_workers, onerror=errors.append)) == []
+    assert isinstance(errors[0], FileNotFoundError)
+    with pytest.raises(FileNotFoundError):
+        list(iter_entries(missing, recursive=recursive, max_workers=max_workers))
+
+
+class _LockedEntry:
+    """DirEntry whose stat fails, like in a directory without search permission."""
+
+    def __init__(self, entry):
+        self._entry = entry
+        self.name, self.path = entry.name, entry.path
+
+    def is_dir(self, follow_symlinks=True):
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def stat(self, follow_symlinks=True):
+        raise PermissionError(13, "Permission denied", self.path)
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_iter_entries_skips_unreadable_entries(tree, monkeypatch, max_workers):
+    real_scandir = os.scandir
+
+    class LockedScandir:
+        def __init__(self, path):
+            self._it = real_scandir(path)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self._it.close()
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            entry = next(self._it)
+            return _LockedEntry(entry) if entry.name in ("top.log", "a") else entry
+
+    monkeypatch.setattr(exercise2.os, "scandir", LockedScandir)
+    errors = []
+    found = names(iter_entries(tree, recursive=True, max_workers=max_workers, onerror=errors.append))
+    # Entries after the unreadable ones, and a's subdirectories, are still listed
+    assert found == ["b", "c", "one.log", "three.txt", "top.txt", "two.log"]
+    assert sorted(os.path.basename(e.filename) for e in errors) == ["a", "top.log"]
+    assert names(iter_entries(tree)) == ["c", "top.txt"]
+
+
+def test_list_files_renders_pages(tree, capsys):
+    manager = FileManager()
+    assert manager.list_files(tree, page_size=3, pause=False, recursive=True, include_dirs=False) == 5
+    output = capsys.readouterr().out
+    assert "(page 1)" in output and "(page 2)" in output and "(page 3)" not in output
+    assert os.path.join("a", "b", "two.log") in output
+
+
+def test_list_files_stops_when_declined(tree, monkeypatch, capsys):
+    manager = FileManager()
+    monkeypatch.setattr(manager, "confirm", lambda question, default=True: False)
+    assert manager.list_files(tree, page_size=2, pause=True) == 2
+    assert "(page 2)" not in capsys.readouterr().out
@@ -0,0 +1,130 @@
+"""Benchmark the thread-based and asyncio shell executors at high concurrency.
+
+Runs the same batch of short commands through ShellExecutor.run_many (one
+thread per running command) and AsyncShellExecutor.run_many (one event
+loop) and reports wall time, throughput, peak thread count and memory.
+
+Run from the lab directory:
+
+    python -m benchmarks.benchmark_executors --commands 2000 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import logging
+import resource
+import sys
+import threading
+import time
+import warnings
+from typing import Callable, Dict
+
+import psutil
+
+from exercises.exercise1 import AsyncShellExecutor, BatchStats, ShellExecutor
+
+
+class PeakSampler:
+    """Sample thread count and RSS of this process in the background."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_threads = 0
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak_threads = max(self.peak_threads, self.process.num_threads())
+            self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "PeakSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_threaded(commands, concurrency: int, stats: BatchStats) -> None:
+    shell = ShellExecutor(shell=True)
+    for _ in shell.run_many(commands, max_workers=concurrency, stats=stats):
+        pass
+
+
+def run_async(commands, concurrency: int, stats: BatchStats) -> None:
+    async def main() -> None:
+        shell = AsyncShellExecutor(shell=True)
+        async for _ in shell.run_many(commands, max_concurrency=concurrency, stats=stats):
+            pass
+
+    asyncio.run(main())
+
+
+def use_pidfd_child_watcher() -> bool:
+    """Use pidfds to wait for children on Python < 3.12.
+
+    The default ThreadedChildWatcher starts one waiter thread per child,
+    which would hide the difference between the executors. Python 3.12+
+    picks a pidfd-based watcher on its own.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        return False
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            watcher = asyncio.PidfdChildWatcher()
+            asyncio.set_child_watcher(watcher)
+        except OSError:
+            return False
+    return True
+
+
+def raise_fd_limit() -> int:
+    """Raise the open file limit to the hard limit (3 pipes per child)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def measure(name: str, runner: Callable, commands, concurrency: int) -> Dict[str, float]:
+    """Run one executor and print its results."""
+    stats = BatchStats()
+    with PeakSampler() as sampler:
+        start = time.perf_counter()
+        runner(commands, concurrency, stats)
+        elapsed = time.perf_counter() - start
+    print(f"{name:>8}: {stats.total} commands in {elapsed:.2f}s "
+          f"({stats.total / elapsed:.0f}/s) | parallelism {stats.parallelism:.0f} | "
+          f"peak threads {sampler.peak_threads} | peak RSS {sampler.peak_rss / 2**20:.0f} MiB | "
+          f"failed {stats.failed + stats.timed_out}")
+    return {"elapsed": elapsed, "threads": sampler.peak_threads, "rss": sampler.peak_rss}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare thread and asyncio shell executors")
+    parser.add_argument("--commands", type=int, default=1000, help="Commands per run")
+    parser.add_argument("--concurrency", type=int, default=250, help="Commands running at once")
+    parser.add_argument("--command", default="sleep 0.2", help="Command to run")
+    parser.add_argument("--mode", choices=["thread", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    logging.getLogger("exercises.exercise1").setLevel(logging.WARNING)
+    fd_limit = raise_fd_limit()
+    pidfd = use_pidfd_child_watcher()
+    print(f"fd limit {fd_limit}, pidfd child watcher: {'yes' if pidfd else 'no'}")
+
+    commands = [args.command] * args.commands
+    if args.mode in ("thread", "both"):
+        measure("thread", run_threaded, commands, args.concurrency)
+    if args.mode in ("async", "both"):
+        measure("async", run_async, commands, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark piping large data through `gzip | sha256sum`.
+
+Compares three ways to run the same pipeline over a generated file:
+
+- relay: Python reads the file and copies every byte between the stages
+- text:  run_with_pipe in text mode, with a `cat` stage reading the file
+- binary: run_with_pipe(binary=True, input_file=...), where the kernel moves
+  the data and Python only collects the final hash
+
+Run from the lab directory:
+
+    python -m benchmarks.benchmark_pipeline --size-mb 2048
+"""
+
+import argparse
+import logging
+import os
+import resource
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from exercises.exercise1 import ShellExecutor
+
+CHUNK_SIZE = 64 * 1024
+# -n: with a regular file as stdin gzip would otherwise store its mtime
+PIPELINE = ["gzip -1 -n", "sha256sum"]
+
+
+def create_input(path: str, size_mb: int) -> None:
+    """Write size_mb MiB of partly compressible data."""
+    block = os.urandom(512 * 1024) + bytes(512 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def run_relay(path: str) -> str:
+    """Copy the data through Python between every stage."""
+    gzip = subprocess.Popen(["gzip", "-1", "-n"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    sha = subprocess.Popen(["sha256sum"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def feed() -> None:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                gzip.stdin.write(chunk)
+        gzip.stdin.close()
+
+    feeder = threading.Thread(target=feed)
+    feeder.start()
+    for chunk in iter(lambda: gzip.stdout.read(CHUNK_SIZE), b""):
+        sha.stdin.write(chunk)
+    sha.stdin.close()
+    feeder.join()
+    gzip.wait()
+    digest = sha.stdout.read().decode()
+    sha.wait()
+    return digest.split()[0]
+
+
+def run_text(path: str) -> str:
+    result = ShellExecutor().run_with_pipe([f"cat {shlex.quote(path)}"] + PIPELINE)
+    return result.stdout.split()[0]
+
+
+def run_binary(path: str) -> str:
+    result = ShellExecutor().run_with_pipe(PIPELINE, binary=True, input_file=path, max_output=4096)
+    return result.stdout.split()[0].decode()
+
+
+def measure(name: str, runner: Callable[[str], str], path: str, size_mb: int) -> str:
+    """Time one variant, including the CPU time spent in this process."""
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    digest = runner(path)
+    elapsed = time.perf_counter() - start
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    python_cpu = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    print(f"{name:>7}: {elapsed:6.2f}s ({size_mb / elapsed:6.0f} MiB/s) | "
+          f"Python CPU {python_cpu:5.2f}s | max RSS {usage_after.ru_maxrss / 1024:.0f} MiB | {digest[:16]}")
+    return digest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark binary pipelines")
+    parser.add_argument("--size-mb", type=int, default=512, help="Input size in MiB")
+    parser.add_argument("--mode", choices=["relay", "text", "binary", "all"], default="all")
+    args = parser.parse_args()
+
+    logging.getLogger("exercises.exercise1").setLevel(logging.WARNING)
+    runners = {"relay": run_relay, "text": run_text, "binary": run_binary}
+    modes = list(runners) if args.mode == "all" else [args.mode]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.bin")
+        create_input(path, args.size_mb)
+        digests = {measure(mode, runners[mode], path, args.size_mb) for mode in modes}
+    if len(digests) > 1:
+        raise SystemExit("Pipelines produced different digests")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
 """Shell command execution module."""
 
+import asyncio
+import codecs
+import errno
+import hashlib
+import json
+import locale
 import os
+import selectors
+import shlex
+import shutil
+import signal
 import sys
 import logging
 import subprocess
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import psutil
 
@@ -29,6 +44,792 @@ class CommandResult:
     start_time: datetime
     end_time: datetime
     pid: Optional[int] = None
+    command: Optional[Union[str, List[str]]] = None
+    timed_out: bool = False
+    resources: Optional["ResourceUsage"] = None
+    cached: bool = False
+    dropped_bytes: int = 0
+
+    @property
+    def duration(self) -> float:
+        """Wall-clock duration in seconds."""
+        return (self.end_time - self.start_time).total_seconds()
+
+    @property
+    def truncated(self) -> bool:
+        """Whether output beyond the capture limit was discarded."""
+        return self.dropped_bytes > 0
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the command exited with status 0."""
+        return self.returncode == 0 and not self.timed_out
+
+
+@dataclass
+class ResourceUsage:
+    """Resources used by a command and the children it waited for."""
+
+    user_time: float
+    system_time: float
+    max_rss: int
+    in_blocks: int
+    out_blocks: int
+    voluntary_switches: int
+    involuntary_switches: int
+    peak_tree_rss: Optional[int] = None
+    peak_tree_processes: Optional[int] = None
+
+    @property
+    def cpu_time(self) -> float:
+        """User plus system CPU seconds."""
+        return self.user_time + self.system_time
+
+    @property
+    def io_blocks(self) -> int:
+        """Filesystem blocks read plus written."""
+        return self.in_blocks + self.out_blocks
+
+    @classmethod
+    def from_rusage(cls, rusage: Any) -> "ResourceUsage":
+        """Create from an os.wait4/resource.getrusage result.
+
+        Args:
+            rusage: struct_rusage
+
+        Returns:
+            ResourceUsage: Usage with max_rss converted to bytes
+        """
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return cls(
+            user_time=rusage.ru_utime,
+            system_time=rusage.ru_stime,
+            max_rss=rusage.ru_maxrss * scale,
+            in_blocks=rusage.ru_inblock,
+            out_blocks=rusage.ru_oublock,
+            voluntary_switches=rusage.ru_nvcsw,
+            involuntary_switches=rusage.ru_nivcsw
+        )
+
+
+@dataclass
+class BatchStats:
+    """Aggregate statistics for a batch of commands."""
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    wall_time: float = 0.0
+    command_time: float = 0.0
+    cpu_user: float = 0.0
+    cpu_system: float = 0.0
+
+    @property
+    def cpu_time(self) -> float:
+        """Child user plus system CPU seconds."""
+        return self.cpu_user + self.cpu_system
+
+    @property
+    def parallelism(self) -> float:
+        """Average number of commands running at once."""
+        return self.command_time / self.wall_time if self.wall_time else 0.0
+
+    @property
+    def cpu_utilization(self) -> float:
+        """CPU seconds used per wall-clock second (1.0 = one busy core)."""
+        return self.cpu_time / self.wall_time if self.wall_time else 0.0
+
+    def record(self, result: CommandResult) -> None:
+        """Add a finished command to the totals."""
+        self.command_time += result.duration
+        if result.timed_out:
+            self.timed_out += 1
+        elif result.returncode == 0:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+
+RANK_KEYS: Dict[str, Callable[[CommandResult], float]] = {
+    "cpu_time": lambda result: result.resources.cpu_time,
+    "max_rss": lambda result: result.resources.max_rss,
+    "peak_tree_rss": lambda result: result.resources.peak_tree_rss or 0,
+    "io_blocks": lambda result: result.resources.io_blocks,
+    "context_switches": lambda result: (
+        result.resources.voluntary_switches + result.resources.involuntary_switches
+    ),
+    "duration": lambda result: result.duration,
+}
+
+
+def rank_commands(
+    results: List[CommandResult],
+    sort_by: str = "cpu_time",
+    top: Optional[int] = 10
+) -> List[CommandResult]:
+    """Rank commands by resource usage, most expensive first.
+
+    Args:
+        results: Results with resource usage (others are skipped)
+        sort_by: One of RANK_KEYS
+        top: Number of results to return, None for all
+
+    Returns:
+        List[CommandResult]: The most expensive commands
+
+    Raises:
+        ValueError: If sort_by is unknown
+    """
+    if sort_by not in RANK_KEYS:
+        raise ValueError(f"Unknown sort key: {sort_by} (expected one of {sorted(RANK_KEYS)})")
+    measured = [result for result in results if result.resources is not None]
+    ranked = sorted(measured, key=RANK_KEYS[sort_by], reverse=True)
+    return ranked if top is None else ranked[:top]
+
+
+def resource_report(
+    results: List[CommandResult],
+    sort_by: str = "cpu_time",
+    top: int = 10,
+    width: int = 50
+) -> str:
+    """Format a table of the most expensive commands in a batch.
+
+    Args:
+        results: Results with resource usage
+        sort_by: One of RANK_KEYS
+        top: Number of commands to list
+        width: Maximum characters of each command shown
+
+    Returns:
+        str: Report with one line per command and a totals line
+    """
+    measured = [result for result in results if result.resources is not None]
+    lines = [
+        f"{'#':>3} {'wall s':>8} {'cpu s':>8} {'user s':>8} {'sys s':>8} {'max RSS MiB':>11} "
+        f"{'io blocks':>9} {'ctx sw':>8}  command"
+    ]
+    for rank, result in enumerate(rank_commands(measured, sort_by, top), 1):
+        usage = result.resources
+        command = result.command if isinstance(result.command, str) else subprocess.list2cmdline(result.command or [])
+        if len(command) > width:
+            command = command[:width - 3] + "..."
+        lines.append(
+            f"{rank:>3} {result.duration:>8.3f} {usage.cpu_time:>8.3f} {usage.user_time:>8.3f} "
+            f"{usage.system_time:>8.3f} {usage.max_rss / 2**20:>11.1f} {usage.io_blocks:>9} "
+            f"{usage.voluntary_switches + usage.involuntary_switches:>8}  {command}"
+        )
+    total_cpu = sum(result.resources.cpu_time for result in measured)
+    total_wall = sum(result.duration for result in measured)
+    lines.append(
+        f"{len(measured)} commands: {total_wall:.3f}s command time, {total_cpu:.3f}s CPU, "
+        f"peak max RSS {max((r.resources.max_rss for r in measured), default=0) / 2**20:.1f} MiB"
+    )
+    return "\n".join(lines)
+
+
+def _kill_group(process: Union[subprocess.Popen, asyncio.subprocess.Process]) -> None:
+    """Kill a process started in its own session, along with its children."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+def _spawn_failure(command: Union[str, List[str]], error: OSError, start_time: datetime) -> CommandResult:
+    """Result for a command that could not be started, as a shell reports it."""
+    return CommandResult(
+        returncode=127,
+        stdout="",
+        stderr=f"{error}\n",
+        start_time=start_time,
+        end_time=datetime.utcnow(),
+        command=command
+    )
+
+
+def _decode_text(data: Optional[bytes], encoding: str) -> Optional[str]:
+    """Decode output like text=True does, translating newlines."""
+    if data is None:
+        return None
+    return data.decode(encoding, errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _reap(
+    process: subprocess.Popen,
+    deadline: Optional[float] = None
+) -> Tuple[Optional[ResourceUsage], bool]:
+    """Wait for a process with os.wait4 to collect its resource usage.
+
+    Popen.wait would discard the rusage, so the child is reaped here and
+    its return code stored on the Popen object.
+
+    Args:
+        process: Process to wait for
+        deadline: time.monotonic() after which the process group is killed
+
+    Returns:
+        Tuple: Resource usage (None without os.wait4), and whether the
+            deadline passed
+    """
+    if process.returncode is not None or not hasattr(os, "wait4"):
+        remaining = deadline - time.monotonic() if deadline is not None else None
+        try:
+            process.wait(max(remaining, 0) if remaining is not None else None)
+            return None, False
+        except subprocess.TimeoutExpired:
+            _kill_group(process)
+            process.wait()
+            return None, True
+
+    timed_out = False
+    delay = 0.0005
+    try:
+        while True:
+            flags = os.WNOHANG if deadline is not None and not timed_out else 0
+            pid, status, rusage = os.wait4(process.pid, flags)
+            if pid:
+                break
+            if time.monotonic() >= deadline:
+                timed_out = True
+                _kill_group(process)
+                continue
+            # Same backoff as Popen.wait with a timeout
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, 0.05)
+    except ChildProcessError:
+        # Already reaped elsewhere, e.g. SIGCHLD is ignored
+        process.returncode = process.returncode if process.returncode is not None else 0
+        return None, timed_out
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return ResourceUsage.from_rusage(rusage), timed_out
+
+
+class _TreeSampler:
+    """Sample the memory and size of a process tree in the background."""
+
+    def __init__(self, pid: int, interval: float):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_processes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            root = psutil.Process(self.pid)
+        except psutil.NoSuchProcess:
+            return
+        while True:
+            try:
+                processes = [root] + root.children(recursive=True)
+            except psutil.NoSuchProcess:
+                return
+            rss = 0
+            for process in processes:
+                try:
+                    rss += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+                    pass
+            self.peak_rss = max(self.peak_rss, rss)
+            self.peak_processes = max(self.peak_processes, len(processes))
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self, usage: Optional[ResourceUsage]) -> None:
+        """Stop sampling and record the peaks on usage."""
+        self._stop.set()
+        self._thread.join()
+        if usage is not None:
+            usage.peak_tree_rss = self.peak_rss
+            usage.peak_tree_processes = self.peak_processes
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_TAIL_BYTES = 1024 * 1024
+MAX_LINE_LENGTH = 1024 * 1024
+
+OutputCallback = Callable[[Union[str, bytes]], None]
+
+
+def _relay(source_fd: int, target_fd: int, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+    """Copy everything from source_fd to target_fd, in the kernel where possible.
+
+    Tries os.splice (Linux, one end must be a pipe), then os.sendfile
+    (source must be a regular file), then a plain read/write loop.
+
+    Returns:
+        int: Bytes copied
+    """
+    def splice() -> int:
+        return os.splice(source_fd, target_fd, chunk_size)
+
+    def sendfile() -> int:
+        return os.sendfile(target_fd, source_fd, None, chunk_size)
+
+    def read_write() -> int:
+        data = os.read(source_fd, chunk_size)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(target_fd, view):]
+        return len(data)
+
+    methods = [method for name, method in (("splice", splice), ("sendfile", sendfile)) if hasattr(os, name)]
+    total = 0
+    for method in methods + [read_write]:
+        try:
+            while True:
+                copied = method()
+                if not copied:
+                    return total
+                total += copied
+        except OSError as e:
+            # Not supported for this pair of descriptors; fall back
+            if e.errno not in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP) or method is read_write:
+                raise
+    return total
+
+
+def _read_head(fd: int, max_bytes: int) -> Tuple[bytes, int]:
+    """Read up to max_bytes from fd, then discard the rest without copying it.
+
+    Returns:
+        Tuple[bytes, int]: The bytes read and the number of bytes discarded
+    """
+    head = bytearray()
+    while len(head) < max_bytes:
+        data = os.read(fd, min(STREAM_CHUNK_SIZE, max_bytes - len(head)))
+        if not data:
+            return bytes(head), 0
+        head += data
+    with open(os.devnull, "wb") as devnull:
+        dropped = _relay(fd, devnull.fileno())
+    if dropped:
+        logger.debug(f"Discarded {dropped} bytes of output beyond {max_bytes}")
+    return bytes(head), dropped
+
+
+@dataclass
+class OutputChunk:
+    """A line (text mode) or chunk of bytes (binary mode) of command output."""
+
+    stream: str
+    data: Union[str, bytes]
+
+
+class TailBuffer:
+    """Keep only the most recent output, up to a size limit."""
+
+    def __init__(self, max_size: Optional[int]):
+        """Initialize the buffer.
+
+        Args:
+            max_size: Characters (text) or bytes (binary) to keep, None for all
+        """
+        self.max_size = max_size
+        self.dropped = 0
+        self._chunks: deque = deque()
+        self._size = 0
+
+    def append(self, data: Union[str, bytes]) -> None:
+        """Add output, dropping the oldest output beyond the limit."""
+        self._chunks.append(data)
+        self._size += len(data)
+        while self.max_size is not None and self._size > self.max_size and self._chunks:
+            excess = self._size - self.max_size
+            oldest = self._chunks[0]
+            if len(oldest) <= excess:
+                self._chunks.popleft()
+                removed = len(oldest)
+            else:
+                self._chunks[0] = oldest[excess:]
+                removed = excess
+            self._size -= removed
+            self.dropped += removed
+
+    def getvalue(self, empty: Union[str, bytes] = "") -> Union[str, bytes]:
+        """Get the retained output."""
+        return empty.join(self._chunks)
+
+
+class CommandStream:
+    """Running command whose output is read as it arrives.
+
+    Iterating yields OutputChunk objects from stdout and stderr in arrival
+    order. Only the last `tail_size` characters (or bytes) of each stream
+    are kept for the final CommandResult, so memory stays bounded however
+    much the command prints.
+    """
+
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        command: Union[str, List[str]],
+        input_data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        binary: bool = False,
+        tail_size: Optional[int] = DEFAULT_TAIL_BYTES,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        on_stdout: Optional[OutputCallback] = None,
+        on_stderr: Optional[OutputCallback] = None,
+        on_exit: Optional[Callable[[subprocess.Popen], None]] = None,
+        sample_interval: Optional[float] = None,
+        start_time: Optional[datetime] = None
+    ):
+        """Initialize the stream; the process must have been started with binary pipes.
+
+        Args:
+            process: Process with stdout/stderr pipes
+            command: Command being run
+            input_data: Bytes to feed to stdin
+            timeout: Seconds before the process group is killed
+            binary: Yield raw byte chunks instead of decoded lines
+            tail_size: Output kept per stream for the result, None for all
+            chunk_size: Maximum bytes read at a time
+            on_stdout: Called with each stdout line or chunk
+            on_stderr: Called with each stderr line or chunk
+            on_exit: Called with the process once it has exited
+            sample_interval: Seconds between psutil samples of the process tree
+            start_time: When the process was started (default: now)
+        """
+        self.process = process
+        self.command = command
+        self.binary = binary
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.start_time = start_time or datetime.utcnow()
+        self.tails = {"stdout": TailBuffer(tail_size), "stderr": TailBuffer(tail_size)}
+        self.callbacks = {"stdout": on_stdout, "stderr": on_stderr}
+        self._input = memoryview(input_data) if input_data is not None else None
+        self._on_exit = on_exit
+        self._sampler = _TreeSampler(process.pid, sample_interval) if sample_interval else None
+        self._result: Optional[CommandResult] = None
+        self._chunks = self._read()
+
+    def __iter__(self) -> Iterator[OutputChunk]:
+        return self._chunks
+
+    def __enter__(self) -> "CommandStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def result(self) -> CommandResult:
+        """Wait for the command and return its result with the retained output."""
+        for _ in self._chunks:
+            pass
+        return self._result
+
+    def close(self) -> None:
+        """Stop reading, killing the command if it is still running."""
+        self._chunks.close()
+
+    def _decoders(self) -> Dict[str, Any]:
+        encoding = locale.getpreferredencoding(False)
+        return {name: codecs.getincrementaldecoder(encoding)(errors="replace") for name in self.tails}
+
+    def _emit(self, name: str, data: Union[str, bytes]) -> OutputChunk:
+        self.tails[name].append(data)
+        callback = self.callbacks[name]
+        if callback:
+            callback(data)
+        return OutputChunk(name, data)
+
+    def _split_lines(self, name: str, pending: Dict[str, str], text: str, final: bool) -> Iterator[OutputChunk]:
+        pending[name] += text
+        lines = pending[name].splitlines(keepends=True)
+        pending[name] = ""
+        if lines and not final and not lines[-1].endswith(("\n", "\r")):
+            # Hold back a partial line, unless it is too long to keep buffering
+            if len(lines[-1]) < MAX_LINE_LENGTH:
+                pending[name] = lines.pop()
+        for line in lines:
+            yield self._emit(name, line)
+
+    def _read(self) -> Iterator[OutputChunk]:
+        process = self.process
+        selector = selectors.DefaultSelector()
+        decoders = self._decoders()
+        pending = {name: "" for name in self.tails}
+        streams = {"stdout": process.stdout, "stderr": process.stderr}
+        for name, pipe in streams.items():
+            if pipe is not None:
+                selector.register(pipe, selectors.EVENT_READ, name)
+        if process.stdin is not None:
+            if self._input:
+                os.set_blocking(process.stdin.fileno(), False)
+                selector.register(process.stdin, selectors.EVENT_WRITE, "stdin")
+            else:
+                process.stdin.close()
+
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        timed_out = finished = False
+        try:
+            while selector.get_map():
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    timed_out = True
+                    _kill_group(process)
+                    break
+                for key, _ in selector.select(remaining):
+                    if key.data == "stdin":
+                        self._write_input(selector, key.fileobj)
+                        continue
+                    data = os.read(key.fd, self.chunk_size)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                        if not self.binary:
+                            yield from self._split_lines(
+                                key.data, pending, decoders[key.data].decode(b"", final=True), True
+                            )
+                    elif self.binary:
+                        yield self._emit(key.data, data)
+                    else:
+                        yield from self._split_lines(key.data, pending, decoders[key.data].decode(data), False)
+            finished = True
+        finally:
+            selector.close()
+            if not finished and process.returncode is None:
+                # Iteration was abandoned before the command finished
+                _kill_group(process)
+            for pipe in (process.stdin, process.stdout, process.stderr):
+                if pipe is not None:
+                    pipe.close()
+            # The pipes may close before the process exits
+            resources, wait_timed_out = _reap(process, deadline if finished else None)
+            timed_out = timed_out or wait_timed_out
+            if self._sampler:
+                self._sampler.stop(resources)
+            if self._on_exit:
+                self._on_exit(process)
+
+        empty = b"" if self.binary else ""
+        self._result = CommandResult(
+            returncode=process.returncode,
+            stdout=self.tails["stdout"].getvalue(empty) if process.stdout else None,
+            stderr=self.tails["stderr"].getvalue(empty) if process.stderr else None,
+            start_time=self.start_time,
+            end_time=datetime.utcnow(),
+            pid=process.pid,
+            command=self.command,
+            timed_out=timed_out,
+            resources=resources
+        )
+
+    def _write_input(self, selector: selectors.BaseSelector, stdin) -> None:
+        try:
+            written = os.write(stdin.fileno(), self._input[:self.chunk_size])
+            self._input = self._input[written:]
+        except BrokenPipeError:
+            self._input = None
+        if not self._input:
+            selector.unregister(stdin)
+            stdin.close()
+
+
+def _file_fingerprint(path: Union[str, Path], cwd: Optional[str], hash_contents: bool = False) -> Any:
+    """Fingerprint a file by mtime and size, or by content; None if it is missing."""
+    full_path = Path(cwd or ".") / path
+    try:
+        if hash_contents:
+            digest = hashlib.sha256()
+            with open(full_path, "rb") as f:
+                for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
+        stat = full_path.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+class ResultCache:
+    """On-disk cache of command results, keyed by everything that can change them.
+
+    The key covers the command, the shell flag, the working directory, the
+    input text, selected environment variables and the declared input
+    files (by mtime and size, or by content hash). Entries are JSON files;
+    when the directory grows past max_bytes, the least recently used
+    entries are deleted.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 100 * 1024 * 1024,
+        env_vars: Tuple[str, ...] = ("PATH",),
+        hash_inputs: bool = False,
+        cache_failures: bool = False
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: Directory for cache entries
+            max_bytes: Total size of entries to keep
+            env_vars: Environment variables included in every key
+            hash_inputs: Hash input file contents instead of using mtime and size
+            cache_failures: Also cache results with a non-zero return code
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.env_vars = tuple(env_vars)
+        self.hash_inputs = hash_inputs
+        self.cache_failures = cache_failures
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.directory.glob("*.json"))
+
+    def make_key(
+        self,
+        command: Union[str, List[str]],
+        shell: bool,
+        cwd: Optional[str],
+        env: Dict[str, str],
+        input_text: Optional[str] = None,
+        inputs: Optional[List[Union[str, Path]]] = None,
+        env_vars: Optional[List[str]] = None
+    ) -> str:
+        """Build the cache key for a command.
+
+        Args:
+            command: Command to run
+            shell: Whether it runs through the shell
+            cwd: Working directory
+            env: Environment it runs with
+            input_text: Input sent to the command
+            inputs: Files the command reads
+            env_vars: Environment variables to include besides the cache's own
+
+        Returns:
+            str: Hex SHA-256 key
+        """
+        names = sorted(set(self.env_vars) | set(env_vars or ()))
+        material = {
+            "command": command,
+            "shell": shell,
+            "cwd": os.path.abspath(cwd or "."),
+            "env": {name: env.get(name) for name in names},
+            "input": hashlib.sha256(input_text.encode()).hexdigest() if input_text is not None else None,
+            "inputs": {str(path): _file_fingerprint(path, cwd, self.hash_inputs) for path in inputs or ()},
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CommandResult]:
+        """Get a cached result.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Optional[CommandResult]: The cached result marked cached=True, or None
+        """
+        path = self.directory / f"{key}.json"
+        try:
+            data = json.loads(path.read_text())
+            # The mtime tracks recency for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        now = datetime.utcnow()
+        return CommandResult(
+            returncode=data["returncode"],
+            stdout=data["stdout"],
+            stderr=data["stderr"],
+            start_time=now,
+            end_time=now,
+            command=data["command"],
+            cached=True
+        )
+
+    def put(self, key: str, result: CommandResult) -> bool:
+        """Store a result.
+
+        Args:
+            key: Key from make_key
+            result: Result to store
+
+        Returns:
+            bool: Whether it was stored (timeouts and, by default, failures are not)
+        """
+        if result.timed_out or (result.returncode != 0 and not self.cache_failures):
+            return False
+        data = json.dumps({
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "command": result.command,
+        }).encode()
+        if len(data) > self.max_bytes:
+            return False
+        path = self.directory / f"{key}.json"
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(temp_path, path)
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+        return True
+
+    def _evict(self) -> None:
+        # Caller holds the lock; delete least recently used entries
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self._size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Delete all entries and reset the statistics."""
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+            self._size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, hit rate, evictions, entries and bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(list(self.directory.glob("*.json"))),
+                "bytes": self._size,
+            }
 
 
 class ShellExecutor:
@@ -39,7 +840,9 @@ class ShellExecutor:
         shell: bool = True,
         timeout: Optional[int] = None,
         env: Optional[Dict[str, str]] = None,
-        cwd: Optional[Union[str, Path]] = None
+        cwd: Optional[Union[str, Path]] = None,
+        sample_interval: Optional[float] = None,
+        result_cache: Optional[ResultCache] = None
     ):
         """Initialize the shell executor.
 
@@ -48,11 +851,16 @@ class ShellExecutor:
             timeout: Command timeout in seconds
             env: Environment variables to use
             cwd: Working directory for commands
+            sample_interval: Seconds between psutil samples of each command's
+                process tree (peak RSS and process count); None disables sampling
+            result_cache: Cache used by run(..., cache=True)
         """
         self.shell = shell
         self.timeout = timeout
         self.env = env or os.environ.copy()
         self.cwd = str(cwd) if cwd else None
+        self.sample_interval = sample_interval
+        self.result_cache = result_cache
         self._processes: Dict[int, subprocess.Popen] = {}
 
     def run(
@@ -60,15 +868,39 @@ class ShellExecutor:
         command: Union[str, List[str]],
         input_text: Optional[str] = None,
         capture_output: bool = True,
-        check: bool = False
+        check: bool = False,
+        timeout: Optional[float] = None,
+        on_stdout: Optional[OutputCallback] = None,
+        on_stderr: Optional[OutputCallback] = None,
+        tail_size: Optional[int] = None,
+        cache: bool = False,
+        inputs: Optional[List[Union[str, Path]]] = None,
+        env_vars: Optional[List[str]] = None
     ) -> CommandResult:
         """Run a command and return the result.
 
+        Passing a callback or tail_size streams the output instead of
+        buffering it: callbacks get each line as it arrives and the result
+        only keeps the last tail_size characters of each stream.
+
+        With cache=True and a result_cache, an identical earlier run (same
+        command, cwd, input, environment variables and input files) is
+        returned instead of running the command again. Streamed runs can
+        use cached results but are not stored, since their output is
+        truncated.
+
         Args:
             command: Command to run (string or list of arguments)
             input_text: Input to send to the command
             capture_output: Whether to capture stdout and stderr
             check: Whether to raise an exception on non-zero return code
+            timeout: Timeout in seconds, overriding the executor timeout
+            on_stdout: Called with each stdout line
+            on_stderr: Called with each stderr line
+            tail_size: Characters of output kept per stream when streaming
+            cache: Whether to use the result cache for this command
+            inputs: Files the command reads, part of the cache key
+            env_vars: Environment variables that affect the command, part of the cache key
 
         Returns:
             CommandResult: Command execution result
@@ -77,127 +909,366 @@ class ShellExecutor:
             subprocess.SubprocessError: If command execution fails
             subprocess.TimeoutExpired: If command times out
         """
-        start_time = datetime.utcnow()
-        try:
-            logger.info(f"Running command: {command}")
-            process = subprocess.Popen(
+        key = None
+        if cache and self.result_cache is not None and capture_output:
+            key = self.result_cache.make_key(
+                command, self.shell, self.cwd, self.env, input_text, inputs, env_vars
+            )
+            result = self.result_cache.get(key)
+            if result is not None:
+                logger.info(f"Using cached result for: {command}")
+                if check and result.returncode != 0:
+                    raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+                return result
+
+        streamed = capture_output and (on_stdout or on_stderr or tail_size is not None)
+        if streamed:
+            result = self.stream(
+                command,
+                input_text=input_text,
+                timeout=timeout,
+                tail_size=tail_size if tail_size is not None else DEFAULT_TAIL_BYTES,
+                on_stdout=on_stdout,
+                on_stderr=on_stderr
+            ).result
+        else:
+            result = self._execute(command, input_text, capture_output, timeout)
+        # Streamed results only keep the tail of the output
+        if key is not None and not streamed:
+            self.result_cache.put(key, result)
+        if result.timed_out:
+            logger.error(f"Command timed out: {command}")
+            raise subprocess.TimeoutExpired(command, timeout or self.timeout, result.stdout, result.stderr)
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode,
                 command,
-                shell=self.shell,
-                timeout=self.timeout,
-                env=self.env,
-                cwd=self.cwd,
-                input=input_text.encode() if input_text else None,
-                capture_output=capture_output,
-                text=True
+                result.stdout,
+                result.stderr
             )
-            self._processes[process.pid] = process
+        return result
 
-            stdout, stderr = process.communicate()
-            end_time = datetime.utcnow()
+    def _execute(
+        self,
+        command: Union[str, List[str]],
+        input_text: Optional[str] = None,
+        capture_output: bool = True,
+        timeout: Optional[float] = None,
+        on_start: Optional[Callable[[subprocess.Popen], None]] = None
+    ) -> CommandResult:
+        """Run a command, killing it and marking the result on timeout."""
+        timeout = timeout if timeout is not None else self.timeout
+        pipe = subprocess.PIPE if capture_output else None
+        start_time = datetime.utcnow()
+        logger.info(f"Running command: {command}")
+        process = subprocess.Popen(
+            command,
+            shell=self.shell,
+            env=self.env,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE if input_text is not None else None,
+            stdout=pipe,
+            stderr=pipe,
+            # Own process group, so a timeout also kills the shell's children
+            start_new_session=os.name == "posix"
+        )
+        self._processes[process.pid] = process
+        if on_start:
+            on_start(process)
 
-            result = CommandResult(
-                returncode=process.returncode,
-                stdout=stdout,
-                stderr=stderr,
-                start_time=start_time,
-                end_time=end_time,
-                pid=process.pid
-            )
+        encoding = locale.getpreferredencoding(False)
+        # Read with CommandStream rather than communicate(), so the child is
+        # reaped with os.wait4 and its resource usage recorded
+        result = CommandStream(
+            process,
+            command,
+            input_data=input_text.encode(encoding) if input_text is not None else None,
+            timeout=timeout,
+            binary=True,
+            tail_size=None,
+            sample_interval=self.sample_interval,
+            start_time=start_time,
+            on_exit=lambda process: self._processes.pop(process.pid, None)
+        ).result
+        result.stdout = _decode_text(result.stdout, encoding)
+        result.stderr = _decode_text(result.stderr, encoding)
+        return result
 
-            if check and result.returncode != 0:
-                raise subprocess.CalledProcessError(
-                    result.returncode,
-                    command,
-                    stdout,
-                    stderr
-                )
+    def stream(
+        self,
+        command: Union[str, List[str]],
+        input_text: Optional[Union[str, bytes]] = None,
+        timeout: Optional[float] = None,
+        binary: bool = False,
+        tail_size: int = DEFAULT_TAIL_BYTES,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        on_stdout: Optional[OutputCallback] = None,
+        on_stderr: Optional[OutputCallback] = None
+    ) -> CommandStream:
+        """Start a command and stream its output as it arrives.
+
+        Args:
+            command: Command to run (string or list of arguments)
+            input_text: Input to send to the command
+            timeout: Timeout in seconds, overriding the executor timeout
+            binary: Yield raw byte chunks instead of decoded lines
+            tail_size: Output kept per stream for the final result
+            chunk_size: Maximum bytes read at a time
+            on_stdout: Called with each stdout line or chunk
+            on_stderr: Called with each stderr line or chunk
+
+        Returns:
+            CommandStream: Iterable of OutputChunk; its result property
+                waits for the command to finish
+        """
+        start_time = datetime.utcnow()
+        logger.info(f"Streaming command: {command}")
+        process = subprocess.Popen(
+            command,
+            shell=self.shell,
+            env=self.env,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE if input_text is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=os.name == "posix"
+        )
+        self._processes[process.pid] = process
+        if isinstance(input_text, str):
+            input_text = input_text.encode(locale.getpreferredencoding(False))
+        return CommandStream(
+            process,
+            command,
+            input_data=input_text,
+            timeout=timeout if timeout is not None else self.timeout,
+            binary=binary,
+            tail_size=tail_size,
+            chunk_size=chunk_size,
+            on_stdout=on_stdout,
+            on_stderr=on_stderr,
+            on_exit=lambda process: self._processes.pop(process.pid, None),
+            sample_interval=self.sample_interval,
+            start_time=start_time
+        )
+
+    def session(self, shell_path: Optional[str] = None) -> "ShellSession":
+        """Create a persistent shell session with this executor's settings.
 
+        Args:
+            shell_path: Shell to run (default: bash, falling back to /bin/sh)
+
+        Returns:
+            ShellSession: Session running commands in one long-lived shell
+        """
+        return ShellSession(shell_path, env=dict(self.env), cwd=self.cwd, timeout=self.timeout)
+
+    def run_many(
+        self,
+        commands: List[Union[str, List[str]]],
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        fail_fast: bool = False,
+        stats: Optional[BatchStats] = None
+    ) -> Iterator[CommandResult]:
+        """Run independent commands in parallel, yielding results as they complete.
+
+        Args:
+            commands: Commands to run
+            max_workers: Maximum commands running at once (default: CPU count)
+            timeout: Per-command timeout in seconds (default: executor timeout)
+            fail_fast: Stop at the first failure, cancelling queued commands
+                and killing running ones; otherwise keep going
+            stats: BatchStats to fill in with aggregate timings
+
+        Yields:
+            CommandResult: Results in completion order; commands that
+                cannot be started fail with return code 127
+
+        Raises:
+            subprocess.CalledProcessError: In fail-fast mode, for the first failure
+            subprocess.TimeoutExpired: In fail-fast mode, for the first timeout
+        """
+        stats = stats if stats is not None else BatchStats()
+        stats.total += len(commands)
+        running: Dict[int, subprocess.Popen] = {}
+        running_lock = threading.Lock()
+
+        def track(process: subprocess.Popen) -> None:
+            with running_lock:
+                running[process.pid] = process
+
+        def execute(command: Union[str, List[str]]) -> CommandResult:
+            start_time = datetime.utcnow()
+            try:
+                result = self._execute(command, timeout=timeout, on_start=track)
+            except OSError as e:
+                # E.g. a missing program with shell=False
+                return _spawn_failure(command, e, start_time)
+            with running_lock:
+                running.pop(result.pid, None)
             return result
 
-        except subprocess.SubprocessError as e:
-            logger.error(f"Command failed: {e}")
-            raise
+        wall_start = time.perf_counter()
+        cpu_start = os.times()
+        pool = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count())
+        pending = {pool.submit(execute, command) for command in commands}
+        failure: Optional[CommandResult] = None
+        try:
+            while pending and failure is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    stats.record(result)
+                    if fail_fast and not result.succeeded and failure is None:
+                        failure = result
+                    yield result
         finally:
-            if process.pid in self._processes:
-                del self._processes[process.pid]
+            # Runs on fail-fast, on errors and when the caller stops iterating
+            for future in pending:
+                if future.cancel():
+                    stats.cancelled += 1
+            with running_lock:
+                for process in running.values():
+                    _kill_group(process)
+            pool.shutdown(wait=True)
+            cpu_end = os.times()
+            stats.wall_time += time.perf_counter() - wall_start
+            stats.cpu_user += cpu_end.children_user - cpu_start.children_user
+            stats.cpu_system += cpu_end.children_system - cpu_start.children_system
+
+        if failure is not None:
+            if failure.timed_out:
+                raise subprocess.TimeoutExpired(
+                    failure.command, timeout or self.timeout, failure.stdout, failure.stderr
+                )
+            raise subprocess.CalledProcessError(
+                failure.returncode, failure.command, failure.stdout, failure.stderr
+            )
 
     def run_with_pipe(
         self,
-        commands: List[Union[str, List[str]]]
+        commands: List[Union[str, List[str]]],
+        binary: bool = False,
+        input_file: Optional[Union[str, Path]] = None,
+        output_file: Optional[Union[str, Path]] = None,
+        max_output: Optional[int] = None
     ) -> CommandResult:
         """Run multiple commands in a pipe.
 
+        Stages are connected directly with OS pipes, and input_file and
+        output_file are handed to the first and last stage as file
+        descriptors, so that data never passes through Python. In binary
+        mode nothing is decoded and only the first max_output bytes of the
+        final stage are captured; the rest is drained with os.splice and
+        counted in the result's dropped_bytes.
+
         Args:
             commands: List of commands to pipe together
+            binary: Capture the final output as bytes instead of text
+            input_file: File to feed to the first command
+            output_file: File the last command writes to instead of being captured
+            max_output: Bytes of final output to capture, the rest being counted
+                in dropped_bytes (binary default: 1 MiB,
+                text default: unlimited)
 
         Returns:
             CommandResult: Result of the last command
 
         Raises:
             subprocess.SubprocessError: If any command fails
+            subprocess.TimeoutExpired: If the pipe times out
         """
         if not commands:
             raise ValueError("No commands provided")
+        if binary and max_output is None:
+            max_output = DEFAULT_TAIL_BYTES
 
         start_time = datetime.utcnow()
-        processes = []
+        processes: List[subprocess.Popen] = []
+        stdin_file = open(input_file, "rb") if input_file is not None else None
+        stdout_file = open(output_file, "wb") if output_file is not None else None
+        timed_out = threading.Event()
+        timer = None
         try:
-            # Run first command
-            first_cmd = commands[0]
-            logger.info(f"Starting pipe with command: {first_cmd}")
-            process = subprocess.Popen(
-                first_cmd,
-                shell=self.shell,
-                env=self.env,
-                cwd=self.cwd,
-                stdout=subprocess.PIPE,
-                text=True
-            )
-            processes.append(process)
-            self._processes[process.pid] = process
-
-            # Pipe remaining commands
-            for cmd in commands[1:]:
-                logger.info(f"Piping to command: {cmd}")
+            stdin = stdin_file
+            for index, cmd in enumerate(commands):
+                last = index == len(commands) - 1
+                logger.info(f"Piping to command: {cmd}" if index else f"Starting pipe with command: {cmd}")
                 process = subprocess.Popen(
                     cmd,
                     shell=self.shell,
                     env=self.env,
                     cwd=self.cwd,
-                    stdin=processes[-1].stdout,
-                    stdout=subprocess.PIPE,
-                    text=True
+                    stdin=stdin,
+                    stdout=stdout_file if last and stdout_file else subprocess.PIPE,
+                    text=not binary,
+                    start_new_session=os.name == "posix"
                 )
                 processes.append(process)
                 self._processes[process.pid] = process
-                processes[-2].stdout.close()
+                if index:
+                    # Only the next stage should hold the read end
+                    processes[-2].stdout.close()
+                stdin = process.stdout
 
-            # Get output from last command
-            stdout, stderr = processes[-1].communicate(timeout=self.timeout)
-            returncode = processes[-1].returncode
-            end_time = datetime.utcnow()
+            if self.timeout is not None:
+                timer = threading.Timer(self.timeout, self._kill_pipe, (processes, timed_out))
+                timer.daemon = True
+                timer.start()
+
+            final = processes[-1]
+            stderr = None
+            empty = b"" if binary else ""
+            dropped = 0
+            if stdout_file is not None:
+                stdout = empty
+            elif max_output is None:
+                stdout, stderr = final.communicate()
+            else:
+                head, dropped = _read_head(final.stdout.fileno(), max_output)
+                stdout = head if binary else _decode_text(head, locale.getpreferredencoding(False))
+            final.wait()
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(commands, self.timeout, stdout, stderr)
 
             return CommandResult(
-                returncode=returncode,
+                returncode=final.returncode,
                 stdout=stdout,
                 stderr=stderr,
                 start_time=start_time,
-                end_time=end_time,
-                pid=processes[-1].pid
+                end_time=datetime.utcnow(),
+                pid=final.pid,
+                command=commands,
+                dropped_bytes=dropped
             )
 
         except subprocess.SubprocessError as e:
             logger.error(f"Pipe failed: {e}")
             raise
         finally:
+            if timer is not None:
+                timer.cancel()
             # Clean up processes
             for process in processes:
-                try:
-                    if process.pid in self._processes:
-                        del self._processes[process.pid]
-                    process.terminate()
-                except ProcessLookupError:
-                    pass
+                self._processes.pop(process.pid, None)
+                if process.poll() is None:
+                    try:
+                        process.terminate()
+                    except ProcessLookupError:
+                        pass
+                if process.stdout is not None:
+                    process.stdout.close()
+                process.wait()
+            for f in (stdin_file, stdout_file):
+                if f is not None:
+                    f.close()
+
+    @staticmethod
+    def _kill_pipe(processes: List[subprocess.Popen], timed_out: threading.Event) -> None:
+        """Kill every stage of a pipe that ran past its timeout."""
+        timed_out.set()
+        for process in processes:
+            _kill_group(process)
 
     def run_background(
         self,
@@ -283,6 +1354,875 @@ class ShellExecutor:
             self.kill_process(pid, force=True)
 
 
+class ShellSession:
+    """Long-lived shell process that runs commands without a fork/exec of
+    a new shell each time.
+
+    Commands are written to the shell's stdin and evaluated in the current
+    shell, so `cd` and `export` carry over to later commands. After each
+    command the shell prints a random sentinel with the exit status and
+    working directory on stdout (and the sentinel on stderr), which marks
+    where the command's output ends.
+
+    If the shell dies (for example on `exit`) or a command times out, the
+    shell is killed and a fresh one is started for the next command in the
+    last known working directory. Shell variables and exports are lost.
+    """
+
+    def __init__(
+        self,
+        shell_path: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[Union[str, Path]] = None,
+        timeout: Optional[float] = None
+    ):
+        """Initialize the session; the shell starts with the first command.
+
+        Args:
+            shell_path: Shell to run (default: bash, falling back to /bin/sh)
+            env: Environment variables for the shell
+            cwd: Initial working directory
+            timeout: Default command timeout in seconds
+        """
+        self.shell_path = shell_path or shutil.which("bash") or "/bin/sh"
+        self.env = env or os.environ.copy()
+        self.cwd = str(cwd) if cwd else os.getcwd()
+        self.timeout = timeout
+        self.commands = 0
+        self.restarts = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._started = False
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        """Whether the shell process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the shell process."""
+        return self._process.pid if self._process else None
+
+    def start(self) -> None:
+        """Start the shell if it is not running."""
+        if self.alive:
+            return
+        self._stop()
+        if self._started:
+            self.restarts += 1
+            logger.warning(f"Restarting shell session in {self.cwd}")
+        self._started = True
+        args = [self.shell_path]
+        if os.path.basename(self.shell_path) == "bash":
+            args += ["--noprofile", "--norc"]
+        self._process = subprocess.Popen(
+            args,
+            env=self.env,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=os.name == "posix"
+        )
+        for pipe in (self._process.stdout, self._process.stderr):
+            os.set_blocking(pipe.fileno(), False)
+
+    def run(
+        self,
+        command: str,
+        timeout: Optional[float] = None,
+        check: bool = False
+    ) -> CommandResult:
+        """Run a command in the session.
+
+        Args:
+            command: Shell command line
+            timeout: Timeout in seconds, overriding the session timeout
+            check: Whether to raise an exception on non-zero return code
+
+        Returns:
+            CommandResult: Command execution result; pid is the shell's PID
+
+        Raises:
+            subprocess.CalledProcessError: If check is set and the command fails
+            subprocess.TimeoutExpired: If command times out (the shell is restarted)
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        with self._lock:
+            self.start()
+            self.commands += 1
+            start_time = datetime.utcnow()
+            token = f"__session_{uuid.uuid4().hex}__"
+            # stdin is redirected so the command cannot swallow the protocol
+            script = (
+                f"eval {shlex.quote(command)} </dev/null; __session_rc=$?; "
+                f"printf '\\n%s %d %s\\n' {token} \"$__session_rc\" \"$PWD\"; "
+                f"printf '\\n%s\\n' {token} >&2\n"
+            )
+            process = self._process
+            try:
+                process.stdin.write(script.encode())
+                process.stdin.flush()
+            except BrokenPipeError:
+                pass
+            stdout, stderr, status, timed_out = self._read_until(token.encode(), timeout)
+
+            if status is not None:
+                returncode, cwd = status
+                self.cwd = cwd
+            else:
+                # The shell exited or was killed; the next command restarts it
+                if not timed_out:
+                    logger.warning(f"Shell session exited while running: {command}")
+                self._stop()
+                returncode = process.returncode
+
+        encoding = locale.getpreferredencoding(False)
+        result = CommandResult(
+            returncode=returncode,
+            stdout=stdout.decode(encoding, errors="replace"),
+            stderr=stderr.decode(encoding, errors="replace"),
+            start_time=start_time,
+            end_time=datetime.utcnow(),
+            pid=process.pid,
+            command=command,
+            timed_out=timed_out
+        )
+        if timed_out:
+            raise subprocess.TimeoutExpired(command, timeout, result.stdout, result.stderr)
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+        return result
+
+    def _read_until(
+        self,
+        token: bytes,
+        timeout: Optional[float]
+    ) -> Tuple[bytes, bytes, Optional[Tuple[int, str]], bool]:
+        """Read stdout and stderr up to the sentinel lines."""
+        process = self._process
+        stdout_marker = b"\n" + token + b" "
+        stderr_marker = b"\n" + token + b"\n"
+        buffers = {"stdout": bytearray(), "stderr": bytearray()}
+        found = {"stdout": -1, "stderr": -1}
+        scanned = {"stdout": 0, "stderr": 0}
+        status: Optional[Tuple[int, str]] = None
+        stderr_done = False
+
+        def find(name: str, marker: bytes) -> int:
+            # Only search new data, overlapping a marker split across reads
+            buffer = buffers[name]
+            if found[name] == -1:
+                found[name] = buffer.find(marker, scanned[name])
+                scanned[name] = max(len(buffer) - len(marker) + 1, 0)
+            return found[name]
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, "stdout")
+        selector.register(process.stderr, selectors.EVENT_READ, "stderr")
+        try:
+            while status is None or not stderr_done:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    _kill_group(process)
+                    process.wait()
+                    return bytes(buffers["stdout"]), bytes(buffers["stderr"]), None, True
+                events = selector.select(remaining)
+                for key, _ in events:
+                    data = os.read(key.fd, STREAM_CHUNK_SIZE)
+                    if not data:
+                        # EOF: the shell is gone
+                        process.wait()
+                        return bytes(buffers["stdout"]), bytes(buffers["stderr"]), None, False
+                    buffers[key.data] += data
+
+                if status is None:
+                    index = find("stdout", stdout_marker)
+                    if index != -1 and buffers["stdout"].endswith(b"\n"):
+                        line = bytes(buffers["stdout"][index + len(stdout_marker):-1])
+                        returncode, _, cwd = line.decode().partition(" ")
+                        status = (int(returncode), cwd)
+                        del buffers["stdout"][index:]
+                if not stderr_done:
+                    index = find("stderr", stderr_marker)
+                    if index != -1:
+                        stderr_done = True
+                        del buffers["stderr"][index:]
+        finally:
+            selector.close()
+        return bytes(buffers["stdout"]), bytes(buffers["stderr"]), status, False
+
+    def _stop(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            _kill_group(process)
+        for pipe in (process.stdin, process.stdout, process.stderr):
+            try:
+                pipe.close()
+            except BrokenPipeError:
+                pass
+        process.wait()
+
+    def close(self) -> None:
+        """Stop the shell process."""
+        with self._lock:
+            self._stop()
+
+    def __enter__(self) -> "ShellSession":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncShellExecutor:
+    """Shell executor running commands as asyncio subprocesses.
+
+    Mirrors ShellExecutor, but every method is a coroutine, so thousands of
+    child processes can be supervised from one event loop instead of one
+    thread each.
+    """
+
+    def __init__(
+        self,
+        shell: bool = True,
+        timeout: Optional[float] = None,
+        env: Optional[Dict[str, str]] = None,
+        cwd: Optional[Union[str, Path]] = None
+    ):
+        """Initialize the async shell executor.
+
+        Args:
+            shell: Whether to run commands through the shell
+            timeout: Command timeout in seconds
+            env: Environment variables to use
+            cwd: Working directory for commands
+        """
+        self.shell = shell
+        self.timeout = timeout
+        self.env = env or os.environ.copy()
+        self.cwd = str(cwd) if cwd else None
+        self._processes: Dict[int, asyncio.subprocess.Process] = {}
+
+    async def _spawn(self, command: Union[str, List[str]], **kwargs) -> asyncio.subprocess.Process:
+        """Start a command in its own process group."""
+        kwargs.update(env=self.env, cwd=self.cwd, start_new_session=os.name == "posix")
+        if self.shell:
+            if not isinstance(command, str):
+                command = shlex.join(command)
+            process = await asyncio.create_subprocess_shell(command, **kwargs)
+        else:
+            args = [command] if isinstance(command, str) else command
+            process = await asyncio.create_subprocess_exec(*args, **kwargs)
+        self._processes[process.pid] = process
+        return process
+
+    async def _communicate(
+        self,
+        process: asyncio.subprocess.Process,
+        input_data: Optional[bytes],
+        timeout: Optional[float]
+    ) -> Tuple[bytes, bytes, bool]:
+        """Wait for a process, killing its group on timeout but keeping partial output."""
+        task = asyncio.ensure_future(process.communicate(input_data))
+        try:
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            timed_out = not done
+            if timed_out:
+                _kill_group(process)
+            stdout, stderr = await task
+        except asyncio.CancelledError:
+            _kill_group(process)
+            raise
+        finally:
+            self._processes.pop(process.pid, None)
+        return stdout or b"", stderr or b"", timed_out
+
+    async def run(
+        self,
+        command: Union[str, List[str]],
+        input_text: Optional[str] = None,
+        capture_output: bool = True,
+        check: bool = False,
+        timeout: Optional[float] = None
+    ) -> CommandResult:
+        """Run a command and return the result.
+
+        Args:
+            command: Command to run (string or list of arguments)
+            input_text: Input to send to the command
+            capture_output: Whether to capture stdout and stderr
+            check: Whether to raise an exception on non-zero return code
+            timeout: Timeout in seconds, overriding the executor timeout
+
+        Returns:
+            CommandResult: Command execution result
+
+        Raises:
+            subprocess.CalledProcessError: If check is set and the command fails
+            subprocess.TimeoutExpired: If command times out
+        """
+        result = await self._execute(command, input_text, capture_output, timeout)
+        if result.timed_out:
+            logger.error(f"Command timed out: {command}")
+            raise subprocess.TimeoutExpired(command, timeout or self.timeout, result.stdout, result.stderr)
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+        return result
+
+    async def _execute(
+        self,
+        command: Union[str, List[str]],
+        input_text: Optional[str] = None,
+        capture_output: bool = True,
+        timeout: Optional[float] = None
+    ) -> CommandResult:
+        timeout = timeout if timeout is not None else self.timeout
+        pipe = asyncio.subprocess.PIPE if capture_output else None
+        start_time = datetime.utcnow()
+        logger.info(f"Running command: {command}")
+        process = await self._spawn(
+            command,
+            stdin=asyncio.subprocess.PIPE if input_text is not None else None,
+            stdout=pipe,
+            stderr=pipe
+        )
+        # Decode like ShellExecutor, so both return the same text
+        encoding = locale.getpreferredencoding(False)
+        stdout, stderr, timed_out = await self._communicate(
+            process, input_text.encode(encoding) if input_text is not None else None, timeout
+        )
+        return CommandResult(
+            returncode=process.returncode,
+            stdout=_decode_text(stdout, encoding),
+            stderr=_decode_text(stderr, encoding),
+            start_time=start_time,
+            end_time=datetime.utcnow(),
+            pid=process.pid,
+            command=command,
+            timed_out=timed_out
+        )
+
+    async def run_many(
+        self,
+        commands: List[Union[str, List[str]]],
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        fail_fast: bool = False,
+        stats: Optional[BatchStats] = None
+    ) -> AsyncIterator[CommandResult]:
+        """Run independent commands concurrently, yielding results as they complete.
+
+        Args:
+            commands: Commands to run
+            max_concurrency: Maximum commands running at once (default: unlimited)
+            timeout: Per-command timeout in seconds (default: executor timeout)
+            fail_fast: Stop at the first failure, killing the other commands;
+                otherwise keep going
+            stats: BatchStats to fill in with aggregate timings
+
+        Yields:
+            CommandResult: Results in completion order; commands that
+                cannot be started fail with return code 127
+
+        Raises:
+            subprocess.CalledProcessError: In fail-fast mode, for the first failure
+            subprocess.TimeoutExpired: In fail-fast mode, for the first timeout
+        """
+        stats = stats if stats is not None else BatchStats()
+        stats.total += len(commands)
+        semaphore = asyncio.Semaphore(max_concurrency or len(commands) or 1)
+
+        async def execute(command: Union[str, List[str]]) -> CommandResult:
+            async with semaphore:
+                start_time = datetime.utcnow()
+                try:
+                    return await self._execute(command, timeout=timeout)
+                except OSError as e:
+                    return _spawn_failure(command, e, start_time)
+
+        wall_start = time.perf_counter()
+        cpu_start = os.times()
+        pending = {asyncio.ensure_future(execute(command)) for command in commands}
+        failure: Optional[CommandResult] = None
+        try:
+            while pending and failure is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    stats.record(result)
+                    if fail_fast and not result.succeeded and failure is None:
+                        failure = result
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+                stats.cancelled += len(pending)
+            cpu_end = os.times()
+            stats.wall_time += time.perf_counter() - wall_start
+            stats.cpu_user += cpu_end.children_user - cpu_start.children_user
+            stats.cpu_system += cpu_end.children_system - cpu_start.children_system
+
+        if failure is not None:
+            if failure.timed_out:
+                raise subprocess.TimeoutExpired(
+                    failure.command, timeout or self.timeout, failure.stdout, failure.stderr
+                )
+            raise subprocess.CalledProcessError(
+                failure.returncode, failure.command, failure.stdout, failure.stderr
+            )
+
+    async def run_with_pipe(
+        self,
+        commands: List[Union[str, List[str]]]
+    ) -> CommandResult:
+        """Run multiple commands in a pipe.
+
+        Stages are connected with OS pipes, so data flows between them
+        without passing through the event loop. As with
+        ShellExecutor.run_with_pipe, stderr is not captured.
+
+        Args:
+            commands: List of commands to pipe together
+
+        Returns:
+            CommandResult: Result of the last command, with the whole
+                pipeline as its command
+
+        Raises:
+            subprocess.TimeoutExpired: If the pipe times out
+        """
+        if not commands:
+            raise ValueError("No commands provided")
+
+        start_time = datetime.utcnow()
+        processes: List[asyncio.subprocess.Process] = []
+        read_fd = None
+        try:
+            for index, cmd in enumerate(commands):
+                logger.info(f"Piping to command: {cmd}" if index else f"Starting pipe with command: {cmd}")
+                last = index == len(commands) - 1
+                next_read_fd, write_fd = (None, None) if last else os.pipe()
+                try:
+                    process = await self._spawn(
+                        cmd,
+                        stdin=read_fd,
+                        stdout=asyncio.subprocess.PIPE if last else write_fd
+                    )
+                finally:
+                    # The children hold their own copies of the pipe ends
+                    if read_fd is not None:
+                        os.close(read_fd)
+                    if write_fd is not None:
+                        os.close(write_fd)
+                    read_fd = next_read_fd
+                processes.append(process)
+
+            stdout, _, timed_out = await self._communicate(processes[-1], None, self.timeout)
+            if timed_out:
+                raise subprocess.TimeoutExpired(commands, self.timeout, stdout, None)
+            for process in processes[:-1]:
+                await process.wait()
+            return CommandResult(
+                returncode=processes[-1].returncode,
+                stdout=_decode_text(stdout, locale.getpreferredencoding(False)),
+                stderr=None,
+                start_time=start_time,
+                end_time=datetime.utcnow(),
+                pid=processes[-1].pid,
+                command=commands
+            )
+        finally:
+            if read_fd is not None:
+                os.close(read_fd)
+            for process in processes:
+                self._processes.pop(process.pid, None)
+                if process.returncode is None:
+                    _kill_group(process)
+                    await process.wait()
+
+    async def run_background(
+        self,
+        command: Union[str, List[str]],
+        output_file: Optional[str] = None
+    ) -> int:
+        """Run a command in the background.
+
+        Args:
+            command: Command to run
+            output_file: File to redirect output to
+
+        Returns:
+            int: Process ID
+        """
+        logger.info(f"Running background command: {command}")
+        with open(output_file, 'w') if output_file else open(os.devnull, 'w') as f:
+            process = await self._spawn(command, stdout=f, stderr=subprocess.STDOUT)
+        return process.pid
+
+    async def wait(self, pid: int) -> Optional[int]:
+        """Wait for a background process to exit.
+
+        Args:
+            pid: Process ID
+
+        Returns:
+            Optional[int]: Return code, or None if the process is unknown
+        """
+        process = self._processes.get(pid)
+        if process is None:
+            return None
+        returncode = await process.wait()
+        self._processes.pop(pid, None)
+        return returncode
+
+    async def kill_process(self, pid: int, force: bool = False) -> None:
+        """Kill a running process and wait for it to exit.
+
+        Args:
+            pid: Process ID
+            force: Whether to force kill the process
+        """
+        process = self._processes.pop(pid, None)
+        if process is None or process.returncode is not None:
+            return
+        try:
+            if force:
+                process.kill()
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            logger.warning(f"Process {pid} not found")
+        await process.wait()
+        logger.info(f"Process {pid} terminated")
+
+    async def cleanup(self) -> None:
+        """Clean up all running processes."""
+        for pid in list(self._processes.keys()):
+            await self.kill_process(pid, force=True)
+
+
+@dataclass
+class Task:
+    """A command in a TaskGraph."""
+    name: str
+    command: Union[str, List[str]]
+    deps: List[str] = field(default_factory=list)
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+
+
+@dataclass
+class TaskOutcome:
+    """What happened to one task in a TaskGraph run.
+
+    status is "succeeded", "failed", "skipped" (inputs unchanged since the
+    last successful run) or "blocked" (a dependency did not succeed).
+    start and end are seconds since the start of the run.
+    """
+    task: Task
+    status: str
+    result: Optional[CommandResult] = None
+    start: float = 0.0
+    end: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        """Get the time the task took in seconds."""
+        return self.end - self.start
+
+
+@dataclass
+class GraphRun:
+    """Outcomes of a TaskGraph run, with a critical path report."""
+    outcomes: Dict[str, TaskOutcome]
+    wall_time: float
+
+    @property
+    def succeeded(self) -> bool:
+        """Check whether every task succeeded or was skipped."""
+        return all(outcome.status in ("succeeded", "skipped") for outcome in self.outcomes.values())
+
+    @property
+    def task_time(self) -> float:
+        """Get the summed duration of all tasks."""
+        return sum(outcome.duration for outcome in self.outcomes.values())
+
+    def critical_path(self) -> List[TaskOutcome]:
+        """Get the chain of tasks that determined the wall time.
+
+        Starts from the task that finished last and walks back through the
+        dependency that finished last before it started, so the path shows
+        which waits actually held up the run.
+
+        Returns:
+            List[TaskOutcome]: Tasks on the critical path, first to last
+        """
+        ran = [outcome for outcome in self.outcomes.values() if outcome.status != "blocked"]
+        if not ran:
+            return []
+        current = max(ran, key=lambda outcome: outcome.end)
+        path = [current]
+        while current.task.deps:
+            current = max((self.outcomes[dep] for dep in current.task.deps), key=lambda outcome: outcome.end)
+            path.append(current)
+        return path[::-1]
+
+    def report(self) -> str:
+        """Format a timing report of the critical path.
+
+        Returns:
+            str: One line per critical task with its start, duration and
+                share of the wall time, followed by totals
+        """
+        lines = [f"{'Task':<24} {'Start':>8} {'Duration':>9} {'Share':>6}  Status"]
+        for outcome in self.critical_path():
+            share = outcome.duration / self.wall_time if self.wall_time else 0.0
+            lines.append(f"{outcome.task.name[:24]:<24} {outcome.start:7.2f}s {outcome.duration:8.2f}s "
+                         f"{share:6.0%}  {outcome.status}")
+        parallelism = self.task_time / self.wall_time if self.wall_time else 0.0
+        lines.append(f"Wall time {self.wall_time:.2f}s, task time {self.task_time:.2f}s, "
+                     f"parallelism {parallelism:.1f}")
+        return "\n".join(lines)
+
+
+class TaskGraph:
+    """Run commands in dependency order, in parallel where possible.
+
+    Tasks start as soon as all their dependencies have succeeded, up to
+    max_workers at a time. A task that declares inputs or outputs is
+    skipped when its command, inputs and dependencies are unchanged since
+    its last successful run and its outputs still exist; fingerprints of
+    successful runs are kept in state_file.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[ShellExecutor] = None,
+        max_workers: int = 4,
+        state_file: Optional[Union[str, Path]] = None,
+        hash_inputs: bool = False
+    ):
+        """Initialize the task graph.
+
+        Args:
+            executor: Executor running the commands, a shell executor by default
+            max_workers: Maximum number of tasks running at once
+            state_file: JSON file for fingerprints of successful runs, None disables skipping
+            hash_inputs: Fingerprint inputs by content instead of mtime and size
+        """
+        self.executor = executor or ShellExecutor(shell=True)
+        self.max_workers = max_workers
+        self.state_file = Path(state_file) if state_file else None
+        self.hash_inputs = hash_inputs
+        self.tasks: Dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        command: Union[str, List[str]],
+        deps: Optional[List[str]] = None,
+        inputs: Optional[List[str]] = None,
+        outputs: Optional[List[str]] = None,
+        timeout: Optional[float] = None
+    ) -> Task:
+        """Add a task.
+
+        Args:
+            name: Unique task name
+            command: Command to run
+            deps: Names of tasks that must succeed first
+            inputs: Files the command reads
+            outputs: Files the command writes
+            timeout: Command timeout in seconds, the executor's by default
+
+        Returns:
+            Task: The added task
+
+        Raises:
+            ValueError: If a task with this name already exists
+        """
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        task = Task(name, command, list(deps or []), list(inputs or []), list(outputs or []), timeout)
+        self.tasks[name] = task
+        return task
+
+    def order(self) -> List[str]:
+        """Get the task names in a valid execution order.
+
+        Returns:
+            List[str]: Every task after all of its dependencies
+
+        Raises:
+            ValueError: If a dependency is unknown or the tasks form a cycle
+        """
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task {task.name} depends on unknown task {dep}")
+        remaining = {name: len(set(task.deps)) for name, task in self.tasks.items()}
+        dependents = self._dependents()
+        ready = deque(name for name, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.tasks):
+            cycle = sorted(name for name in self.tasks if name not in order)
+            raise ValueError(f"Dependency cycle between tasks: {', '.join(cycle)}")
+        return order
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        dependents: Dict[str, List[str]] = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for dep in set(task.deps):
+                dependents[dep].append(task.name)
+        return dependents
+
+    def _fingerprint(self, task: Task, fingerprints: Dict[str, Optional[str]]) -> Optional[str]:
+        # Dependency fingerprints are included, so rerunning a dependency reruns its dependents
+        if not (task.inputs or task.outputs) or any(fingerprints.get(dep) is None for dep in task.deps):
+            return None
+        material = {
+            "command": task.command,
+            "cwd": os.path.abspath(self.executor.cwd or "."),
+            "inputs": {path: _file_fingerprint(path, self.executor.cwd, self.hash_inputs)
+                       for path in task.inputs},
+            "deps": {dep: fingerprints[dep] for dep in sorted(task.deps)},
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode()).hexdigest()
+
+    def _load_state(self) -> Dict[str, str]:
+        if not self.state_file or not self.state_file.exists():
+            return {}
+        try:
+            return json.loads(self.state_file.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable task state {self.state_file}: {e}")
+            return {}
+
+    def _save_state(self, state: Dict[str, str]) -> None:
+        if not self.state_file:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_file.with_name(self.state_file.name + ".tmp")
+        temp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+        os.replace(temp_path, self.state_file)
+
+    def _outputs_exist(self, task: Task) -> bool:
+        return all((Path(self.executor.cwd or ".") / path).exists() for path in task.outputs)
+
+    def run(self, fail_fast: bool = False, force: bool = False) -> GraphRun:
+        """Run the tasks.
+
+        A failed task blocks everything that depends on it; other tasks
+        keep running unless fail_fast is set.
+
+        Args:
+            fail_fast: Stop starting new tasks after the first failure
+            force: Run every task, even if its inputs are unchanged
+
+        Returns:
+            GraphRun: Outcome of every task and the timing report
+
+        Raises:
+            ValueError: If a dependency is unknown or the tasks form a cycle
+        """
+        order = self.order()
+        dependents = self._dependents()
+        remaining = {name: len(set(self.tasks[name].deps)) for name in order}
+        state = self._load_state()
+        # Fingerprints of tasks that succeeded in this run (None: ran without one)
+        fingerprints: Dict[str, Optional[str]] = {}
+        outcomes: Dict[str, TaskOutcome] = {}
+        ready = deque(name for name in order if remaining[name] == 0)
+        running: Dict[Future, Tuple[str, Optional[str], float]] = {}
+        failed = False
+        run_start = time.perf_counter()
+
+        def finish(name: str, outcome: TaskOutcome) -> None:
+            outcomes[name] = outcome
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        def block(name: str, now: float) -> None:
+            # Dependents of a task that did not succeed never run
+            stack = [name]
+            while stack:
+                for dependent in dependents[stack.pop()]:
+                    if dependent not in outcomes:
+                        outcomes[dependent] = TaskOutcome(self.tasks[dependent], "blocked", start=now, end=now)
+                        stack.append(dependent)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task") as pool:
+            while ready or running:
+                while ready and len(running) < self.max_workers and not (failed and fail_fast):
+                    name = ready.popleft()
+                    if name in outcomes:
+                        continue
+                    task = self.tasks[name]
+                    fingerprint = self._fingerprint(task, fingerprints)
+                    now = time.perf_counter() - run_start
+                    if (not force and fingerprint is not None and state.get(name) == fingerprint
+                            and self._outputs_exist(task)):
+                        logger.info(f"Skipping unchanged task: {name}")
+                        fingerprints[name] = fingerprint
+                        finish(name, TaskOutcome(task, "skipped", start=now, end=now))
+                        continue
+                    logger.info(f"Starting task: {name}")
+                    future = pool.submit(self.executor.run, task.command, timeout=task.timeout)
+                    running[future] = (name, fingerprint, now)
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                now = time.perf_counter() - run_start
+                for future in done:
+                    name, fingerprint, start = running.pop(future)
+                    task = self.tasks[name]
+                    try:
+                        result = future.result()
+                    except (OSError, subprocess.SubprocessError) as e:
+                        logger.error(f"Task {name} could not run: {e}")
+                        result = None
+                    if result is not None and result.succeeded:
+                        # Re-fingerprint after the run, in case the task touched its own inputs
+                        fingerprints[name] = self._fingerprint(task, fingerprints)
+                        if fingerprints[name] is not None:
+                            state[name] = fingerprints[name]
+                        finish(name, TaskOutcome(task, "succeeded", result, start, now))
+                    else:
+                        logger.error(f"Task failed: {name}")
+                        failed = True
+                        state.pop(name, None)
+                        outcomes[name] = TaskOutcome(task, "failed", result, start, now)
+                        block(name, now)
+
+        wall_time = time.perf_counter() - run_start
+        for name in order:
+            if name not in outcomes:
+                # Never started because of fail_fast
+                outcomes[name] = TaskOutcome(self.tasks[name], "blocked", start=wall_time, end=wall_time)
+        self._save_state(state)
+        return GraphRun({name: outcomes[name] for name in order}, wall_time)
+
+
 # Example usage
 if __name__ == "__main__":
     try:
@@ -309,6 +2249,18 @@ if __name__ == "__main__":
         ])
         print(f"Output: {result.stdout.strip()}")
 
+        # Test parallel execution
+        print("\nTesting parallel execution:")
+        stats = BatchStats()
+        results = []
+        for result in shell.run_many([f"sleep 0.{i} && echo {i}" for i in range(5)],
+                                     max_workers=5, stats=stats):
+            print(f"Finished: {result.command} -> {result.stdout.strip()}")
+            results.append(result)
+        print(f"Wall time: {stats.wall_time:.2f}s, command time: {stats.command_time:.2f}s, "
+              f"CPU time: {stats.cpu_time:.2f}s")
+        print(resource_report(results, sort_by="duration"))
+
         # Test background process
         print("\nTesting background process:")
         pid = shell.run_background(
@@ -0,0 +1,576 @@
+"""Tests for Exercise 1: shell command execution."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from exercises.exercise1 import (
+    AsyncShellExecutor,
+    BatchStats,
+    CommandResult,
+    OutputChunk,
+    ResultCache,
+    ShellExecutor,
+    ShellSession,
+    TailBuffer,
+    TaskGraph,
+    _relay,
+    rank_commands,
+    resource_report
+)
+
+
+@pytest.fixture
+def shell():
+    executor = ShellExecutor(shell=True)
+    yield executor
+    executor.cleanup()
+
+
+def test_run_captures_output(shell):
+    result = shell.run("echo hello; echo oops >&2; exit 3")
+    assert result.stdout == "hello\n"
+    assert result.stderr == "oops\n"
+    assert result.returncode == 3
+    assert result.command == "echo hello; echo oops >&2; exit 3"
+
+
+def test_run_with_input(shell):
+    result = shell.run("grep World", input_text="Hello\nHello, World!\nGoodbye")
+    assert result.stdout == "Hello, World!\n"
+
+
+def test_run_check_raises(shell):
+    with pytest.raises(subprocess.CalledProcessError):
+        shell.run("exit 1", check=True)
+
+
+def test_run_timeout_kills_command(shell):
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        shell.run("sleep 5; echo done", timeout=0.2)
+    assert time.perf_counter() - start < 2
+
+
+def test_run_many_runs_in_parallel(shell):
+    stats = BatchStats()
+    results = list(shell.run_many(["sleep 0.3"] * 6, max_workers=6, stats=stats))
+    assert len(results) == 6
+    assert all(isinstance(result, CommandResult) and result.succeeded for result in results)
+    assert stats.wall_time < 1.2
+    assert stats.command_time >= 1.8
+    assert stats.parallelism > 2
+    assert stats.succeeded == 6
+
+
+def test_run_many_yields_in_completion_order(shell):
+    commands = ["sleep 0.6; echo slow", "sleep 0.3; echo medium", "echo fast"]
+    outputs = [result.stdout.strip() for result in shell.run_many(commands, max_workers=3)]
+    assert outputs == ["fast", "medium", "slow"]
+
+
+def test_run_many_continues_on_error(shell):
+    stats = BatchStats()
+    results = list(shell.run_many(["exit 1", "sleep 2", "echo ok"], timeout=0.3, stats=stats))
+    assert len(results) == 3
+    assert (stats.succeeded, stats.failed, stats.timed_out) == (1, 1, 1)
+    assert [result.timed_out for result in results].count(True) == 1
+
+
+def test_run_many_reports_spawn_errors():
+    executor = ShellExecutor(shell=False)
+    stats = BatchStats()
+    results = list(executor.run_many([["true"], ["no-such-program-xyz"]], stats=stats))
+    assert len(results) == 2
+    assert (stats.succeeded, stats.failed) == (1, 1)
+    failed = next(result for result in results if not result.succeeded)
+    assert failed.returncode == 127
+    assert "no-such-program-xyz" in failed.stderr
+
+
+def test_run_many_fail_fast_cancels_remaining(shell):
+    stats = BatchStats()
+    commands = ["exit 2"] + ["sleep 0.5"] * 10
+    start = time.perf_counter()
+    results = []
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        for result in shell.run_many(commands, max_workers=2, fail_fast=True, stats=stats):
+            results.append(result)
+    assert excinfo.value.returncode == 2
+    assert results[-1].returncode == 2
+    assert stats.cancelled >= 8
+    assert time.perf_counter() - start < 1.5
+
+
+def test_run_many_counts_child_cpu_time(shell):
+    busy = f"{sys.executable} -c \"sum(i * i for i in range(3_000_000))\""
+    stats = BatchStats()
+    list(shell.run_many([busy] * 2, max_workers=2, stats=stats))
+    assert stats.cpu_time > 0
+    assert stats.cpu_utilization > 0
+
+
+def test_run_records_resource_usage(shell):
+    busy = f"{sys.executable} -c \"sum(i * i for i in range(2_000_000)); x = bytearray(80_000_000)\""
+    usage = shell.run(busy).resources
+    assert usage.cpu_time > 0.05
+    assert usage.user_time > 0
+    assert usage.max_rss >= 80_000_000
+    assert usage.voluntary_switches + usage.involuntary_switches > 0
+
+
+def test_psutil_samples_process_tree():
+    shell = ShellExecutor(shell=True, sample_interval=0.02)
+    usage = shell.run("sleep 0.3 & sleep 0.3 & wait").resources
+    assert usage.peak_tree_processes >= 3
+    assert usage.peak_tree_rss > 0
+
+
+def test_rank_commands_and_report(shell):
+    busy = f"{sys.executable} -c \"sum(range(5_000_000))\""
+    results = list(shell.run_many(["true", busy, "sleep 0.1"], max_workers=3))
+    ranked = rank_commands(results, sort_by="cpu_time", top=2)
+    assert ranked[0].command == busy
+    assert len(ranked) == 2
+    assert rank_commands(results, sort_by="duration")[0].command == busy
+
+    report = resource_report(results)
+    assert busy[:20] in report.splitlines()[1]
+    assert report.splitlines()[-1].startswith("3 commands")
+    with pytest.raises(ValueError):
+        rank_commands(results, sort_by="nope")
+
+
+def test_stream_yields_lines_as_they_arrive(shell):
+    arrivals = []
+    start = time.perf_counter()
+    with shell.stream("echo first; sleep 0.5; echo second >&2") as stream:
+        for chunk in stream:
+            arrivals.append((chunk, time.perf_counter() - start))
+    assert [chunk for chunk, _ in arrivals] == [OutputChunk("stdout", "first\n"), OutputChunk("stderr", "second\n")]
+    assert arrivals[0][1] < 0.4
+    assert stream.result.returncode == 0
+
+
+def test_stream_binary_chunks(shell):
+    chunks = list(shell.stream("head -c 300000 /dev/zero", binary=True, chunk_size=65536))
+    assert all(isinstance(chunk.data, bytes) and len(chunk.data) <= 65536 for chunk in chunks)
+    assert sum(len(chunk.data) for chunk in chunks) == 300000
+
+
+def test_stream_keeps_bounded_tail(shell):
+    stream = shell.stream("seq 1 100000", tail_size=100)
+    lines = sum(1 for _ in stream)
+    assert lines == 100000
+    assert len(stream.result.stdout) <= 100
+    assert stream.result.stdout.endswith("99999\n100000\n")
+
+
+def test_stream_feeds_large_input_without_deadlock(shell):
+    data = "x" * 1_000_000 + "\n"
+    result = shell.stream("cat", input_text=data, tail_size=len(data)).result
+    assert result.stdout == data
+
+
+def test_stream_timeout(shell):
+    stream = shell.stream("echo started; sleep 5", timeout=0.3)
+    assert [chunk.data for chunk in stream] == ["started\n"]
+    assert stream.result.timed_out
+
+
+def test_stream_close_kills_command(shell):
+    stream = shell.stream("while true; do echo tick; sleep 0.05; done")
+    next(iter(stream))
+    stream.close()
+    assert stream.process.poll() is not None
+    assert not shell._processes
+
+
+def test_run_with_progress_callback(shell):
+    progress = []
+    result = shell.run(
+        "for i in 25 50 75 100; do printf '%s%%\\r' $i; done; echo done",
+        on_stdout=lambda line: progress.append(line.strip()),
+        tail_size=10
+    )
+    assert progress == ["25%", "50%", "75%", "100%", "done"]
+    assert result.stdout.endswith("done\n")
+
+
+def test_tail_buffer_trims_oldest_output():
+    tail = TailBuffer(5)
+    for part in ["abc", "defg", "hi"]:
+        tail.append(part)
+    assert tail.getvalue() == "efghi"
+    assert tail.dropped == 4
+
+
+def test_run_with_pipe_text(shell):
+    result = shell.run_with_pipe(["echo 'Hello, World!'", "grep World", "wc -w"])
+    assert result.stdout.strip() == "2"
+
+
+def test_run_with_pipe_binary_passes_bytes_through(shell, tmp_path):
+    data = bytes(range(256)) * 4096
+    source = tmp_path / "input.bin"
+    source.write_bytes(data)
+    result = shell.run_with_pipe(["gzip -1", "gzip -d"], binary=True, input_file=source, max_output=len(data))
+    assert result.stdout == data
+
+
+def test_run_with_pipe_binary_bounds_capture(shell):
+    result = shell.run_with_pipe(["head -c 3000000 /dev/zero", "cat"], binary=True, max_output=100)
+    assert result.stdout == bytes(100)
+    assert result.returncode == 0
+    assert result.truncated
+    assert result.dropped_bytes == 3000000 - 100
+
+
+def test_run_with_pipe_bounded_text_translates_newlines(shell):
+    result = shell.run_with_pipe(["printf 'a\\r\\nb\\rc'", "cat"], max_output=100)
+    assert result.stdout == "a\nb\nc"
+    assert not result.truncated
+
+
+def test_run_with_pipe_streams_to_output_file(shell, tmp_path):
+    source, target = tmp_path / "input.bin", tmp_path / "output.bin"
+    source.write_bytes(b"line\n" * 100000)
+    result = shell.run_with_pipe(["gzip -1", "gzip -d"], binary=True, input_file=source, output_file=target)
+    assert target.read_bytes() == source.read_bytes()
+    assert result.stdout == b""
+
+
+def test_run_with_pipe_timeout():
+    shell = ShellExecutor(timeout=0.3)
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        shell.run_with_pipe(["sleep 5", "cat"], binary=True)
+    assert time.perf_counter() - start < 2
+
+
+def test_relay_copies_between_pipes_and_files(tmp_path):
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"x" * 200000)
+    read_fd, write_fd = os.pipe()
+    with open(source, "rb") as f:
+        writer = threading.Thread(target=lambda: (_relay(f.fileno(), write_fd), os.close(write_fd)))
+        writer.start()
+        with open(tmp_path / "copy.bin", "wb") as out:
+            copied = _relay(read_fd, out.fileno())
+        writer.join()
+    os.close(read_fd)
+    assert copied == 200000
+    assert (tmp_path / "copy.bin").read_bytes() == source.read_bytes()
+
+
+@pytest.fixture
+def session(tmp_path):
+    with ShellSession(cwd=tmp_path) as session:
+        yield session
+
+
+def test_session_reuses_one_shell(session):
+    first = session.run("echo $$")
+    second = session.run("echo $$")
+    assert first.stdout == second.stdout
+    assert first.pid == second.pid == session.pid
+
+
+def test_session_separates_output_and_exit_codes(session):
+    result = session.run("echo out; echo err >&2; printf 'no newline'; exit_code=3; (exit $exit_code)")
+    assert result.stdout == "out\nno newline"
+    assert result.stderr == "err\n"
+    assert result.returncode == 3
+
+
+def test_session_reads_large_output(session):
+    result = session.run("head -c 5000000 /dev/zero | tr '\\0' x; seq 1 100000 >&2")
+    assert len(result.stdout) == 5000000 and set(result.stdout) == {"x"}
+    assert result.stderr.endswith("99999\n100000\n")
+    assert session.run("echo ok").stdout == "ok\n"
+
+
+def test_session_keeps_cwd_and_env(session, tmp_path):
+    (tmp_path / "sub").mkdir()
+    session.run("cd sub && export GREETING=hello")
+    result = session.run('pwd; echo "$GREETING"')
+    assert result.stdout == f"{tmp_path / 'sub'}\nhello\n"
+
+
+def test_session_commands_cannot_read_protocol(session):
+    assert session.run("cat").stdout == ""
+    assert session.run("echo still alive").stdout == "still alive\n"
+
+
+def test_session_syntax_error_does_not_break_session(session):
+    result = session.run("echo 'unbalanced")
+    assert result.returncode != 0
+    assert session.run("echo ok").stdout == "ok\n"
+
+
+def test_session_restarts_after_exit(session, tmp_path):
+    (tmp_path / "sub").mkdir()
+    session.run("cd sub; export LOST=1")
+    old_pid = session.pid
+    result = session.run("exit 7")
+    assert result.returncode == 7
+    assert not session.alive
+
+    result = session.run('pwd; echo "${LOST:-unset}"')
+    assert result.stdout == f"{tmp_path / 'sub'}\nunset\n"
+    assert session.pid != old_pid
+    assert session.restarts == 1
+
+
+def test_session_timeout_restarts_shell(session):
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        session.run("sleep 5", timeout=0.3)
+    assert time.perf_counter() - start < 2
+    assert session.run("echo back").stdout == "back\n"
+
+
+def test_session_is_faster_than_new_shells(session):
+    count = 200
+    start = time.perf_counter()
+    for _ in range(count):
+        session.run("true")
+    session_time = time.perf_counter() - start
+
+    shell = ShellExecutor(shell=True)
+    start = time.perf_counter()
+    for _ in range(count):
+        shell.run("true")
+    assert session_time < time.perf_counter() - start
+
+
+def run_async(coro_fn):
+    """Run a coroutine function with a fresh AsyncShellExecutor."""
+    async def main():
+        executor = AsyncShellExecutor(shell=True)
+        try:
+            return await coro_fn(executor)
+        finally:
+            await executor.cleanup()
+    return asyncio.run(main())
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_async_run_matches_sync_result_shape():
+    result = run_async(lambda shell: shell.run("echo hello; echo oops >&2; exit 3"))
+    assert isinstance(result, CommandResult)
+    assert (result.stdout, result.stderr, result.returncode) == ("hello\n", "oops\n", 3)
+
+
+def test_async_output_matches_sync_newlines(shell):
+    command = "printf 'a\\r\\nb\\rc'"
+    result = run_async(lambda executor: executor.run(command))
+    assert result.stdout == shell.run(command).stdout == "a\nb\nc"
+    piped = run_async(lambda executor: executor.run_with_pipe([command, "cat"]))
+    assert piped.stdout == shell.run_with_pipe([command, "cat"]).stdout == "a\nb\nc"
+
+
+def test_async_run_with_input_and_check():
+    async def scenario(shell):
+        result = await shell.run("grep World", input_text="Hello\nHello, World!\n")
+        with pytest.raises(subprocess.CalledProcessError):
+            await shell.run("exit 1", check=True)
+        return result
+    assert run_async(scenario).stdout == "Hello, World!\n"
+
+
+def test_async_run_timeout_kills_process_group():
+    async def scenario(shell):
+        with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+            await shell.run("echo partial; sleep 5; echo done", timeout=0.3)
+        return excinfo.value
+    start = time.perf_counter()
+    error = run_async(scenario)
+    assert time.perf_counter() - start < 2
+    assert error.output == "partial\n"
+
+
+def test_async_run_with_pipe():
+    commands = ["printf 'a\\nb\\na\\n'", "sort", "uniq -c", "wc -l"]
+    result = run_async(lambda shell: shell.run_with_pipe(commands))
+    assert result.stdout.strip() == "2"
+    assert result.returncode == 0
+    expected = ShellExecutor(shell=True).run_with_pipe(commands)
+    assert (result.command, result.stderr) == (expected.command, expected.stderr) == (commands, None)
+
+
+def test_async_shell_quotes_argument_lists():
+    result = run_async(lambda shell: shell.run(["printf", "%s|", "it's", "a b"]))
+    assert result.stdout == "it's|a b|"
+
+
+def test_async_run_background(tmp_path):
+    output = tmp_path / "out.log"
+
+    async def scenario(shell):
+        pid = await shell.run_background("echo background", output_file=str(output))
+        return pid, await shell.wait(pid)
+    pid, returncode = run_async(scenario)
+    assert pid > 0 and returncode == 0
+    assert output.read_text() == "background\n"
+
+
+def test_async_run_many_is_concurrent():
+    stats = BatchStats()
+    results = run_async(lambda shell: collect(shell.run_many(["sleep 0.3"] * 50, stats=stats)))
+    assert len(results) == 50 and all(result.succeeded for result in results)
+    assert stats.wall_time < 2
+    assert stats.parallelism > 10
+
+
+def test_async_run_many_limits_concurrency():
+    stats = BatchStats()
+    run_async(lambda shell: collect(shell.run_many(["sleep 0.2"] * 4, max_concurrency=2, stats=stats)))
+    assert stats.wall_time >= 0.4
+
+
+def test_async_run_many_fail_fast():
+    stats = BatchStats()
+
+    async def scenario(shell):
+        results = []
+        with pytest.raises(subprocess.CalledProcessError):
+            async for result in shell.run_many(["exit 4"] + ["sleep 5"] * 5, fail_fast=True, stats=stats):
+                results.append(result)
+        return results
+    start = time.perf_counter()
+    results = run_async(scenario)
+    assert time.perf_counter() - start < 2
+    assert results[-1].returncode == 4
+    assert stats.cancelled == 5
+
+
+def test_cached_run_skips_execution(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    shell = ShellExecutor(shell=True, result_cache=cache)
+    counter = tmp_path / "runs"
+    command = f"echo run >> {counter}; echo done"
+    first = shell.run(command, cache=True)
+    second = shell.run(command, cache=True)
+    assert not first.cached and second.cached
+    assert second.stdout == first.stdout == "done\n"
+    assert counter.read_text().count("run") == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["hit_rate"] == 0.5
+
+
+def test_streamed_runs_are_not_cached(tmp_path):
+    shell = ShellExecutor(shell=True, result_cache=ResultCache(tmp_path / "cache"))
+    assert shell.run("seq 1 1000", cache=True, tail_size=10).stdout == "\n999\n1000\n"
+    result = shell.run("seq 1 1000", cache=True)
+    assert not result.cached and result.stdout.startswith("1\n2\n")
+
+
+def test_cache_key_tracks_inputs_and_env(tmp_path):
+    cache = ResultCache(tmp_path / "cache", env_vars=("GREETING",))
+    data = tmp_path / "data.txt"
+    data.write_text("one")
+    shell = ShellExecutor(shell=True, cwd=str(tmp_path), env={"GREETING": "hi"}, result_cache=cache)
+    command = "cat data.txt; echo $GREETING"
+    assert shell.run(command, cache=True, inputs=["data.txt"]).stdout == "onehi\n"
+    data.write_text("two")
+    os.utime(data, ns=(time.time_ns() + 10**9,) * 2)
+    assert shell.run(command, cache=True, inputs=["data.txt"]).stdout == "twohi\n"
+    shell.env["GREETING"] = "hello"
+    result = shell.run(command, cache=True, inputs=["data.txt"])
+    assert result.stdout == "twohello\n" and not result.cached
+    assert cache.stats()["hits"] == 0
+
+
+def test_cache_skips_failures_and_evicts_oldest(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=400)
+    shell = ShellExecutor(shell=True, result_cache=cache)
+    shell.run("exit 3", cache=True)
+    assert not shell.run("exit 3", cache=True).cached
+    for i in range(6):
+        shell.run(f"printf '%080d' {i}", cache=True)
+    stats = cache.stats()
+    assert stats["evictions"] > 0 and stats["bytes"] <= 400
+    assert shell.run("printf '%080d' 5", cache=True).cached
+    assert not shell.run("printf '%080d' 0", cache=True).cached
+
+
+def test_task_graph_runs_independent_tasks_in_parallel(tmp_path):
+    graph = TaskGraph(ShellExecutor(shell=True, cwd=str(tmp_path)), max_workers=3)
+    graph.add("a", "sleep 0.3; echo a > a.txt")
+    graph.add("b", "sleep 0.3; echo b > b.txt")
+    graph.add("c", "sleep 0.3; echo c > c.txt")
+    graph.add("join", "cat a.txt b.txt c.txt > all.txt", deps=["a", "b", "c"])
+    run = graph.run()
+    assert run.succeeded
+    assert (tmp_path / "all.txt").read_text() == "a\nb\nc\n"
+    assert run.wall_time < 0.8
+    assert run.outcomes["join"].start >= max(run.outcomes[name].end for name in "abc")
+
+
+def test_task_graph_critical_path_report(tmp_path):
+    graph = TaskGraph(max_workers=2)
+    graph.add("fast", "true")
+    graph.add("slow", "sleep 0.3")
+    graph.add("link", "sleep 0.1", deps=["fast", "slow"])
+    run = graph.run()
+    assert [outcome.task.name for outcome in run.critical_path()] == ["slow", "link"]
+    report = run.report()
+    assert "slow" in report and "link" in report and "fast" not in report
+    assert "parallelism" in report
+
+
+def test_task_graph_skips_unchanged_tasks(tmp_path):
+    state = tmp_path / "state.json"
+    source = tmp_path / "src.txt"
+    source.write_text("one")
+
+    def build():
+        graph = TaskGraph(ShellExecutor(shell=True, cwd=str(tmp_path)), state_file=state)
+        graph.add("copy", "cp src.txt copy.txt; echo x >> runs", inputs=["src.txt"], outputs=["copy.txt"])
+        graph.add("count", "wc -c < copy.txt > count.txt", deps=["copy"],
+                  inputs=["copy.txt"], outputs=["count.txt"])
+        graph.add("always", "echo phony")
+        run = graph.run()
+        return [run.outcomes[name].status for name in ("copy", "count", "always")]
+
+    assert build() == ["succeeded"] * 3
+    assert build() == ["skipped", "skipped", "succeeded"]
+    source.write_text("two!")
+    assert build() == ["succeeded"] * 3
+    (tmp_path / "count.txt").unlink()
+    assert build() == ["skipped", "succeeded", "succeeded"]
+    assert (tmp_path / "runs").read_text().count("x") == 2
+
+
+def test_task_graph_failure_blocks_dependents(tmp_path):
+    graph = TaskGraph()
+    graph.add("bad", "exit 1")
+    graph.add("after_bad", "true", deps=["bad"])
+    graph.add("later", "true", deps=["after_bad"])
+    graph.add("other", "true")
+    run = graph.run()
+    assert not run.succeeded
+    statuses = {name: outcome.status for name, outcome in run.outcomes.items()}
+    assert statuses == {"bad": "failed", "after_bad": "blocked", "later": "blocked", "other": "succeeded"}
+
+
+def test_task_graph_rejects_cycles_and_unknown_deps():
+    graph = TaskGraph()
+    graph.add("a", "true", deps=["b"])
+    graph.add("b", "true", deps=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        graph.run()
+    graph = TaskGraph()
+    graph.add("a", "true", deps=["missing"])
+    with pytest.raises(ValueError, match="unknown"):
+        graph.order()
+    with pytest.raises(ValueError):
+        graph.add("a", "true")
@@ -11,35 +11,270 @@ TODO:
 5. Create response cache
 """
 
+import hashlib
+import logging
+import os
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+APOD_URL = "https://api.nasa.gov/planetary/apod"
+CHUNK_SIZE = 64 * 1024
+STORE_DIR_NAME = ".apod_store"
+
+# Connection errors worth resuming after; HTTP errors are not retried
+_INTERRUPTIONS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def _validate_date(date: str) -> None:
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"Invalid date format: {date} (expected YYYY-MM-DD)")
+
+
 def get_apod(api_key: str, date: str = None) -> dict:
     """
-    TODO: Fetch NASA's Astronomy Picture of the Day
-    
+    Fetch NASA's Astronomy Picture of the Day
+
     Args:
         api_key: NASA API key
         date: Specific date for APOD (YYYY-MM-DD)
-        
+
     Returns:
         Dictionary containing image data
-        
+
     Raises:
         ValueError: If date format is invalid
         requests.RequestException: If API request fails
     """
-    pass
+    params = {"api_key": api_key}
+    if date:
+        _validate_date(date)
+        params["date"] = date
+    response = requests.get(APOD_URL, params=params, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
 
-def save_apod_image(image_url: str, filename: str) -> bool:
+def get_apod_range(api_key: str, start_date: str, end_date: str) -> List[dict]:
     """
-    TODO: Download and save APOD image
-    
+    Fetch APOD entries for a date range in a single request
+
+    Args:
+        api_key: NASA API key
+        start_date: First date (YYYY-MM-DD)
+        end_date: Last date (YYYY-MM-DD)
+
+    Returns:
+        List of APOD dictionaries
+
+    Raises:
+        ValueError: If date format is invalid
+        requests.RequestException: If API request fails
+    """
+    _validate_date(start_date)
+    _validate_date(end_date)
+    response = requests.get(
+        APOD_URL,
+        params={"api_key": api_key, "start_date": start_date, "end_date": end_date},
+        timeout=30
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _hash_file(path: str, chunk_size: int = CHUNK_SIZE) -> "hashlib._Hash":
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest
+
+
+def _parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Get the first byte and the total length from a Content-Range header."""
+    match = re.fullmatch(r"\s*bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)\s*", value or "")
+    if not match:
+        return None, None
+    start, total = match.groups()
+    return int(start) if start else None, int(total) if total != "*" else None
+
+
+def _download_to_part(
+    session: requests.Session,
+    image_url: str,
+    part_path: str,
+    chunk_size: int,
+    max_retries: int,
+    timeout: float
+) -> str:
+    """Stream a URL into a .part file, resuming with Range requests.
+
+    Returns:
+        Hex SHA-256 of the complete file
+    """
+    attempts = 0
+    while True:
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with session.get(image_url, headers=headers, stream=True, timeout=timeout) as response:
+                start, total = _parse_content_range(response.headers.get("Content-Range"))
+                if response.status_code == 416 and offset:
+                    if total == offset:
+                        # Nothing left to fetch, the partial file is already complete
+                        return _hash_file(part_path, chunk_size).hexdigest()
+                    # The partial file is not a prefix of this image
+                    logger.warning(f"Partial file for {image_url} does not match, starting over")
+                    os.remove(part_path)
+                    continue
+                response.raise_for_status()
+
+                if offset and response.status_code == 206 and start != offset:
+                    logger.warning(f"{image_url} resumed at byte {start} instead of {offset}, starting over")
+                    os.remove(part_path)
+                    continue
+                if offset and response.status_code == 206:
+                    digest = _hash_file(part_path, chunk_size)
+                    mode = "ab"
+                else:
+                    # Server ignored the Range header, start over
+                    digest = hashlib.sha256()
+                    mode = "wb"
+
+                # At most one chunk is held in memory at a time
+                with open(part_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        f.write(chunk)
+                        digest.update(chunk)
+                return digest.hexdigest()
+        except _INTERRUPTIONS as e:
+            attempts += 1
+            if attempts > max_retries:
+                raise
+            logger.warning(f"Download of {image_url} interrupted ({e}), resuming ({attempts}/{max_retries})")
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def save_apod_image(
+    image_url: str,
+    filename: str,
+    store_dir: Optional[str] = None,
+    session: Optional[requests.Session] = None,
+    chunk_size: int = CHUNK_SIZE,
+    max_retries: int = 3,
+    timeout: float = 30
+) -> bool:
+    """
+    Download and save APOD image
+
+    The image is streamed to `<filename>.part` in chunks and resumed with an
+    HTTP Range request if the connection drops. Finished images are kept
+    once in a content-addressed store (named by SHA-256) and `filename` is a
+    hard link to it, so the same image is never stored twice.
+
     Args:
         image_url: URL of the image
         filename: Where to save the image
-        
+        store_dir: Content-addressed store, defaults to .apod_store next to filename
+        session: Session to reuse connections across downloads
+        chunk_size: Bytes read and written at a time
+        max_retries: Resume attempts after a dropped connection
+        timeout: Connect/read timeout in seconds
+
     Returns:
         True if successful, False otherwise
     """
-    pass
+    directory = os.path.dirname(os.path.abspath(filename))
+    store_dir = store_dir or os.path.join(directory, STORE_DIR_NAME)
+    part_path = f"{filename}.part"
+    os.makedirs(directory, exist_ok=True)
+    os.makedirs(store_dir, exist_ok=True)
+
+    own_session = session is None
+    session = session or requests.Session()
+    try:
+        sha256 = _download_to_part(session, image_url, part_path, chunk_size, max_retries, timeout)
+    except (requests.RequestException, OSError) as e:
+        logger.error(f"Failed to download {image_url}: {e}")
+        return False
+    finally:
+        if own_session:
+            session.close()
+
+    extension = os.path.splitext(urlparse(image_url).path)[1].lower()
+    stored_path = os.path.join(store_dir, f"{sha256}{extension}")
+    if os.path.exists(stored_path):
+        logger.info(f"{image_url} is a duplicate of {stored_path}")
+        os.remove(part_path)
+    else:
+        os.replace(part_path, stored_path)
+    _link_or_copy(stored_path, filename)
+    return True
+
+
+def backfill_apod_images(
+    api_key: str,
+    start_date: str,
+    end_date: str,
+    output_dir: str,
+    max_workers: int = 4,
+    hd: bool = True
+) -> Dict[str, Optional[str]]:
+    """
+    Download all APOD images in a date range in parallel
+
+    Args:
+        api_key: NASA API key
+        start_date: First date (YYYY-MM-DD)
+        end_date: Last date (YYYY-MM-DD)
+        output_dir: Directory for the images, named <date><extension>
+        max_workers: Number of parallel downloads
+        hd: Prefer the HD image URL when available
+
+    Returns:
+        Mapping of date to saved path, or None if the entry is not an
+        image or its download failed
+    """
+    entries = get_apod_range(api_key, start_date, end_date)
+    os.makedirs(output_dir, exist_ok=True)
+
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max_workers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        def download(entry: dict) -> Optional[str]:
+            if entry.get("media_type") != "image":
+                return None
+            url = (entry.get("hdurl") if hd else None) or entry["url"]
+            extension = os.path.splitext(urlparse(url).path)[1].lower()
+            path = os.path.join(output_dir, f"{entry['date']}{extension}")
+            return path if save_apod_image(url, path, session=session) else None
+
+        paths = list(pool.map(download, entries))
+    return {entry["date"]: path for entry, path in zip(entries, paths)}
+
 
 def main():
     """
@@ -49,7 +284,15 @@ def main():
     3. Save images
     4. Handle errors
     """
-    pass
+    api_key = os.getenv("NASA_API_KEY", "DEMO_KEY")
+    apod = get_apod(api_key)
+    print(f"Today's APOD: {apod['title']}")
+    if apod.get("media_type") == "image":
+        print(f"Saved: {save_apod_image(apod['url'], 'apod_today' + os.path.splitext(apod['url'])[1])}")
+
+    results = backfill_apod_images(api_key, "2024-01-01", "2024-01-07", "apod_images")
+    for date, path in results.items():
+        print(f"{date}: {path or 'skipped'}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -11,37 +11,317 @@ TODO:
 5. Format output
 """
 
-def get_top_headlines(api_key: str, country: str = 'us', category: str = None) -> list:
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+NEWS_API_URL = "https://newsapi.org/v2"
+CATEGORIES = {"business", "entertainment", "general", "health", "science", "sports", "technology"}
+SORT_OPTIONS = {"relevancy", "popularity", "publishedAt"}
+
+CacheKey = Tuple[Optional[str], ...]
+
+
+class HeadlineCache:
+    """
+    Stale-while-revalidate cache for News API results
+
+    Entries younger than `ttl` are served as is. Older entries are still
+    served immediately while a background thread fetches a fresh copy;
+    only entries older than `max_stale` (or missing) block on the API.
+    At most `max_entries` are kept, dropping the least recently used.
+    With a path, entries are saved to a JSON file so a new process starts warm.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 300,
+        max_stale: float = 24 * 3600,
+        max_workers: int = 2,
+        max_entries: int = 256
+    ):
+        """
+        Args:
+            path: JSON file to persist entries to, None keeps them in memory
+            ttl: Seconds an entry is fresh
+            max_stale: Seconds a stale entry may still be served
+            max_workers: Background refresh threads
+            max_entries: Entries kept before the least recently used is dropped
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.stats = {
+            "hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0, "evictions": 0
+        }
+        self._entries: "OrderedDict[CacheKey, dict]" = OrderedDict()
+        self._refreshing: Dict[CacheKey, Future] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news-refresh")
+        self._load()
+
+    def get(self, key: CacheKey, fetch: Callable[[], List[dict]]) -> List[dict]:
+        """
+        Get cached articles, fetching or refreshing them as needed
+
+        Args:
+            key: Cache key, e.g. (country, category, query)
+            fetch: Function returning fresh articles from the API
+
+        Returns:
+            List of articles
+
+        Raises:
+            requests.RequestException: If there is no usable entry and the fetch fails
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.time() - entry["fetched_at"] if entry else None
+            if entry:
+                self._entries.move_to_end(key)
+            if entry and age < self.ttl:
+                self.stats["hits"] += 1
+                return entry["articles"]
+            if entry and age < self.max_stale:
+                self.stats["stale_hits"] += 1
+                self._schedule_refresh(key, fetch)
+                return entry["articles"]
+            self.stats["misses"] += 1
+
+        articles = fetch()
+        self._store(key, articles)
+        return articles
+
+    def refresh(self, key: CacheKey, fetch: Callable[[], List[dict]]) -> Future:
+        """
+        Refresh an entry in the background
+
+        Args:
+            key: Cache key
+            fetch: Function returning fresh articles from the API
+
+        Returns:
+            Future for the refresh, shared with any refresh already running
+        """
+        with self._lock:
+            return self._schedule_refresh(key, fetch)
+
+    def _schedule_refresh(self, key: CacheKey, fetch: Callable[[], List[dict]]) -> Future:
+        # Caller holds the lock; one refresh per key at a time
+        future = self._refreshing.get(key)
+        if future is None:
+            future = self._executor.submit(self._run_refresh, key, fetch)
+            self._refreshing[key] = future
+        return future
+
+    def _run_refresh(self, key: CacheKey, fetch: Callable[[], List[dict]]) -> None:
+        try:
+            self._store(key, fetch())
+            with self._lock:
+                self.stats["refreshes"] += 1
+        except Exception as e:
+            # Keep serving the stale entry; the next read retries
+            with self._lock:
+                self.stats["refresh_errors"] += 1
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.pop(key, None)
+
+    def _store(self, key: CacheKey, articles: List[dict]) -> None:
+        with self._lock:
+            self._entries[key] = {"articles": articles, "fetched_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        self._save()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            entries = sorted(
+                ((tuple(json.loads(key)), entry) for key, entry in data.items()),
+                key=lambda item: item[1]["fetched_at"]
+            )
+            self._entries = OrderedDict(entries[-self.max_entries:] if self.max_entries else [])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable cache file {self.path}: {e}")
+
+    def _save(self) -> None:
+        # Write to a temp file so readers never see half a file. Writes are
+        # serialized by _save_lock, so the newest snapshot is written last,
+        # while the cache lock is only held to copy the entries.
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                data = {json.dumps(list(key)): entry for key, entry in self._entries.items()}
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                # A unique name per write, so two processes never share a temp file
+                with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False) as f:
+                    temp_path = f.name
+                    try:
+                        json.dump(data, f)
+                    except BaseException:
+                        f.close()
+                        os.remove(temp_path)
+                        raise
+                try:
+                    os.replace(temp_path, self.path)
+                except OSError:
+                    os.remove(temp_path)
+                    raise
+            except OSError as e:
+                # The articles are still cached in memory
+                logger.warning(f"Cannot write cache file {self.path}: {e}")
+
+    def wait(self) -> None:
+        """Wait for running background refreshes to finish."""
+        while True:
+            with self._lock:
+                pending = list(self._refreshing.values())
+            if not pending:
+                return
+            for future in pending:
+                future.exception()
+
+    def clear(self) -> None:
+        """Remove all entries, including the persisted file."""
+        with self._lock:
+            self._entries.clear()
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def close(self) -> None:
+        """Finish background refreshes and stop the worker threads."""
+        self._executor.shutdown(wait=True)
+
+
+_default_cache: Optional[HeadlineCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> HeadlineCache:
+    """
+    Get the shared cache, persisted to NEWS_CACHE_PATH if it is set
+
+    Returns:
+        HeadlineCache used when no cache is passed explicitly
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HeadlineCache(os.getenv("NEWS_CACHE_PATH"))
+        return _default_cache
+
+
+def _request_articles(api_key: str, endpoint: str, params: dict) -> List[dict]:
+    response = requests.get(
+        f"{NEWS_API_URL}/{endpoint}",
+        params={key: value for key, value in params.items() if value is not None},
+        headers={"X-Api-Key": api_key},
+        timeout=10
+    )
+    response.raise_for_status()
+    return response.json().get("articles", [])
+
+
+def get_top_headlines(
+    api_key: str,
+    country: str = 'us',
+    category: str = None,
+    cache: Optional[HeadlineCache] = None,
+    use_cache: bool = True
+) -> list:
     """
-    TODO: Fetch top headlines from News API
-    
+    Fetch top headlines from News API
+
     Args:
         api_key: News API key
         country: Country code
         category: News category
-        
+        cache: Cache to use, defaults to the shared persisted cache
+        use_cache: Set to False to always hit the API
+
     Returns:
         List of articles
-        
+
     Raises:
         ValueError: If parameters are invalid
     """
-    pass
+    if not country or len(country) != 2 or not country.isalpha():
+        raise ValueError(f"Invalid country code: {country}")
+    if category is not None and category not in CATEGORIES:
+        raise ValueError(f"Invalid category: {category} (expected one of {sorted(CATEGORIES)})")
+    country = country.lower()
 
-def search_news(api_key: str, query: str, from_date: str = None, sort_by: str = None) -> list:
+    def fetch() -> List[dict]:
+        return _request_articles(api_key, "top-headlines", {"country": country, "category": category})
+
+    if not use_cache:
+        return fetch()
+    return (cache or get_default_cache()).get((country, category, None), fetch)
+
+
+def search_news(
+    api_key: str,
+    query: str,
+    from_date: str = None,
+    sort_by: str = None,
+    cache: Optional[HeadlineCache] = None,
+    use_cache: bool = True
+) -> list:
     """
-    TODO: Search news articles
-    
+    Search news articles
+
     Args:
         api_key: News API key
         query: Search query
         from_date: Start date (YYYY-MM-DD)
         sort_by: Sort method
-        
+        cache: Cache to use, defaults to the shared persisted cache
+        use_cache: Set to False to always hit the API
+
     Returns:
         List of matching articles
+
+    Raises:
+        ValueError: If parameters are invalid
     """
-    pass
+    if not query or not query.strip():
+        raise ValueError("Search query must not be empty")
+    if sort_by is not None and sort_by not in SORT_OPTIONS:
+        raise ValueError(f"Invalid sort option: {sort_by} (expected one of {sorted(SORT_OPTIONS)})")
+
+    def fetch() -> List[dict]:
+        return _request_articles(
+            api_key, "everything", {"q": query, "from": from_date, "sortBy": sort_by}
+        )
+
+    if not use_cache:
+        return fetch()
+    # The search options change the results, so they are part of the key too
+    return (cache or get_default_cache()).get((None, None, query, from_date, sort_by), fetch)
+
 
 def main():
     """
@@ -51,7 +331,20 @@ def main():
     3. Use different sorting options
     4. Handle pagination
     """
-    pass
+    api_key = os.getenv("NEWS_API_KEY")
+    if not api_key:
+        print("Set NEWS_API_KEY to run the examples")
+        return
+
+    for country in ("us", "gb"):
+        articles = get_top_headlines(api_key, country=country, category="technology")
+        print(f"{country}: {len(articles)} technology headlines")
+        for article in articles[:3]:
+            print(f"  - {article['title']}")
+
+    articles = search_news(api_key, "python", sort_by="publishedAt")
+    print(f"Search 'python': {len(articles)} articles")
+    get_default_cache().close()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,179 @@
+"""Tests for Exercise 3: streaming, resumable APOD downloads."""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from exercises import exercise3
+from exercises.exercise3 import backfill_apod_images, save_apod_image
+
+IMAGE = bytes(range(256)) * 1024
+OTHER_IMAGE = b"\x89PNG" + bytes(1000)
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.requests.append((url.path, self.headers.get("Range")))
+        if url.path == "/apod":
+            return self._apod(parse_qs(url.query))
+
+        body = OTHER_IMAGE if url.path.startswith("/other") else IMAGE
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.server.support_range:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            # A misbehaving server may resume somewhere else
+            start = max(start - self.server.range_shift, 0)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+
+        if self.server.drop_after:
+            # Simulate a dropped connection halfway through the body
+            drop_after, self.server.drop_after = self.server.drop_after, 0
+            self.wfile.write(body[start:start + drop_after])
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def _apod(self, query):
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        entries = [
+            {"date": "2024-01-01", "media_type": "image", "url": f"{base}/a.jpg", "hdurl": f"{base}/a_hd.jpg"},
+            {"date": "2024-01-02", "media_type": "image", "url": f"{base}/b.jpg"},
+            {"date": "2024-01-03", "media_type": "video", "url": "https://example.com/video"},
+            {"date": "2024-01-04", "media_type": "image", "url": f"{base}/other.png"},
+        ]
+        body = json.dumps(entries).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.support_range = True
+    server.drop_after = 0
+    server.range_shift = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_save_streams_image(server, tmp_path):
+    target = tmp_path / "image.jpg"
+    assert save_apod_image(f"{server.url}/image.jpg", str(target), chunk_size=4096)
+    assert target.read_bytes() == IMAGE
+    assert not os.path.exists(f"{target}.part")
+
+
+def test_resumes_after_dropped_connection(server, tmp_path):
+    server.drop_after = 100_000
+    target = tmp_path / "image.jpg"
+    assert save_apod_image(f"{server.url}/image.jpg", str(target), chunk_size=1000)
+    assert target.read_bytes() == IMAGE
+    assert server.requests[-1] == ("/image.jpg", "bytes=100000-")
+
+
+def test_resumes_existing_partial_file(server, tmp_path):
+    target = tmp_path / "image.jpg"
+    (tmp_path / "image.jpg.part").write_bytes(IMAGE[:5000])
+    assert save_apod_image(f"{server.url}/image.jpg", str(target))
+    assert target.read_bytes() == IMAGE
+    assert server.requests == [("/image.jpg", "bytes=5000-")]
+
+
+def test_complete_partial_file_is_not_downloaded_again(server, tmp_path):
+    target = tmp_path / "image.jpg"
+    (tmp_path / "image.jpg.part").write_bytes(IMAGE)
+    assert save_apod_image(f"{server.url}/image.jpg", str(target))
+    assert target.read_bytes() == IMAGE
+
+
+def test_longer_partial_file_is_downloaded_again(server, tmp_path):
+    target = tmp_path / "image.jpg"
+    (tmp_path / "image.jpg.part").write_bytes(IMAGE + b"junk")
+    assert save_apod_image(f"{server.url}/image.jpg", str(target))
+    assert target.read_bytes() == IMAGE
+    assert server.requests == [("/image.jpg", f"bytes={len(IMAGE) + 4}-"), ("/image.jpg", None)]
+
+
+def test_restarts_when_range_starts_elsewhere(server, tmp_path):
+    server.range_shift = 10
+    target = tmp_path / "image.jpg"
+    (tmp_path / "image.jpg.part").write_bytes(IMAGE[:5000])
+    assert save_apod_image(f"{server.url}/image.jpg", str(target))
+    assert target.read_bytes() == IMAGE
+    assert server.requests == [("/image.jpg", "bytes=5000-"), ("/image.jpg", None)]
+
+
+def test_restarts_when_server_ignores_range(server, tmp_path):
+    server.support_range = False
+    target = tmp_path / "image.jpg"
+    (tmp_path / "image.jpg.part").write_bytes(b"stale bytes")
+    assert save_apod_image(f"{server.url}/image.jpg", str(target))
+    assert target.read_bytes() == IMAGE
+
+
+def test_gives_up_after_max_retries(server, tmp_path):
+    server.drop_after = 100
+    target = tmp_path / "image.jpg"
+    assert not save_apod_image(f"{server.url}/image.jpg", str(target), max_retries=0)
+    assert not target.exists()
+
+
+def test_identical_images_are_stored_once(server, tmp_path):
+    first, second = tmp_path / "first.jpg", tmp_path / "second.jpg"
+    assert save_apod_image(f"{server.url}/first.jpg", str(first))
+    assert save_apod_image(f"{server.url}/second.jpg", str(second))
+    assert os.path.samefile(first, second)
+    assert len(os.listdir(tmp_path / exercise3.STORE_DIR_NAME)) == 1
+
+
+def test_backfill_downloads_images_in_parallel(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(exercise3, "APOD_URL", f"{server.url}/apod")
+    results = backfill_apod_images("key", "2024-01-01", "2024-01-04", str(tmp_path), max_workers=3)
+
+    assert results == {
+        "2024-01-01": str(tmp_path / "2024-01-01.jpg"),
+        "2024-01-02": str(tmp_path / "2024-01-02.jpg"),
+        "2024-01-03": None,
+        "2024-01-04": str(tmp_path / "2024-01-04.png"),
+    }
+    assert ("/a_hd.jpg", None) in server.requests
+    assert os.path.samefile(results["2024-01-01"], results["2024-01-02"])
+    assert (tmp_path / "2024-01-04.png").read_bytes() == OTHER_IMAGE
+    assert len(os.listdir(tmp_path / exercise3.STORE_DIR_NAME)) == 2
+
+
+def test_invalid_date_raises():
+    with pytest.raises(ValueError):
+        backfill_apod_images("key", "2024/01/01", "2024-01-02", "unused")
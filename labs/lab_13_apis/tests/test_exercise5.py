@@ -0,0 +1,177 @@
+"""Tests for Exercise 5: stale-while-revalidate headline cache."""
+
+import os
+import threading
+import time
+
+import pytest
+import requests
+
+from exercises import exercise5
+from exercises.exercise5 import HeadlineCache, get_top_headlines, search_news
+
+
+class FakeNewsAPI:
+    def __init__(self):
+        self.calls = []
+        self.version = 0
+        self.fail = False
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, api_key, endpoint, params):
+        self.release.wait(5)
+        self.calls.append((endpoint, params))
+        if self.fail:
+            raise requests.ConnectionError("API down")
+        return [{"title": f"{endpoint} v{self.version}", "params": params}]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    api = FakeNewsAPI()
+    monkeypatch.setattr(exercise5, "_request_articles", api)
+    return api
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HeadlineCache(str(tmp_path / "news.json"), ttl=60)
+    yield cache
+    cache.close()
+
+
+def age(cache, seconds):
+    for entry in cache._entries.values():
+        entry["fetched_at"] -= seconds
+
+
+def test_fresh_entry_is_served_from_cache(api, cache):
+    first = get_top_headlines("key", "us", "technology", cache=cache)
+    second = get_top_headlines("key", "us", "technology", cache=cache)
+    assert first == second
+    assert len(api.calls) == 1
+    assert cache.stats["hits"] == 1
+
+
+def test_keys_include_country_category_and_query(api, cache):
+    get_top_headlines("key", "us", cache=cache)
+    get_top_headlines("key", "gb", cache=cache)
+    get_top_headlines("key", "us", "sports", cache=cache)
+    search_news("key", "python", cache=cache)
+    search_news("key", "python", sort_by="popularity", cache=cache)
+    assert len(api.calls) == 5
+
+
+def test_stale_entry_is_served_while_refreshing(api, cache):
+    get_top_headlines("key", cache=cache)
+    age(cache, 120)
+    api.version = 1
+    api.release.clear()
+
+    start = time.perf_counter()
+    stale = get_top_headlines("key", cache=cache)
+    assert time.perf_counter() - start < 0.5
+    assert stale[0]["title"] == "top-headlines v0"
+
+    # Readers during the refresh share it instead of starting another
+    get_top_headlines("key", cache=cache)
+    api.release.set()
+    cache.wait()
+    assert len(api.calls) == 2
+    assert get_top_headlines("key", cache=cache)[0]["title"] == "top-headlines v1"
+    assert cache.stats["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_stale_entry(api, cache):
+    get_top_headlines("key", cache=cache)
+    age(cache, 120)
+    api.fail = True
+    assert get_top_headlines("key", cache=cache)[0]["title"] == "top-headlines v0"
+    cache.wait()
+    assert cache.stats["refresh_errors"] == 1
+    assert get_top_headlines("key", cache=cache)[0]["title"] == "top-headlines v0"
+
+
+def test_entry_past_max_stale_is_fetched_synchronously(api, cache):
+    get_top_headlines("key", cache=cache)
+    age(cache, cache.max_stale + 1)
+    api.version = 1
+    assert get_top_headlines("key", cache=cache)[0]["title"] == "top-headlines v1"
+
+
+def test_cache_persists_between_runs(api, tmp_path):
+    path = str(tmp_path / "news.json")
+    first = HeadlineCache(path)
+    search_news("key", "python", cache=first)
+    first.close()
+
+    second = HeadlineCache(path)
+    articles = search_news("key", "python", cache=second)
+    second.close()
+    assert articles[0]["title"] == "everything v0"
+    assert len(api.calls) == 1
+
+
+def test_unreadable_cache_file_is_ignored(api, tmp_path):
+    path = tmp_path / "news.json"
+    path.write_text("{not json")
+    cache = HeadlineCache(str(path))
+    assert get_top_headlines("key", cache=cache)
+    cache.close()
+
+
+def test_use_cache_false_always_fetches(api, cache):
+    get_top_headlines("key", cache=cache, use_cache=False)
+    get_top_headlines("key", cache=cache, use_cache=False)
+    assert len(api.calls) == 2
+
+
+def test_invalid_parameters_raise(cache):
+    with pytest.raises(ValueError):
+        get_top_headlines("key", "usa", cache=cache)
+    with pytest.raises(ValueError):
+        get_top_headlines("key", "us", "weather", cache=cache)
+    with pytest.raises(ValueError):
+        search_news("key", " ", cache=cache)
+    with pytest.raises(ValueError):
+        search_news("key", "python", sort_by="newest", cache=cache)
+
+
+def test_least_recently_used_entries_are_evicted(api, tmp_path):
+    path = str(tmp_path / "news.json")
+    cache = HeadlineCache(path, max_entries=2)
+    for country in ("us", "gb", "us", "de"):
+        get_top_headlines("key", country, cache=cache)
+    cache.close()
+    assert cache.stats["evictions"] == 1
+    assert [key[0] for key in cache._entries] == ["us", "de"]
+
+    reloaded = HeadlineCache(path, max_entries=1)
+    reloaded.close()
+    assert [key[0] for key in reloaded._entries] == ["de"]
+    assert [name for name in os.listdir(tmp_path)] == ["news.json"]
+
+
+def test_default_cache_is_not_persisted(monkeypatch):
+    monkeypatch.delenv("NEWS_CACHE_PATH", raising=False)
+    monkeypatch.setattr(exercise5, "_default_cache", None)
+    cache = exercise5.get_default_cache()
+    assert cache.path is None
+    cache.close()
+
+
+def test_unwritable_cache_file_does_not_fail_lookups(api, tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    cache = HeadlineCache(str(blocker / "news.json"), ttl=60)
+    articles = get_top_headlines("key", cache=cache)
+    assert articles[0]["title"] == "top-headlines v0"
+    assert get_top_headlines("key", cache=cache) == articles
+    assert cache.stats["hits"] == 1
+
+    age(cache, 120)
+    get_top_headlines("key", cache=cache)
+    cache.wait()
+    cache.close()
+    assert (cache.stats["refreshes"], cache.stats["refresh_errors"]) == (1, 0)
@@ -0,0 +1,52 @@
+"""Benchmark execute_commands over a high-latency link.
+
+Starts a local SSH server behind DelayProxy, which adds a configurable
+round-trip time, and runs the same batch of short commands one at a time
+and multiplexed over several channels of one connection.
+
+Run from the lab directory:
+
+    python -m benchmarks.benchmark_multiplex --rtt-ms 80 --commands 40
+"""
+
+import argparse
+import time
+
+from benchmarks.ssh_standin import PASSWORD, USERNAME, DelayProxy, StandInHost
+from exercises.exercise1 import SSHManager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SSH channel multiplexing")
+    parser.add_argument("--rtt-ms", type=float, default=50, help="Simulated round-trip time")
+    parser.add_argument("--commands", type=int, default=20, help="Commands per run")
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 2, 5, 10],
+                        help="Channel counts to compare")
+    args = parser.parse_args()
+
+    host = StandInHost()
+    proxy = DelayProxy(host.port, rtt=args.rtt_ms / 1000)
+    manager = SSHManager("127.0.0.1", USERNAME, PASSWORD, port=proxy.port, verbose=False)
+    try:
+        start = time.perf_counter()
+        manager.connect()
+        print(f"RTT {args.rtt_ms:.0f} ms, connect {time.perf_counter() - start:.2f}s, "
+              f"{args.commands} commands")
+        commands = [f"echo {i}" for i in range(args.commands)]
+        baseline = None
+        for channels in args.channels:
+            start = time.perf_counter()
+            results = manager.execute_commands(commands, max_channels=channels)
+            elapsed = time.perf_counter() - start
+            assert [result[2] for result in results] == [f"{i}\n" for i in range(args.commands)]
+            baseline = baseline or elapsed
+            print(f"{channels:>3} channels: {elapsed:6.2f}s "
+                  f"({elapsed / args.commands * 1000:5.0f} ms/command, {baseline / elapsed:4.1f}x)")
+    finally:
+        manager.disconnect()
+        proxy.close()
+        host.close()
+
+
+if __name__ == "__main__":
+    main()
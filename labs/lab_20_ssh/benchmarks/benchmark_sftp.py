@@ -0,0 +1,71 @@
+"""Benchmark SFTP transfers over a high-latency link.
+
+Starts a stand-in SSH server in a separate process behind DelayProxy and
+uploads and downloads the same file with plain SFTPClient.put/get and with
+SSHManager.upload_file/download_file at several window sizes and session
+counts.
+
+Run from the lab directory:
+
+    python -m benchmarks.benchmark_sftp --size-mb 32 --rtt-ms 50
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.ssh_standin import PASSWORD, USERNAME, DelayProxy
+from exercises.exercise1 import SSHManager
+
+CONFIGS = [(16, 1), (64, 1), (256, 1), (256, 4)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pipelined and parallel SFTP")
+    parser.add_argument("--size-mb", type=int, default=32, help="File size in MiB")
+    parser.add_argument("--rtt-ms", type=float, default=50, help="Simulated round-trip time")
+    args = parser.parse_args()
+
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.ssh_standin"],
+                              stdout=subprocess.PIPE, text=True)
+    proxy = DelayProxy(int(server.stdout.readline()), rtt=args.rtt_ms / 1000)
+    manager = SSHManager("127.0.0.1", USERNAME, PASSWORD, port=proxy.port, verbose=False)
+    try:
+        manager.connect()
+        sftp = manager.open_sftp()
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "source.bin")
+            with open(source, "wb") as f:
+                f.write(os.urandom(args.size_mb * 2**20))
+            remote = os.path.join(tmp, "remote.bin")
+            local = os.path.join(tmp, "local.bin")
+            size = os.path.getsize(source)
+            print(f"{args.size_mb} MiB over {args.rtt_ms:.0f} ms RTT")
+
+            start = time.perf_counter()
+            sftp.put(source, remote)
+            put_time = time.perf_counter() - start
+            start = time.perf_counter()
+            sftp.get(remote, local)
+            get_time = time.perf_counter() - start
+            print(f"{'put/get':>22}: upload {size / put_time / 1e6:6.1f} MB/s | "
+                  f"download {size / get_time / 1e6:6.1f} MB/s")
+
+            for window, parallel in CONFIGS:
+                up = manager.upload_file(source, remote, window=window, parallel=parallel)
+                down = manager.download_file(remote, local, window=window, parallel=parallel, verify=True)
+                assert up.sha256 == down.sha256 and down.verified
+                print(f"window {window:>3}, {parallel} session{'s' if parallel > 1 else ' '}: "
+                      f"upload {up.mb_per_s:6.1f} MB/s | download {down.mb_per_s:6.1f} MB/s")
+    finally:
+        manager.disconnect()
+        proxy.close()
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Local SSH servers for tests and benchmarks.
+
+StandInHost runs a paramiko server on 127.0.0.1 that accepts one
+username/password pair, runs exec requests with the local shell and
+serves SFTP from the local filesystem.
+DelayProxy forwards TCP connections with added latency to simulate a
+high-RTT link.
+"""
+
+import heapq
+import itertools
+import os
+import socket
+import subprocess
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import paramiko
+
+USERNAME = "tester"
+PASSWORD = "secret"
+_host_key: Optional[paramiko.RSAKey] = None
+
+
+def host_key() -> paramiko.RSAKey:
+    """Get the server host key, generated once per process."""
+    global _host_key
+    if _host_key is None:
+        _host_key = paramiko.RSAKey.generate(1024)
+    return _host_key
+
+
+class StandInServer(paramiko.ServerInterface):
+    """Accepts the test password and runs exec requests with the local shell."""
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if (username, password) == (USERNAME, PASSWORD):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(target=self._exec, args=(channel, command.decode()), daemon=True).start()
+        return True
+
+    @staticmethod
+    def _exec(channel: paramiko.Channel, command: str) -> None:
+        process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        while True:
+            try:
+                out, err = process.communicate(timeout=0.05)
+                break
+            except subprocess.TimeoutExpired:
+                if channel.closed:
+                    process.kill()
+                    return
+        channel.sendall(out)
+        channel.sendall_stderr(err)
+        channel.send_exit_status(process.returncode)
+        channel.shutdown_write()
+        # Let the client close the channel: closing here could overtake the
+        # reply to the exec request, which paramiko sends after this method returns
+        deadline = time.monotonic() + 5
+        while not channel.closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+        channel.close()
+
+
+class StandInSFTPHandle(paramiko.SFTPHandle):
+    """SFTP handle backed by a local file object."""
+
+    def stat(self):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+
+class StandInSFTPServer(paramiko.SFTPServerInterface):
+    """SFTP server for the local filesystem, using paths as given."""
+
+    def _error(self, error: OSError) -> int:
+        return paramiko.SFTPServer.convert_errno(error.errno)
+
+    def open(self, path, flags, attr):
+        try:
+            fd = os.open(path, flags, 0o644)
+            mode = "r+b" if flags & (os.O_WRONLY | os.O_RDWR) else "rb"
+            if flags & os.O_APPEND:
+                mode = "ab"
+            file = os.fdopen(fd, mode)
+        except OSError as e:
+            return self._error(e)
+        handle = StandInSFTPHandle(flags)
+        handle.filename = path
+        handle.readfile = file
+        handle.writefile = file
+        return handle
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as e:
+            return self._error(e)
+
+    def lstat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(path))
+        except OSError as e:
+            return self._error(e)
+
+    def list_folder(self, path):
+        try:
+            return [paramiko.SFTPAttributes.from_stat(os.lstat(os.path.join(path, name)), name)
+                    for name in os.listdir(path)]
+        except OSError as e:
+            return self._error(e)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            return self._error(e)
+        return paramiko.SFTP_OK
+
+    def rename(self, oldpath, newpath):
+        if os.path.exists(newpath):
+            return paramiko.SFTP_FAILURE
+        return self.posix_rename(oldpath, newpath)
+
+    def posix_rename(self, oldpath, newpath):
+        try:
+            os.replace(oldpath, newpath)
+        except OSError as e:
+            return self._error(e)
+        return paramiko.SFTP_OK
+
+    def canonicalize(self, path):
+        return os.path.abspath(path)
+
+
+class StandInHost:
+    """A local SSH server on 127.0.0.1 and a random port."""
+
+    def __init__(self):
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(64)
+        self.port = self.listener.getsockname()[1]
+        self.address = f"127.0.0.1:{self.port}"
+        self.transports: List[paramiko.Transport] = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(sock)
+            transport.add_server_key(host_key())
+            transport.set_subsystem_handler("sftp", paramiko.SFTPServer, StandInSFTPServer)
+            transport.start_server(server=StandInServer())
+            self.transports.append(transport)
+
+    def close(self) -> None:
+        self.listener.close()
+        for transport in self.transports:
+            transport.close()
+
+
+class DelayProxy:
+    """TCP proxy that delays data by rtt / 2 in each direction.
+
+    Data is queued with its delivery time instead of sleeping per chunk,
+    so latency is added without limiting bandwidth.
+    """
+
+    def __init__(self, target_port: int, rtt: float):
+        self.target_port = target_port
+        self.delay = rtt / 2
+        self.listener = socket.socket()
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(64)
+        self.port = self.listener.getsockname()[1]
+        self._sockets: List[socket.socket] = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            server = socket.create_connection(("127.0.0.1", self.target_port))
+            for sock in (client, server):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sockets += [client, server]
+            self._pipe(client, server)
+            self._pipe(server, client)
+
+    def _pipe(self, source: socket.socket, target: socket.socket) -> None:
+        queue: List[Tuple[float, int, bytes]] = []
+        counter = itertools.count()
+        ready = threading.Condition()
+
+        def read() -> None:
+            while True:
+                try:
+                    data = source.recv(65536)
+                except OSError:
+                    data = b""
+                with ready:
+                    heapq.heappush(queue, (time.monotonic() + self.delay, next(counter), data))
+                    ready.notify()
+                if not data:
+                    return
+
+        def write() -> None:
+            while True:
+                with ready:
+                    while not queue or queue[0][0] > time.monotonic():
+                        ready.wait(queue[0][0] - time.monotonic() if queue else None)
+                    _, _, data = heapq.heappop(queue)
+                try:
+                    if not data:
+                        target.shutdown(socket.SHUT_WR)
+                        return
+                    target.sendall(data)
+                except OSError:
+                    return
+
+        threading.Thread(target=read, daemon=True).start()
+        threading.Thread(target=write, daemon=True).start()
+
+    def close(self) -> None:
+        self.listener.close()
+        for sock in self._sockets:
+            sock.close()
+
+
+def main() -> None:
+    """Serve a stand-in host until interrupted, printing its port first."""
+    host = StandInHost()
+    print(host.port, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        host.close()
+
+
+if __name__ == "__main__":
+    main()
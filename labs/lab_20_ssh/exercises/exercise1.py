@@ -1,7 +1,14 @@
 """Basic SSH operations module."""
 
+import hashlib
+import json
 import os
-from typing import Any, Dict, List, Optional, Tuple, Union
+import select
+import shlex
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 from pathlib import Path
 from dotenv import load_dotenv
 import paramiko
@@ -17,6 +24,78 @@ load_dotenv()
 # Initialize Rich console
 console = Console()
 
+# Largest read or write paramiko sends in one SFTP request
+SFTP_CHUNK_SIZE = 32768
+# SFTP requests in flight per session before waiting for replies (8 MiB)
+DEFAULT_WINDOW = 256
+HASH_CHUNK_SIZE = 1024 * 1024
+# Where upload progress is kept for resume=True, so the source directory is never written to
+TRANSFER_STATE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sftp_transfers")
+
+
+class TransferResult(NamedTuple):
+    """Outcome of an SFTP upload or download.
+
+    transferred counts the bytes sent in this run; resumed_from the bytes
+    an earlier interrupted run had already sent. verified is None when the
+    remote hash was not checked.
+    """
+    source: str
+    destination: str
+    size: int
+    transferred: int
+    resumed_from: int
+    seconds: float
+    sha256: str
+    verified: Optional[bool]
+
+    @property
+    def mb_per_s(self) -> float:
+        """Throughput of this run in MB/s."""
+        return self.transferred / self.seconds / 1e6 if self.seconds > 0 else 0.0
+
+
+def _plan_ranges(size: int, parallel: int, chunk_size: int) -> List[List[int]]:
+    """Split size bytes into up to `parallel` [start, end, done] ranges."""
+    chunks = max(1, -(-size // chunk_size))
+    count = max(1, min(parallel, chunks))
+    step = -(-chunks // count) * chunk_size
+    return [[start, min(start + step, size), start] for start in range(0, size, step)] or [[0, 0, 0]]
+
+
+def _load_state(path: str, identity: Dict[str, Any]) -> Optional[List[List[int]]]:
+    """Load saved range progress if it belongs to the same transfer."""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state["ranges"] if state.get("identity") == identity else None
+
+
+def _save_state(path: str, identity: Dict[str, Any], ranges: List[List[int]]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"identity": identity, "ranges": ranges}, f)
+    os.replace(temp_path, path)
+
+
+def _remove_state(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        # Missing, or never written because the directory is not writable
+        pass
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class SSHManager:
     """Manager for SSH operations."""
@@ -28,7 +107,8 @@ class SSHManager:
         password: Optional[str] = None,
         key_filename: Optional[str] = None,
         port: int = 22,
-        timeout: float = 10.0
+        timeout: float = 10.0,
+        verbose: bool = True
     ):
         """Initialize the SSH manager.
 
@@ -39,6 +119,7 @@ class SSHManager:
             key_filename: Path to private key file (optional)
             port: SSH port
             timeout: Connection timeout in seconds
+            verbose: Print status messages to the console
         """
         self.hostname = hostname
         self.username = username
@@ -46,11 +127,23 @@ class SSHManager:
         self.key_filename = key_filename
         self.port = port
         self.timeout = timeout
+        self.verbose = verbose
         self.client: Optional[SSHClient] = None
         self.sftp: Optional[SFTPClient] = None
 
-    def connect(self) -> None:
-        """Establish SSH connection."""
+    def _print(self, message: str) -> None:
+        if self.verbose:
+            console.print(message)
+
+    def connect(self, timeout: Optional[float] = None) -> None:
+        """Establish SSH connection.
+
+        Args:
+            timeout: Timeout for this connection in seconds, instead of the
+                manager's; covers the TCP connect, banner, authentication
+                and opening channels, each separately
+        """
+        timeout = timeout if timeout is not None else self.timeout
         try:
             self.client = SSHClient()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -59,7 +152,11 @@ class SSHManager:
                 'hostname': self.hostname,
                 'username': self.username,
                 'port': self.port,
-                'timeout': self.timeout
+                'timeout': timeout,
+                'banner_timeout': timeout,
+                'auth_timeout': timeout,
+                # Otherwise opening a channel may wait for an hour
+                'channel_timeout': timeout
             }
 
             if self.password:
@@ -68,10 +165,10 @@ class SSHManager:
                 connect_kwargs['key_filename'] = self.key_filename
 
             self.client.connect(**connect_kwargs)
-            console.print(f"[green]Connected to {self.hostname}[/]")
+            self._print(f"[green]Connected to {self.hostname}[/]")
 
         except Exception as e:
-            console.print(f"[red]Connection error: {e}[/]")
+            self._print(f"[red]Connection error: {e}[/]")
             raise
 
     def disconnect(self) -> None:
@@ -80,7 +177,7 @@ class SSHManager:
             self.sftp.close()
         if self.client:
             self.client.close()
-            console.print("[yellow]Disconnected from server[/]")
+            self._print("[yellow]Disconnected from server[/]")
 
     def execute_command(
         self,
@@ -95,6 +192,9 @@ class SSHManager:
 
         Returns:
             Tuple[int, str, str]: Exit code, stdout, stderr
+
+        Raises:
+            TimeoutError: If the command does not finish within timeout
         """
         if not self.client:
             raise RuntimeError("Not connected to server")
@@ -104,32 +204,81 @@ class SSHManager:
                 command,
                 timeout=timeout
             )
-            exit_code = stdout.channel.recv_exit_status()
-            return exit_code, stdout.read().decode(), stderr.read().decode()
+            stdin.close()
+            try:
+                exit_code, out, err = self._collect(stdout.channel, timeout)
+            finally:
+                stdout.channel.close()
+            return exit_code, out.decode(errors="replace"), err.decode(errors="replace")
 
         except Exception as e:
-            console.print(f"[red]Command execution error: {e}[/]")
+            self._print(f"[red]Command execution error: {e}[/]")
             raise
 
+    @staticmethod
+    def _collect(channel: paramiko.Channel, timeout: Optional[float]) -> Tuple[int, bytes, bytes]:
+        """Read stdout and stderr of a channel until the command exits.
+
+        Both streams are drained as data arrives, so a command printing more
+        than the channel window cannot block before it exits.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        out, err = [], []
+        while True:
+            while channel.recv_ready():
+                out.append(channel.recv(32768))
+            while channel.recv_stderr_ready():
+                err.append(channel.recv_stderr(32768))
+            if channel.exit_status_ready() and (channel.eof_received or channel.closed):
+                if not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+                continue
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                channel.close()
+                raise TimeoutError(f"Command did not finish within {timeout}s")
+            # The channel's fileno becomes readable on stdout or stderr data
+            select.select([channel], [], [], min(remaining, 0.5) if remaining is not None else 0.5)
+        return channel.recv_exit_status(), b"".join(out), b"".join(err)
+
     def execute_commands(
         self,
         commands: List[str],
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        max_channels: int = 1
     ) -> List[Tuple[str, int, str, str]]:
         """Execute multiple commands on the remote server.
 
+        With max_channels > 1, up to that many commands run at once, each
+        on its own channel of the existing connection. Over a slow link
+        this saves the round trips of opening a channel and starting the
+        command for all but the first command in each batch. The commands
+        must not depend on each other. SSH servers limit the channels per
+        connection (OpenSSH's MaxSessions defaults to 10).
+
         Args:
             commands: List of commands to execute
             timeout: Command timeout in seconds
+            max_channels: Maximum number of commands running at once
 
         Returns:
-            List[Tuple[str, int, str, str]]: List of (command, exit_code, stdout, stderr)
+            List[Tuple[str, int, str, str]]: List of (command, exit_code, stdout, stderr),
+                in the order of commands
         """
-        results = []
-        for command in commands:
-            exit_code, stdout, stderr = self.execute_command(command, timeout)
-            results.append((command, exit_code, stdout, stderr))
-        return results
+        if max_channels <= 1 or len(commands) <= 1:
+            results = []
+            for command in commands:
+                exit_code, stdout, stderr = self.execute_command(command, timeout)
+                results.append((command, exit_code, stdout, stderr))
+            return results
+
+        if not self.client:
+            raise RuntimeError("Not connected to server")
+        workers = min(max_channels, len(commands))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ssh-channel") as executor:
+            # map keeps input order however the commands finish
+            outputs = list(executor.map(lambda command: self.execute_command(command, timeout), commands))
+        return [(command, *output) for command, output in zip(commands, outputs)]
 
     def open_sftp(self) -> SFTPClient:
         """Open SFTP session.
@@ -142,57 +291,314 @@ class SSHManager:
 
         try:
             self.sftp = self.client.open_sftp()
-            console.print("[green]SFTP session opened[/]")
+            self._print("[green]SFTP session opened[/]")
             return self.sftp
 
         except Exception as e:
-            console.print(f"[red]SFTP error: {e}[/]")
+            self._print(f"[red]SFTP error: {e}[/]")
             raise
 
     def upload_file(
         self,
         local_path: Union[str, Path],
-        remote_path: Union[str, Path]
-    ) -> None:
+        remote_path: Union[str, Path],
+        window: int = DEFAULT_WINDOW,
+        parallel: int = 1,
+        resume: bool = False,
+        verify: bool = False,
+        chunk_size: int = SFTP_CHUNK_SIZE,
+        state_dir: Optional[str] = None
+    ) -> TransferResult:
         """Upload a file to the remote server.
 
+        Writes are pipelined: up to `window` requests are sent before
+        waiting for the server's replies, so a high-latency link is not
+        idle for a round trip per chunk. With parallel > 1 the file is split
+        into ranges, each sent over its own SFTP session. Data goes to
+        remote_path + ".part", which is renamed once complete. With
+        resume=True, progress is saved in state_dir, so the same call
+        continues an interrupted upload of the same file; without it no
+        state is written.
+
         Args:
             local_path: Local file path
             remote_path: Remote file path
+            window: SFTP requests in flight per session
+            parallel: Number of SFTP sessions
+            resume: Continue an earlier interrupted upload
+            verify: Compare the SHA-256 of the remote file with the local one
+            chunk_size: Bytes per write request
+            state_dir: Directory for resume progress, TRANSFER_STATE_DIR by default
+
+        Returns:
+            TransferResult: Sizes, throughput and hash of the transfer
+
+        Raises:
+            IOError: If verify is set and the hashes differ
         """
         if not self.sftp:
             self.open_sftp()
 
+        local_path, remote_path = str(local_path), str(remote_path)
+        part_path = f"{remote_path}.part"
+        transfer_key = json.dumps([os.path.abspath(local_path), self.hostname, self.port, remote_path])
+        state_path = os.path.join(
+            state_dir or TRANSFER_STATE_DIR, hashlib.sha256(transfer_key.encode()).hexdigest() + ".json"
+        )
         try:
-            self.sftp.put(str(local_path), str(remote_path))
-            console.print(f"[green]Uploaded {local_path} to {remote_path}[/]")
+            stat = os.stat(local_path)
+            identity = {"destination": remote_path, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+            ranges = _load_state(state_path, identity) if resume else None
+            if ranges is not None and not self._remote_exists(part_path):
+                ranges = None
+            if ranges is None:
+                ranges = _plan_ranges(stat.st_size, parallel, chunk_size)
+                with self.sftp.open(part_path, "wb"):
+                    pass
+            resumed_from = sum(done - start for start, _, done in ranges)
+
+            def send(sftp: SFTPClient, byte_range: List[int], save: Callable[[], None]) -> None:
+                self._upload_range(sftp, local_path, part_path, byte_range, window, chunk_size, save)
+
+            start_time = time.monotonic()
+            self._run_ranges(ranges, send, parallel,
+                             (lambda: _save_state(state_path, identity, ranges)) if resume else None)
+            seconds = time.monotonic() - start_time
+
+            digest = _sha256_file(local_path)
+            verified = self._remote_sha256(part_path) == digest if verify else None
+            if verified is False:
+                raise IOError(f"SHA-256 of {part_path} does not match {local_path}")
+            self._replace_remote(part_path, remote_path)
+            if resume:
+                _remove_state(state_path)
+
+            result = TransferResult(local_path, remote_path, stat.st_size, stat.st_size - resumed_from,
+                                    resumed_from, seconds, digest, verified)
+            self._print(f"[green]Uploaded {local_path} to {remote_path} ({result.mb_per_s:.1f} MB/s)[/]")
+            return result
 
         except Exception as e:
-            console.print(f"[red]Upload error: {e}[/]")
+            self._print(f"[red]Upload error: {e}[/]")
             raise
 
     def download_file(
         self,
         remote_path: Union[str, Path],
-        local_path: Union[str, Path]
-    ) -> None:
+        local_path: Union[str, Path],
+        window: int = DEFAULT_WINDOW,
+        parallel: int = 1,
+        resume: bool = False,
+        verify: bool = False,
+        chunk_size: int = SFTP_CHUNK_SIZE
+    ) -> TransferResult:
         """Download a file from the remote server.
 
+        Reads are pipelined in batches of `window` requests. With
+        parallel > 1 the file is split into ranges, each read over its own
+        SFTP session. Data goes to local_path + ".part", renamed once
+        complete. With resume=True, progress is saved in local_path +
+        ".part.json", so the same call continues an interrupted download of
+        the same remote file; without it no state is written.
+
         Args:
             remote_path: Remote file path
             local_path: Local file path
+            window: SFTP requests in flight per session
+            parallel: Number of SFTP sessions
+            resume: Continue an earlier interrupted download
+            verify: Compare the SHA-256 of the local file with the remote one
+            chunk_size: Bytes per read request
+
+        Returns:
+            TransferResult: Sizes, throughput and hash of the transfer
+
+        Raises:
+            IOError: If verify is set and the hashes differ
         """
         if not self.sftp:
             self.open_sftp()
 
+        remote_path, local_path = str(remote_path), str(local_path)
+        part_path = f"{local_path}.part"
+        state_path = f"{part_path}.json"
         try:
-            self.sftp.get(str(remote_path), str(local_path))
-            console.print(f"[green]Downloaded {remote_path} to {local_path}[/]")
+            stat = self.sftp.stat(remote_path)
+            identity = {"source": remote_path, "size": stat.st_size, "mtime": stat.st_mtime}
+            ranges = _load_state(state_path, identity) if resume and os.path.exists(part_path) else None
+            fd = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if ranges is None:
+                    ranges = _plan_ranges(stat.st_size, parallel, chunk_size)
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, stat.st_size)
+                resumed_from = sum(done - start for start, _, done in ranges)
+
+                def receive(sftp: SFTPClient, byte_range: List[int], save: Callable[[], None]) -> None:
+                    self._download_range(sftp, remote_path, fd, byte_range, window, chunk_size, save)
+
+                start_time = time.monotonic()
+                self._run_ranges(ranges, receive, parallel,
+                                 (lambda: _save_state(state_path, identity, ranges)) if resume else None)
+                seconds = time.monotonic() - start_time
+            finally:
+                os.close(fd)
+
+            digest = _sha256_file(part_path)
+            verified = self._remote_sha256(remote_path) == digest if verify else None
+            if verified is False:
+                raise IOError(f"SHA-256 of {local_path} does not match {remote_path}")
+            os.replace(part_path, local_path)
+            if resume:
+                _remove_state(state_path)
+
+            result = TransferResult(remote_path, local_path, stat.st_size, stat.st_size - resumed_from,
+                                    resumed_from, seconds, digest, verified)
+            self._print(f"[green]Downloaded {remote_path} to {local_path} ({result.mb_per_s:.1f} MB/s)[/]")
+            return result
 
         except Exception as e:
-            console.print(f"[red]Download error: {e}[/]")
+            self._print(f"[red]Download error: {e}[/]")
             raise
 
+    def _run_ranges(
+        self,
+        ranges: List[List[int]],
+        transfer: Callable[[SFTPClient, List[int], Callable[[], None]], None],
+        parallel: int,
+        save_state: Optional[Callable[[], None]]
+    ) -> None:
+        """Transfer the unfinished ranges, each on its own session if parallel > 1.
+
+        Progress is saved whenever a range reports it and once more at the
+        end, including when a range fails. A failed save only disables
+        resuming; it never fails the transfer.
+        """
+        lock = threading.Lock()
+        saving = [save_state is not None]
+
+        def save() -> None:
+            with lock:
+                if not saving[0]:
+                    return
+                try:
+                    save_state()
+                except OSError as e:
+                    saving[0] = False
+                    self._print(f"[yellow]Cannot save transfer progress, resume disabled: {e}[/]")
+
+        pending = [byte_range for byte_range in ranges if byte_range[2] < byte_range[1]]
+        try:
+            if parallel <= 1 or len(pending) <= 1:
+                for byte_range in pending:
+                    transfer(self.sftp, byte_range, save)
+                return
+
+            def run(byte_range: List[int]) -> None:
+                sftp = self.client.open_sftp()
+                try:
+                    transfer(sftp, byte_range, save)
+                finally:
+                    sftp.close()
+
+            with ThreadPoolExecutor(max_workers=min(parallel, len(pending)), thread_name_prefix="sftp") as executor:
+                # list() re-raises the first failure after all ranges stopped
+                list(executor.map(run, pending))
+        finally:
+            save()
+
+    @staticmethod
+    def _upload_range(
+        sftp: SFTPClient,
+        local_path: str,
+        remote_path: str,
+        byte_range: List[int],
+        window: int,
+        chunk_size: int,
+        save: Callable[[], None]
+    ) -> None:
+        start, end, offset = byte_range
+        # Unbuffered, so a write that waits for replies has really reached the server
+        with open(local_path, "rb") as source, sftp.open(remote_path, "r+b", bufsize=0) as target:
+            source.seek(offset)
+            target.seek(offset)
+            target.set_pipelined(True)
+            in_flight = 0
+            while offset < end:
+                data = source.read(min(chunk_size, end - offset))
+                if not data:
+                    raise EOFError(f"{local_path} shrank during upload")
+                in_flight += 1
+                if in_flight >= window:
+                    # A non-pipelined write waits for the replies to all earlier writes
+                    target.set_pipelined(False)
+                    target.write(data)
+                    target.set_pipelined(True)
+                    in_flight = 0
+                    byte_range[2] = offset + len(data)
+                    save()
+                else:
+                    target.write(data)
+                offset += len(data)
+        # Closing waits for the last replies
+        byte_range[2] = end
+        save()
+
+    @staticmethod
+    def _download_range(
+        sftp: SFTPClient,
+        remote_path: str,
+        fd: int,
+        byte_range: List[int],
+        window: int,
+        chunk_size: int,
+        save: Callable[[], None]
+    ) -> None:
+        _, end, offset = byte_range
+        with sftp.open(remote_path, "rb") as source:
+            while offset < end:
+                # readv sends all requests of a batch at once; batching (rather than
+                # one throttled readv) leaves no prefetch thread behind if we stop early
+                batch = [(position, min(chunk_size, end - position))
+                         for position in range(offset, min(end, offset + window * chunk_size), chunk_size)]
+                for (position, length), data in zip(batch, source.readv(batch)):
+                    if len(data) != length:
+                        raise EOFError(f"{remote_path} shrank during download")
+                    os.pwrite(fd, data, position)
+                offset = byte_range[2] = batch[-1][0] + batch[-1][1]
+                save()
+
+    def _remote_exists(self, path: str) -> bool:
+        try:
+            self.sftp.stat(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _replace_remote(self, source: str, destination: str) -> None:
+        try:
+            self.sftp.posix_rename(source, destination)
+        except IOError:
+            # Server without the posix-rename extension; plain rename fails if the target exists
+            if self._remote_exists(destination):
+                self.sftp.remove(destination)
+            self.sftp.rename(source, destination)
+
+    def _remote_sha256(self, path: str) -> str:
+        """Hash a remote file with sha256sum, or by reading it back over SFTP."""
+        try:
+            exit_code, stdout, _ = self.execute_command(f"sha256sum -- {shlex.quote(path)}", timeout=600)
+            if exit_code == 0 and stdout:
+                return stdout.split()[0]
+        except Exception:
+            pass
+        digest = hashlib.sha256()
+        with self.sftp.open(path, "rb") as f:
+            f.prefetch(max_concurrent_requests=DEFAULT_WINDOW)
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     def list_directory(self, path: str = '.') -> List[str]:
         """List directory contents on the remote server.
 
@@ -209,7 +615,7 @@ class SSHManager:
             return self.sftp.listdir(path)
 
         except Exception as e:
-            console.print(f"[red]Directory listing error: {e}[/]")
+            self._print(f"[red]Directory listing error: {e}[/]")
             raise
 
     def display_command_results(
@@ -238,6 +644,242 @@ class SSHManager:
         console.print(table)
 
 
+class HostResult(NamedTuple):
+    """Result of running a command on one host of a fleet.
+
+    status is "passed" (exit code 0), "failed" (non-zero exit code),
+    "timeout" (the host did not finish within the per-host timeout) or
+    "error" (connection or authentication failure).
+    """
+    host: str
+    command: str
+    status: str
+    exit_code: Optional[int]
+    stdout: str
+    stderr: str
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the command exited with status 0."""
+        return self.status == "passed"
+
+
+def parse_host(host: str, default_port: int = 22) -> Tuple[str, int]:
+    """Split "host" or "host:port" into hostname and port.
+
+    Args:
+        host: Host specification
+        default_port: Port used when none is given
+
+    Returns:
+        Tuple[str, int]: Hostname and port
+    """
+    hostname, sep, port = host.rpartition(":")
+    if sep and port.isdigit() and ":" not in hostname:
+        return hostname, int(port)
+    return host, default_port
+
+
+class FleetExecutor:
+    """Run commands on many hosts in parallel.
+
+    Each host gets its own connection in a bounded thread pool. The
+    per-host timeout covers connecting, authenticating and running the
+    command: each stage only gets what is left of it, and run() reports a
+    host that is still busy at its deadline as timed out without waiting
+    for it, so one hung host cannot hold up the fleet for longer than that.
+    """
+
+    def __init__(
+        self,
+        hosts: List[str],
+        username: str,
+        password: Optional[str] = None,
+        key_filename: Optional[str] = None,
+        port: int = 22,
+        max_workers: int = 32,
+        connect_timeout: float = 10.0,
+        host_timeout: float = 60.0
+    ):
+        """Initialize the fleet executor.
+
+        Args:
+            hosts: Hosts as "hostname" or "hostname:port"
+            username: SSH username
+            password: SSH password (optional)
+            key_filename: Path to private key file (optional)
+            port: SSH port for hosts without one
+            max_workers: Maximum number of hosts handled at once
+            connect_timeout: Connection timeout in seconds
+            host_timeout: Total time allowed per host in seconds
+        """
+        self.hosts = list(dict.fromkeys(hosts))
+        self.username = username
+        self.password = password
+        self.key_filename = key_filename
+        self.port = port
+        self.max_workers = max_workers
+        self.connect_timeout = connect_timeout
+        self.host_timeout = host_timeout
+
+    def run_on_host(self, host: str, command: str) -> HostResult:
+        """Run a command on one host.
+
+        Args:
+            host: Host as "hostname" or "hostname:port"
+            command: Command to execute
+
+        Returns:
+            HostResult: Outcome on this host; errors are reported, not raised
+        """
+        start = time.monotonic()
+        deadline = start + self.host_timeout
+
+        def remaining() -> float:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise TimeoutError(f"Host did not finish within {self.host_timeout}s")
+            return left
+
+        hostname, port = parse_host(host, self.port)
+        manager = SSHManager(
+            hostname,
+            self.username,
+            password=self.password,
+            key_filename=self.key_filename,
+            port=port,
+            timeout=self.connect_timeout,
+            verbose=False
+        )
+        try:
+            manager.connect(timeout=min(self.connect_timeout, remaining()))
+            exit_code, stdout, stderr = manager.execute_command(command, timeout=remaining())
+            status = "passed" if exit_code == 0 else "failed"
+            return HostResult(host, command, status, exit_code, stdout, stderr, time.monotonic() - start)
+        except TimeoutError as e:
+            return HostResult(host, command, "timeout", None, "", "", time.monotonic() - start, str(e))
+        except Exception as e:
+            # E.g. a banner timeout that used up the host's budget
+            status = "timeout" if time.monotonic() >= deadline else "error"
+            return HostResult(host, command, status, None, "", "", time.monotonic() - start,
+                              f"{type(e).__name__}: {e}")
+        finally:
+            manager.disconnect()
+
+    def run(self, command: str) -> Iterator[HostResult]:
+        """Run a command on every host, yielding results as hosts finish.
+
+        At most max_workers hosts are contacted at once. A host still busy
+        host_timeout after it started is reported as "timeout" right away;
+        its thread is left to finish on its own. Closing the iterator early
+        stops starting new hosts.
+
+        Args:
+            command: Command to execute
+
+        Yields:
+            HostResult: Outcome per host, in completion order
+        """
+        pending = iter(self.hosts)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fleet")
+        running: Dict[Future, str] = {}
+        started: Dict[str, float] = {}
+
+        def run_host(host: str) -> HostResult:
+            started[host] = time.monotonic()
+            return self.run_on_host(host, command)
+
+        try:
+            # Submit lazily so a huge fleet does not queue a future per host up front
+            for host in pending:
+                running[executor.submit(run_host, host)] = host
+                if len(running) >= self.max_workers:
+                    break
+            while running:
+                now = time.monotonic()
+                # Hosts still queued behind abandoned ones have no start time yet
+                deadlines = [started[host] + self.host_timeout for host in running.values() if host in started]
+                timeout = max(min(deadlines, default=now + self.host_timeout) - now, 0)
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                results = [future.result() for future in done]
+                now = time.monotonic()
+                for future, host in list(running.items()):
+                    if future not in done and host in started and now >= started[host] + self.host_timeout:
+                        done.add(future)
+                        results.append(HostResult(
+                            host, command, "timeout", None, "", "", now - started[host],
+                            f"Host did not finish within {self.host_timeout}s"
+                        ))
+                for future in done:
+                    del running[future]
+                for result in results:
+                    yield result
+                    host = next(pending, None)
+                    if host is not None:
+                        running[executor.submit(run_host, host)] = host
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run_all(self, command: str) -> List[HostResult]:
+        """Run a command on every host and return the results in host order.
+
+        Args:
+            command: Command to execute
+
+        Returns:
+            List[HostResult]: One result per host
+        """
+        results = {result.host: result for result in self.run(command)}
+        return [results[host] for host in self.hosts]
+
+    @staticmethod
+    def summarize(results: List[HostResult]) -> Dict[str, int]:
+        """Count results per status.
+
+        Args:
+            results: Host results
+
+        Returns:
+            Dict[str, int]: Counts for passed, failed, timeout, error and total
+        """
+        counts = {"passed": 0, "failed": 0, "timeout": 0, "error": 0}
+        for result in results:
+            counts[result.status] += 1
+        counts["total"] = len(results)
+        return counts
+
+    def display_summary(self, results: List[HostResult]) -> None:
+        """Display per-host results and the pass/fail totals in a table.
+
+        Args:
+            results: Host results
+        """
+        styles = {"passed": "green", "failed": "red", "timeout": "yellow", "error": "magenta"}
+        table = Table(title="Fleet Execution Results")
+        table.add_column("Host", style="cyan")
+        table.add_column("Status")
+        table.add_column("Exit Code")
+        table.add_column("Duration")
+        table.add_column("Output")
+
+        for result in sorted(results, key=lambda result: (result.ok, result.host)):
+            output = (result.stdout.strip() or result.stderr.strip()).splitlines()
+            detail = result.error or (output[-1] if output else "-")
+            table.add_row(
+                result.host,
+                f"[{styles[result.status]}]{result.status.upper()}[/]",
+                "-" if result.exit_code is None else str(result.exit_code),
+                f"{result.duration:.2f}s",
+                detail
+            )
+
+        counts = self.summarize(results)
+        table.caption = ", ".join(f"{counts[status]} {status}" for status in styles) + f" of {counts['total']} hosts"
+        console.print(table)
+
+
 # Example usage
 if __name__ == "__main__":
     try:
@@ -286,5 +928,21 @@ if __name__ == "__main__":
         # Disconnect
         ssh.disconnect()
 
+        # Run a command across a fleet, e.g. SSH_HOSTS="web1,web2:2222"
+        fleet_hosts = [host for host in os.getenv('SSH_HOSTS', '').split(',') if host]
+        if fleet_hosts:
+            fleet = FleetExecutor(
+                fleet_hosts,
+                username=os.getenv('SSH_USER', 'user'),
+                password=os.getenv('SSH_PASSWORD'),
+                key_filename=os.getenv('SSH_KEY_FILE'),
+                host_timeout=30
+            )
+            fleet_results = []
+            for result in fleet.run('uptime'):
+                console.print(f"{result.host}: {result.status}")
+                fleet_results.append(result)
+            fleet.display_summary(fleet_results)
+
     except Exception as e:
         console.print(f"[red]Error: {e}[/]") 
\ No newline at end of file
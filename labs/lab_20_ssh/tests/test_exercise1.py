@@ -0,0 +1,265 @@
+"""Tests for Exercise 1: SSH operations against local paramiko servers."""
+
+import hashlib
+import os
+import socket
+import time
+
+import pytest
+
+from benchmarks.ssh_standin import PASSWORD, USERNAME, DelayProxy, StandInHost
+from exercises.exercise1 import FleetExecutor, SSHManager, _plan_ranges, parse_host
+
+
+@pytest.fixture
+def hosts():
+    hosts = [StandInHost() for _ in range(6)]
+    yield hosts
+    for host in hosts:
+        host.close()
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_parse_host():
+    assert parse_host("web1") == ("web1", 22)
+    assert parse_host("web1:2222") == ("web1", 2222)
+    assert parse_host("::1") == ("::1", 22)
+
+
+def test_execute_command_collects_large_output(hosts):
+    manager = SSHManager("127.0.0.1", USERNAME, PASSWORD, port=hosts[0].port, verbose=False)
+    manager.connect()
+    try:
+        exit_code, stdout, stderr = manager.execute_command("head -c 3000000 /dev/zero | tr '\\\\0' x; echo err >&2")
+        assert exit_code == 0 and len(stdout) == 3000000 and stderr == "err\n"
+        with pytest.raises(TimeoutError):
+            manager.execute_command("sleep 5", timeout=0.3)
+    finally:
+        manager.disconnect()
+
+
+def test_fleet_runs_hosts_in_parallel(hosts):
+    fleet = FleetExecutor([host.address for host in hosts], USERNAME, PASSWORD, max_workers=len(hosts))
+    start = time.monotonic()
+    results = fleet.run_all("sleep 0.5; echo $((6 * 7))")
+    elapsed = time.monotonic() - start
+    assert [result.host for result in results] == [host.address for host in hosts]
+    assert all(result.ok and result.stdout == "42\n" for result in results)
+    assert elapsed < 0.5 * len(hosts) / 2
+
+
+def test_fleet_streams_results_and_limits_workers(hosts):
+    fleet = FleetExecutor([host.address for host in hosts], USERNAME, PASSWORD, max_workers=2)
+    start = time.monotonic()
+    finished = [time.monotonic() - start for result in fleet.run("sleep 0.3") if result.ok]
+    assert len(finished) == len(hosts)
+    # Two at a time: the first results arrive long before the last
+    assert finished[0] < 0.3 * len(hosts) / 2 <= finished[-1]
+
+
+def test_fleet_reports_failures_timeouts_and_errors(hosts, capsys):
+    addresses = [host.address for host in hosts[:3]] + [f"127.0.0.1:{closed_port()}"]
+    fleet = FleetExecutor(addresses, USERNAME, PASSWORD, host_timeout=1.0)
+    results = fleet.run_all("true")
+    assert [result.status for result in results] == ["passed", "passed", "passed", "error"]
+
+    results = {
+        "ok": fleet.run_on_host(addresses[0], "true"),
+        "fail": fleet.run_on_host(addresses[1], "echo boom >&2; exit 3"),
+        "slow": fleet.run_on_host(addresses[2], "sleep 5"),
+    }
+    assert results["fail"].status == "failed" and results["fail"].exit_code == 3
+    assert results["slow"].status == "timeout" and results["slow"].duration < 2
+    assert FleetExecutor.summarize(list(results.values())) == {
+        "passed": 1, "failed": 1, "timeout": 1, "error": 0, "total": 3
+    }
+
+    fleet.display_summary(list(results.values()))
+    output = capsys.readouterr().out
+    assert "TIMEOUT" in output and "FAILED" in output and "1 passed" in output
+
+
+def test_fleet_enforces_host_deadline(hosts):
+    # Accepts connections but never sends a banner
+    silent = socket.socket()
+    silent.bind(("127.0.0.1", 0))
+    silent.listen()
+    try:
+        address = f"127.0.0.1:{silent.getsockname()[1]}"
+        fleet = FleetExecutor([address, hosts[0].address], USERNAME, PASSWORD,
+                              connect_timeout=10, host_timeout=0.5)
+        start = time.perf_counter()
+        result = fleet.run_on_host(address, "true")
+        assert result.status == "timeout" and time.perf_counter() - start < 1.5
+
+        start = time.perf_counter()
+        results = fleet.run_all("true")
+        assert [result.status for result in results] == ["timeout", "passed"]
+        assert time.perf_counter() - start < 1.5
+    finally:
+        silent.close()
+
+
+def test_fleet_reports_hung_hosts_at_deadline(hosts, monkeypatch):
+    run_on_host = FleetExecutor.run_on_host
+
+    def hang_first(fleet, host, command):
+        if host == hosts[0].address:
+            time.sleep(3)
+        return run_on_host(fleet, host, command)
+
+    monkeypatch.setattr(FleetExecutor, "run_on_host", hang_first)
+    fleet = FleetExecutor([host.address for host in hosts[:2]], USERNAME, PASSWORD, host_timeout=0.5)
+    start = time.perf_counter()
+    results = fleet.run_all("true")
+    assert [result.status for result in results] == ["timeout", "passed"]
+    assert time.perf_counter() - start < 1.5
+
+
+def test_fleet_reports_authentication_errors(hosts):
+    fleet = FleetExecutor([hosts[0].address], USERNAME, "wrong", host_timeout=5)
+    [result] = fleet.run_all("true")
+    assert result.status == "error" and "Authentication" in result.error
+
+
+@pytest.fixture
+def manager(hosts):
+    manager = SSHManager("127.0.0.1", USERNAME, PASSWORD, port=hosts[0].port, verbose=False)
+    manager.connect()
+    yield manager
+    manager.disconnect()
+
+
+def test_execute_commands_multiplexes_channels_in_order(hosts, manager):
+    commands = [f"sleep 0.{4 - i}; echo {i}" for i in range(4)]
+    start = time.monotonic()
+    results = manager.execute_commands(commands, max_channels=4)
+    assert time.monotonic() - start < 0.9
+    assert [result[0] for result in results] == commands
+    assert [result[2] for result in results] == ["0\n", "1\n", "2\n", "3\n"]
+    # One connection carried every channel
+    assert len(hosts[0].transports) == 1
+
+
+def test_multiplexing_hides_link_latency(hosts):
+    proxy = DelayProxy(hosts[0].port, rtt=0.1)
+    manager = SSHManager("127.0.0.1", USERNAME, PASSWORD, port=proxy.port, verbose=False)
+    manager.connect()
+    try:
+        commands = [f"echo {i}" for i in range(6)]
+        start = time.monotonic()
+        sequential = manager.execute_commands(commands)
+        sequential_time = time.monotonic() - start
+        start = time.monotonic()
+        multiplexed = manager.execute_commands(commands, max_channels=6)
+        multiplexed_time = time.monotonic() - start
+    finally:
+        manager.disconnect()
+        proxy.close()
+    assert multiplexed == sequential
+    assert sequential_time > 6 * 0.1
+    assert multiplexed_time < sequential_time / 2
+
+
+@pytest.fixture
+def payload(tmp_path):
+    path = tmp_path / "payload.bin"
+    path.write_bytes(os.urandom(300 * 1024) + bytes(300 * 1024))
+    return path
+
+
+def interrupt_after(monkeypatch, method_name, saves):
+    """Make the next transfer fail after `saves` progress saves."""
+    original = getattr(SSHManager, method_name)
+    calls = []
+
+    def failing(sftp, source, target, byte_range, window, chunk_size, save):
+        def save_then_fail():
+            save()
+            calls.append(1)
+            if len(calls) == saves:
+                raise ConnectionError("link dropped")
+        original(sftp, source, target, byte_range, window, chunk_size, save_then_fail)
+
+    monkeypatch.setattr(SSHManager, method_name, staticmethod(failing))
+    return lambda: monkeypatch.setattr(SSHManager, method_name, staticmethod(original))
+
+
+def test_plan_ranges_cover_file():
+    ranges = _plan_ranges(100_000, 3, 32768)
+    assert ranges[0][0] == 0 and ranges[-1][1] == 100_000
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert _plan_ranges(10, 8, 32768) == [[0, 10, 0]]
+    assert _plan_ranges(0, 4, 32768) == [[0, 0, 0]]
+
+
+@pytest.mark.parametrize("parallel", [1, 3])
+def test_upload_and_download_round_trip(manager, payload, tmp_path, parallel):
+    remote = tmp_path / "remote" / "payload.bin"
+    remote.parent.mkdir()
+    uploaded = manager.upload_file(payload, remote, window=8, parallel=parallel, verify=True)
+    assert remote.read_bytes() == payload.read_bytes()
+    assert uploaded.verified and uploaded.sha256 == hashlib.sha256(payload.read_bytes()).hexdigest()
+    assert uploaded.transferred == uploaded.size == payload.stat().st_size and uploaded.mb_per_s > 0
+
+    local = tmp_path / "copy.bin"
+    downloaded = manager.download_file(remote, local, window=8, parallel=parallel, verify=True)
+    assert local.read_bytes() == payload.read_bytes()
+    assert downloaded.verified and downloaded.sha256 == uploaded.sha256
+    assert sorted(os.listdir(tmp_path)) == ["copy.bin", "payload.bin", "remote"]
+    assert os.listdir(remote.parent) == ["payload.bin"]
+
+
+def test_interrupted_download_resumes(manager, payload, tmp_path, monkeypatch):
+    local = tmp_path / "copy.bin"
+    restore = interrupt_after(monkeypatch, "_download_range", saves=3)
+    with pytest.raises(ConnectionError):
+        manager.download_file(payload, local, window=4, parallel=2, chunk_size=8192, resume=True)
+    restore()
+    assert not local.exists()
+
+    result = manager.download_file(payload, local, window=4, parallel=2, chunk_size=8192, resume=True)
+    assert local.read_bytes() == payload.read_bytes()
+    assert 0 < result.resumed_from < result.size
+    assert result.transferred == result.size - result.resumed_from
+    assert not (tmp_path / "copy.bin.part.json").exists()
+
+
+@pytest.mark.parametrize("chunk_size", [8192, 1024])
+def test_interrupted_upload_resumes(manager, payload, tmp_path, monkeypatch, chunk_size):
+    remote = tmp_path / "uploaded.bin"
+    state_dir = tmp_path / "state"
+    restore = interrupt_after(monkeypatch, "_upload_range", saves=2)
+    with pytest.raises(ConnectionError):
+        manager.upload_file(payload, remote, window=4, chunk_size=chunk_size, resume=True, state_dir=state_dir)
+    restore()
+    assert not remote.exists()
+
+    result = manager.upload_file(payload, remote, window=4, chunk_size=chunk_size, resume=True,
+                                 verify=True, state_dir=state_dir)
+    assert remote.read_bytes() == payload.read_bytes()
+    assert result.resumed_from == 2 * 4 * chunk_size and result.verified
+    assert os.listdir(state_dir) == []
+
+    # Without resume the upload starts over
+    assert manager.upload_file(payload, remote).resumed_from == 0
+
+
+def test_plain_transfers_write_no_state(manager, payload, tmp_path):
+    before = sorted(os.listdir(tmp_path))
+    manager.upload_file(payload, tmp_path / "uploaded.bin", state_dir=tmp_path / "state")
+    manager.download_file(tmp_path / "uploaded.bin", tmp_path / "copy.bin")
+    assert sorted(os.listdir(tmp_path)) == sorted(before + ["uploaded.bin", "copy.bin"])
+
+
+def test_unwritable_state_does_not_fail_upload(manager, payload, tmp_path):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    result = manager.upload_file(payload, tmp_path / "uploaded.bin", resume=True, state_dir=blocker / "state")
+    assert (tmp_path / "uploaded.bin").read_bytes() == payload.read_bytes()
+    assert result.transferred == result.size